@@ -0,0 +1,543 @@
+# backup.py — Copias de seguridad en caliente de la base
+# -------------------------------------------------
+# - Antes: shutil.copyfile(gestion_textil.db). Con la base en WAL eso pierde lo
+#   que todavía está en el -wal (commits recientes) y puede copiar una página a
+#   medio escribir; además bloqueaba la ventana en bases grandes.
+# - Ahora la copia la hace SQLite:
+#     * API de backup (Connection.backup) de a BACKUP_PAGINAS páginas, con
+#       progreso; incluye lo que está en el -wal y es consistente aunque la app
+#       siga escribiendo (si otra conexión escribe, SQLite reinicia la copia).
+#     * o VACUUM INTO (vacuum=True): una sola pasada, copia compactada, sin
+#       progreso intermedio.
+# - La copia queda en modo journal DELETE (un solo archivo, sin -wal) y se
+#   verifica con PRAGMA integrity_check antes de darla por buena.
+# - Compresión opcional: gzip (estándar) o zstd (requiere 'zstandard'). El
+#   comprimido se verifica descomprimiendo y comparando el sha256.
+# - progreso(hecho, total, texto) compatible con tareas.Tarea.progreso: si
+#   lanza (cancelación) se borra lo que se haya escrito.
+# - respaldar(): completos y diferenciales por páginas registrados en
+#   backups.json (en modo auto no se registra nada si la copia es idéntica,
+#   página por página, al último backup); aplicar_retencion() (N diarios /
+#   M mensuales) y restaurar() a un momento dado.
+# -------------------------------------------------
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import time
+from datetime import datetime
+
+import db_access as db
+
+BACKUP_PAGINAS = 256  # páginas por paso de Connection.backup
+BLOQUE = 1 << 20  # bytes por lectura al comprimir / verificar
+COMPRESIONES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("Falta 'zstandard'. Instalá con: pip install zstandard") from e
+    return zstandard
+
+
+def compresion_de(path) -> str:
+    """'gzip' | 'zstd' | None según la extensión del archivo."""
+    for nombre, ext in COMPRESIONES.items():
+        if ext and str(path).endswith(ext):
+            return nombre
+    return None
+
+
+def abrir_lectura(path):
+    """Archivo binario de lectura que descomprime según la extensión."""
+    comp = compresion_de(path)
+    if comp == "gzip":
+        return gzip.open(path, "rb")
+    if comp == "zstd":
+        return _zstd().ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _abrir_escritura(path, comprimir):
+    if comprimir == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if comprimir == "zstd":
+        return _zstd().ZstdCompressor(level=6).stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb")
+
+
+def _sha256(fh, progreso=None, total=None, texto=""):
+    h = hashlib.sha256()
+    hecho = 0
+    while True:
+        b = fh.read(BLOQUE)
+        if not b:
+            return h.hexdigest()
+        h.update(b)
+        hecho += len(b)
+        if progreso:
+            progreso(hecho, total, texto)
+
+
+def _tmp_en(carpeta, prefijo) -> str:
+    fd, tmp = tempfile.mkstemp(prefix=prefijo, suffix=".db", dir=carpeta or ".")
+    os.close(fd)
+    os.remove(tmp)
+    return tmp
+
+
+def _borrar(*paths):
+    for p in paths:
+        try:
+            os.remove(p)
+        except Exception:
+            pass
+
+
+def integridad(path) -> str:
+    """PRAGMA integrity_check de una base sin comprimir: 'ok' o el primer problema."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def nombre_backup(db_path=None, cuando=None, comprimir=None, sufijo="") -> str:
+    ts = (cuando or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    base = os.path.basename(str(db_path or db.DB_PATH))
+    return f"backup_{ts}_{base}{sufijo}" + COMPRESIONES[comprimir]
+
+
+def _libre(path) -> str:
+    """path, o path con -1, -2... antes de la extensión si ya existe (dos backups en el mismo segundo)."""
+    if not os.path.exists(path):
+        return path
+    carpeta, nombre = os.path.split(path)
+    pre, _, resto = nombre.partition(".")
+    n = 1
+    while os.path.exists(os.path.join(carpeta, f"{pre}-{n}.{resto}")):
+        n += 1
+    return os.path.join(carpeta, f"{pre}-{n}.{resto}")
+
+
+def copiar_base(destino, vacuum=False, progreso=None, db_path=None):
+    """
+    Copia consistente de la base en `destino` (sin comprimir) y la deja en modo
+    DELETE. No verifica: ver integridad().
+    """
+    src = sqlite3.connect(str(db_path or db.DB_PATH), timeout=10)
+    try:
+        src.execute("PRAGMA busy_timeout = 10000;")
+        if vacuum:
+            if progreso:
+                progreso(0, None, "VACUUM INTO")
+            src.execute("VACUUM INTO ?", (str(destino),))
+            dst = sqlite3.connect(str(destino))
+        else:
+            dst = sqlite3.connect(str(destino))
+
+            def _paso(_estado, quedan, total):
+                if progreso:
+                    progreso(total - quedan, total, "páginas")
+
+            src.backup(dst, pages=BACKUP_PAGINAS, progress=_paso)
+        try:
+            dst.execute("PRAGMA journal_mode = DELETE;")
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def crear_backup(carpeta, comprimir=None, vacuum=False, progreso=None, db_path=None) -> dict:
+    """
+    Backup verificado de la base en `carpeta`.
+    comprimir: None | "gzip" | "zstd"; vacuum: usar VACUUM INTO en vez de la API de backup.
+    Devuelve {"archivo", "bytes", "bytes_base", "sha256", "modo", "compresion",
+              "integridad", "segundos"}. Si algo falla no deja archivos a medias.
+    """
+    if comprimir not in COMPRESIONES:
+        raise ValueError(f"Compresión desconocida: {comprimir!r}")
+    if comprimir == "zstd":
+        _zstd()  # falla antes de copiar si no está instalado
+    t0 = time.perf_counter()
+    os.makedirs(carpeta, exist_ok=True)
+    dest = _libre(os.path.join(carpeta, nombre_backup(db_path, comprimir=comprimir)))
+    tmp = _tmp_en(carpeta, ".backup_")  # sin crear: VACUUM INTO exige que no exista
+    try:
+        copiar_base(tmp, vacuum=vacuum, progreso=progreso, db_path=db_path)
+
+        if progreso:
+            progreso(0, None, "verificando")
+        estado = integridad(tmp)
+        if estado != "ok":
+            raise RuntimeError(f"La copia no pasó integrity_check: {estado}")
+        bytes_base = os.path.getsize(tmp)
+
+        if comprimir:
+            h = hashlib.sha256()
+            hecho = 0
+            with open(tmp, "rb") as fi, _abrir_escritura(dest, comprimir) as fo:
+                while True:
+                    b = fi.read(BLOQUE)
+                    if not b:
+                        break
+                    h.update(b)
+                    fo.write(b)
+                    hecho += len(b)
+                    if progreso:
+                        progreso(hecho, bytes_base, "comprimiendo")
+            sha = h.hexdigest()
+            with abrir_lectura(dest) as fh:
+                if _sha256(fh, progreso, bytes_base, "verificando") != sha:
+                    raise RuntimeError("El archivo comprimido no coincide con la copia")
+            os.remove(tmp)
+        else:
+            with open(tmp, "rb") as fh:
+                sha = _sha256(fh)
+            os.replace(tmp, dest)
+    except BaseException:
+        _borrar(tmp, dest)
+        raise
+    return {
+        "archivo": dest,
+        "bytes": os.path.getsize(dest),
+        "bytes_base": bytes_base,
+        "sha256": sha,
+        "modo": "vacuum" if vacuum else "backup",
+        "compresion": comprimir,
+        "integridad": estado,
+        "segundos": round(time.perf_counter() - t0, 4),
+    }
+
+
+def verificar_backup(path, progreso=None) -> str:
+    """Descomprime (si hace falta) a un temporal y corre integrity_check."""
+    if not compresion_de(path):
+        return integridad(path)
+    fd, tmp = tempfile.mkstemp(prefix=".verif_", suffix=".db",
+                               dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with abrir_lectura(path) as fi, os.fdopen(fd, "wb") as fo:
+            shutil.copyfileobj(fi, fo, BLOQUE)
+        if progreso:
+            progreso(0, None, "verificando")
+        return integridad(tmp)
+    finally:
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+
+
+# --------------------- Diferenciales / retención / restauración ---------------------
+#
+# Cada carpeta de backups lleva un manifest (backups.json) con una entrada por
+# copia: archivo, tipo ("completo" | "diferencial"), base, fecha, sha256,
+# bytes, bytes_base y paginas. sha256 es siempre el de la base RESULTANTE sin
+# comprimir: es lo que se controla al restaurar.
+# Un diferencial guarda sólo las páginas que cambiaron respecto de su completo
+# (no del diferencial anterior): restaurar es descomprimir un completo y
+# escribir encima las páginas de UN archivo, sin recorrer cadenas.
+
+MANIFEST = "backups.json"
+DIAS_COMPLETO = 7  # modo auto: completo nuevo si el último tiene más días...
+MAX_DIFERENCIAL = 0.5  # ...o si el último diferencial ya pesa esta fracción del completo
+MAGIA = b"GTDIF1\n"
+_NRO = struct.Struct(">I")
+
+
+def leer_manifest(carpeta) -> list:
+    try:
+        with open(os.path.join(carpeta, MANIFEST), encoding="utf-8") as f:
+            return json.load(f).get("backups", [])
+    except Exception:
+        return []
+
+
+def _por_fecha(backups) -> list:
+    """
+    Entradas de la más vieja a la más nueva. La fecha va al segundo: a igual
+    fecha manda el orden del manifest (el último registrado es el más nuevo).
+    Retención y restauración eligen con este mismo criterio.
+    """
+    return sorted(backups, key=lambda b: b["fecha"])
+
+
+def _guardar_manifest(carpeta, backups):
+    tmp = os.path.join(carpeta, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"backups": backups}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(carpeta, MANIFEST))
+
+
+def _leer(fh, n) -> bytes:
+    """Lee exactamente n bytes (o hasta el final): los lectores comprimidos pueden devolver menos."""
+    partes = []
+    while n > 0:
+        b = fh.read(n)
+        if not b:
+            break
+        partes.append(b)
+        n -= len(b)
+    return b"".join(partes)
+
+
+def _descomprimir(origen, destino):
+    with abrir_lectura(origen) as fi, open(destino, "wb") as fo:
+        shutil.copyfileobj(fi, fo, BLOQUE)
+
+
+def _aplicar_diferencial(base_path, dif_path, destino) -> dict:
+    """destino = completo `base_path` + páginas de `dif_path`. Devuelve la cabecera del diferencial."""
+    _descomprimir(base_path, destino)
+    with abrir_lectura(dif_path) as fd, open(destino, "r+b") as fo:
+        if _leer(fd, len(MAGIA)) != MAGIA:
+            raise RuntimeError(f"{os.path.basename(dif_path)} no es un diferencial válido")
+        meta = json.loads(_leer(fd, _NRO.unpack(_leer(fd, _NRO.size))[0]).decode("utf-8"))
+        tam = meta["page_size"]
+        while True:
+            nro = _NRO.unpack(_leer(fd, _NRO.size))[0]
+            if nro == 0:
+                break
+            fo.seek((nro - 1) * tam)
+            fo.write(_leer(fd, tam))
+        fo.truncate(meta["paginas"] * tam)
+    return meta
+
+
+def crear_diferencial(carpeta, base: dict, comprimir="gzip", progreso=None, db_path=None) -> dict:
+    """
+    Diferencial por páginas contra el completo `base` (entrada del manifest).
+    Se verifica reconstruyendo la base y comparando el sha256.
+    """
+    t0 = time.perf_counter()
+    base_path = os.path.join(carpeta, base["archivo"])
+    dest = _libre(os.path.join(
+        carpeta, nombre_backup(db_path, comprimir=comprimir, sufijo=".dif")
+    ))
+    tmp = _tmp_en(carpeta, ".backup_")
+    prueba = _tmp_en(carpeta, ".verif_")
+    try:
+        copiar_base(tmp, progreso=progreso, db_path=db_path)
+        estado = integridad(tmp)
+        if estado != "ok":
+            raise RuntimeError(f"La copia no pasó integrity_check: {estado}")
+        conn = sqlite3.connect(tmp)
+        try:
+            tam = int(conn.execute("PRAGMA page_size").fetchone()[0])
+        finally:
+            conn.close()
+        bytes_base = os.path.getsize(tmp)
+        total = bytes_base // tam
+        meta = json.dumps(
+            {"base": base["archivo"], "base_sha256": base["sha256"],
+             "page_size": tam, "paginas": total}
+        ).encode("utf-8")
+
+        h = hashlib.sha256()
+        cambiadas = 0
+        with open(tmp, "rb") as fn, abrir_lectura(base_path) as fb, \
+                _abrir_escritura(dest, comprimir) as fo:
+            fo.write(MAGIA + _NRO.pack(len(meta)) + meta)
+            for nro in range(1, total + 1):
+                pag = _leer(fn, tam)
+                h.update(pag)
+                if _leer(fb, tam) != pag:
+                    fo.write(_NRO.pack(nro) + pag)
+                    cambiadas += 1
+                if progreso and nro % BACKUP_PAGINAS == 0:
+                    progreso(nro, total, "comparando páginas")
+            fo.write(_NRO.pack(0))
+        sha = h.hexdigest()
+        _borrar(tmp)
+
+        if progreso:
+            progreso(0, None, "verificando")
+        _aplicar_diferencial(base_path, dest, prueba)
+        with open(prueba, "rb") as fh:
+            if _sha256(fh) != sha:
+                raise RuntimeError("El diferencial no reconstruye la base copiada")
+    except BaseException:
+        _borrar(tmp, dest)
+        raise
+    finally:
+        _borrar(prueba)
+    return {
+        "archivo": dest,
+        "base": base["archivo"],
+        "bytes": os.path.getsize(dest),
+        "bytes_base": bytes_base,
+        "paginas": cambiadas,
+        "sha256": sha,
+        "compresion": comprimir,
+        "integridad": estado,
+        "segundos": round(time.perf_counter() - t0, 4),
+    }
+
+
+def respaldar(carpeta, modo="auto", comprimir="gzip", vacuum=False, progreso=None,
+              db_path=None) -> dict:
+    """
+    Backup registrado en el manifest de `carpeta`.
+    modo: "completo" | "diferencial" | "auto" (diferencial contra el último
+    completo, salvo que no haya, tenga más de DIAS_COMPLETO días o el último
+    diferencial ya pese más de MAX_DIFERENCIAL del completo). En auto, si la
+    base copiada tiene el mismo sha256 que el último backup (ninguna página
+    distinta) se descarta la copia y no se registra nada. No se usa el
+    registro de cambios: no cubre todas las tablas (divisas, numeradores...).
+    Devuelve el resultado de crear_backup / crear_diferencial con "tipo"
+    ("sin cambios": archivo y bytes del último backup).
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    backups = leer_manifest(carpeta)
+    previo = backups[-1] if backups else None
+    auto = modo == "auto"
+    completos = [
+        b for b in backups
+        if b["tipo"] == "completo" and os.path.exists(os.path.join(carpeta, b["archivo"]))
+    ]
+    base = completos[-1] if completos else None
+    if modo == "auto":
+        modo = "completo"
+        if base is not None:
+            edad = datetime.now() - datetime.fromisoformat(base["fecha"])
+            difs = [b for b in backups if b.get("base") == base["archivo"]]
+            pesado = difs and difs[-1]["bytes"] > MAX_DIFERENCIAL * base["bytes"]
+            if edad.days < DIAS_COMPLETO and not pesado:
+                modo = "diferencial"
+    if modo == "diferencial":
+        if base is None:
+            raise RuntimeError("No hay un backup completo en la carpeta para el diferencial")
+        res = crear_diferencial(carpeta, base, comprimir=comprimir, progreso=progreso,
+                                db_path=db_path)
+    elif modo == "completo":
+        res = crear_backup(carpeta, comprimir=comprimir, vacuum=vacuum, progreso=progreso,
+                           db_path=db_path)
+        res["base"] = None
+        res["paginas"] = None
+    else:
+        raise ValueError(f"Modo de backup desconocido: {modo!r}")
+    if (
+        auto
+        and previo
+        and previo["sha256"] == res["sha256"]
+        and os.path.exists(os.path.join(carpeta, previo["archivo"]))
+    ):
+        _borrar(res["archivo"])
+        return {
+            "tipo": "sin cambios",
+            "archivo": os.path.join(carpeta, previo["archivo"]),
+            "bytes": previo["bytes"],
+            "sha256": res["sha256"],
+        }
+    res["tipo"] = modo
+    backups.append({
+        "archivo": os.path.basename(res["archivo"]),
+        "tipo": modo,
+        "base": res["base"],
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "sha256": res["sha256"],
+        "bytes": res["bytes"],
+        "bytes_base": res["bytes_base"],
+        "paginas": res["paginas"],
+    })
+    _guardar_manifest(carpeta, backups)
+    return res
+
+
+def aplicar_retencion(carpeta, diarios=7, mensuales=12, simular=False) -> dict:
+    """
+    Deja el backup más nuevo de cada uno de los últimos `diarios` días y de
+    cada uno de los últimos `mensuales` meses (días/meses con backups), más el
+    completo de cada diferencial que queda y el último completo (base de los
+    próximos diferenciales). Borra el resto de lo que figura en el manifest.
+    Devuelve {"quedan": [...], "borrados": [...]}.
+    """
+    backups = leer_manifest(carpeta)
+    quedan, dias, meses = set(), [], []
+    for b in reversed(_por_fecha(backups)):
+        dia, mes = b["fecha"][:10], b["fecha"][:7]
+        if dia not in dias and len(dias) < diarios:
+            dias.append(dia)
+            quedan.add(b["archivo"])
+        if mes not in meses and len(meses) < mensuales:
+            meses.append(mes)
+            quedan.add(b["archivo"])
+    completos = [b["archivo"] for b in backups if b["tipo"] == "completo"]
+    if completos:
+        quedan.add(completos[-1])
+    quedan |= {b["base"] for b in backups if b["archivo"] in quedan and b.get("base")}
+
+    borrados = [b["archivo"] for b in backups if b["archivo"] not in quedan]
+    if not simular and borrados:
+        _guardar_manifest(carpeta, [b for b in backups if b["archivo"] in quedan])
+        _borrar(*(os.path.join(carpeta, a) for a in borrados))
+    return {"quedan": sorted(quedan), "borrados": borrados}
+
+
+def elegir_backup(carpeta, hasta=None, archivo=None) -> dict:
+    """Entrada del manifest: por nombre, o la más nueva con fecha <= hasta (None = la última)."""
+    backups = leer_manifest(carpeta)
+    if archivo:
+        for b in backups:
+            if b["archivo"] == os.path.basename(archivo):
+                return b
+        raise RuntimeError(f"{archivo} no figura en {MANIFEST}")
+    if hasta is not None:
+        hasta = hasta.isoformat(timespec="seconds") if isinstance(hasta, datetime) else str(hasta)
+        if len(hasta) == 10:
+            hasta += "T23:59:59"
+        backups = [b for b in backups if b["fecha"] <= hasta.replace(" ", "T")]
+    if not backups:
+        raise RuntimeError("No hay backups que cumplan la condición")
+    return _por_fecha(backups)[-1]
+
+
+def restaurar(carpeta, destino, hasta=None, archivo=None, forzar=False) -> dict:
+    """
+    Reconstruye en `destino` la base de un backup del manifest (ver elegir_backup):
+    completo -> se descomprime; diferencial -> su completo + sus páginas.
+    Controla sha256 e integrity_check antes de reemplazar `destino`; si
+    `destino` existe hace falta forzar=True (y la app tiene que estar cerrada).
+    """
+    t0 = time.perf_counter()
+    b = elegir_backup(carpeta, hasta=hasta, archivo=archivo)
+    if os.path.exists(destino) and not forzar:
+        raise FileExistsError(f"{destino} ya existe (usar forzar)")
+    tmp = _tmp_en(os.path.dirname(os.path.abspath(destino)), ".restaurar_")
+    try:
+        origen = os.path.join(carpeta, b["archivo"])
+        if b["tipo"] == "diferencial":
+            base_path = os.path.join(carpeta, b["base"])
+            if not os.path.exists(base_path):
+                raise RuntimeError(f"Falta el completo {b['base']} del diferencial")
+            _aplicar_diferencial(base_path, origen, tmp)
+        else:
+            _descomprimir(origen, tmp)
+        with open(tmp, "rb") as fh:
+            if _sha256(fh) != b["sha256"]:
+                raise RuntimeError("La base reconstruida no coincide con el backup (sha256)")
+        estado = integridad(tmp)
+        if estado != "ok":
+            raise RuntimeError(f"La base reconstruida no pasó integrity_check: {estado}")
+        _borrar(str(destino) + "-wal", str(destino) + "-shm")
+        os.replace(tmp, destino)
+    except BaseException:
+        _borrar(tmp)
+        raise
+    return {
+        "archivo": b["archivo"],
+        "tipo": b["tipo"],
+        "fecha": b["fecha"],
+        "destino": str(destino),
+        "segundos": round(time.perf_counter() - t0, 4),
+    }
@@ -0,0 +1,108 @@
+# bench_pdf.py — Medición de latencia por documento de pdf_render
+# -------------------------------------------------
+# Uso:  python bench_pdf.py [--docs 50] [--filas 40]
+# - Arma los mismos PDFs (recibos, OPs y resúmenes de CC con datos de
+#   ejemplo) de dos maneras y compara el tiempo por documento:
+#     antes:  limpiar_cache() antes de cada PDF -> hoja de estilos y TableStyle
+#             se rearman en cada documento (lo que hacía cada _emitir_*_pdf)
+#     ahora:  caché de pdf_render armada una vez y reusada (renderizar_lote)
+# - Escribe en una carpeta temporal que se borra al terminar; no toca la base.
+# -------------------------------------------------
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pdf_render
+
+
+def _trabajos(carpeta: Path, docs: int, filas: int):
+    cheques = [
+        {"numero": f"{1000 + i}", "banco": "Banco Nación", "fecha": "2024-05-10",
+         "importe": 12500.5 * (i + 1)}
+        for i in range(4)
+    ]
+    ent = {"rs": "Textil Ejemplo SRL", "cuit": "30-12345678-9", "dir": "Av. Siempreviva 742"}
+    movs = [
+        (f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", f"FAC {i:08d}", f"Factura {i}",
+         1500.0 * (i % 7), 900.0 * (i % 3))
+        for i in range(filas)
+    ]
+    out = []
+    for i in range(docs):
+        k = i % 3
+        path = str(carpeta / f"doc_{i}.pdf")
+        if k == 0:
+            out.append(("recibo", path, (f"0001-{i:08d}", "2024-05-10", ent, "Cobranza",
+                                         "cheque", 50002.0, cheques)))
+        elif k == 1:
+            out.append(("orden_pago", path, (f"0001-{i:08d}", "2024-05-10", ent, "Pago",
+                                             "cheque", 50002.0, cheques)))
+        else:
+            out.append(("resumen_cc", path, (f"Resumen de cuenta {i}",
+                                             {"Entidad": ent["rs"], "CUIT/DNI": ent["cuit"]},
+                                             "Cuenta 1", movs, 123456.78)))
+    return out
+
+
+def _stats(tiempos):
+    ms = [t * 1000 for t in tiempos]
+    return {
+        "docs": len(ms),
+        "media_ms": round(statistics.mean(ms), 2),
+        "mediana_ms": round(statistics.median(ms), 2),
+        "max_ms": round(max(ms), 2),
+    }
+
+
+def correr(docs: int = 50, filas: int = 40) -> dict:
+    """Devuelve {"antes": stats, "ahora": stats, "mejora": factor por documento}."""
+    tmp = Path(tempfile.mkdtemp(prefix="bench_pdf_"))
+    try:
+        trabajos = _trabajos(tmp, docs, filas)
+
+        # calentamiento: que el import de reportlab no caiga en ninguna medición
+        pdf_render.renderizar_lote(trabajos[:3])
+
+        antes = []
+        for t in trabajos:
+            pdf_render.limpiar_cache()
+            t0 = time.perf_counter()
+            pdf_render.PLANTILLAS[t[0]](t[1], *t[2])
+            antes.append(time.perf_counter() - t0)
+
+        pdf_render.limpiar_cache()
+        res = pdf_render.renderizar_lote(trabajos)
+        errores = [e for _p, _s, e in res if e]
+        if errores:
+            raise RuntimeError(errores[0])
+        ahora = [s for _p, s, _e in res]
+
+        a, b = _stats(antes), _stats(ahora)
+        return {"antes": a, "ahora": b, "mejora": round(a["media_ms"] / b["media_ms"], 2)}
+    finally:
+        pdf_render.limpiar_cache()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Latencia por documento de pdf_render")
+    ap.add_argument("--docs", type=int, default=50)
+    ap.add_argument("--filas", type=int, default=40, help="renglones de cada resumen")
+    a = ap.parse_args(argv)
+
+    res = correr(a.docs, a.filas)
+    for k in ("antes", "ahora"):
+        s = res[k]
+        print(f"{k:5}: {s['docs']} docs  media {s['media_ms']} ms  "
+              f"mediana {s['mediana_ms']} ms  máx {s['max_ms']} ms")
+    print(f"mejora por documento: x{res['mejora']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
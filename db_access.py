@@ -1,2318 +1,3846 @@
-# SQLite backend para Gestión Textil (CC dual, cheques, caja, reportes)
-import sqlite3
-from pathlib import Path
-import os
-from datetime import datetime
-
-DB_PATH = Path("gestion_textil.db")
-
-
-def get_conn():
-    # timeout alto + WAL + busy_timeout para minimizar "database is locked"
-    conn = sqlite3.connect(DB_PATH, timeout=10)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    conn.execute("PRAGMA journal_mode = WAL;")
-    conn.execute("PRAGMA busy_timeout = 10000;")
-    # conn.set_trace_callback(print)  # ← descomentá si querés log de cada SQL
-    return conn
-
-def _t_exists(cur, name: str) -> bool:
-    return bool(cur.execute(
-        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
-        (name,)
-    ).fetchone())
-
-def _col_exists(cur, table: str, col: str) -> bool:
-    try:
-        cols = [r[1] for r in cur.execute(f"PRAGMA table_info({table})")]
-        return col in cols
-    except Exception:
-        return False
-
-def cc_cli_reset_por_ids(ids):
-    """
-    Elimina movimientos/materializaciones de CC de clientes SOLO para los IDs dados,
-    cubriendo ambos esquemas posibles (cc_clientes_* y cc_cli_*).
-    Devuelve un dict con métricas para debug.
-    """
-    # Normalizar ids a ints
-    try:
-        ids = [int(str(x).strip()) for x in (ids or []) if str(x).strip() != ""]
-    except Exception:
-        ids = []
-
-    if not ids:
-        return {"tables": 0, "rows": 0}
-
-    conn = get_conn()
-    cur = conn.cursor()
-
-    # Tabla, columna del id
-    candidates = [
-        ("cc_clientes_cuenta1", "cliente_id"),
-        ("cc_clientes_cuenta2", "cliente_id"),
-        ("cc_clientes",        "cliente_id"),
-        ("cc_cli_cuenta1",     "ent_id"),
-        ("cc_cli_cuenta2",     "ent_id"),
-        ("cc_cli",             "ent_id"),
-    ]
-
-    tables_touched = 0
-    rows_deleted = 0
-    placeholders = ",".join(["?"] * len(ids))
-    params = tuple(ids)
-
-    for t, col in candidates:
-        if _t_exists(cur, t) and _col_exists(cur, t, col):
-            tables_touched += 1
-            try:
-                cnt = cur.execute(
-                    f"SELECT COUNT(*) FROM {t} WHERE {col} IN ({placeholders})",
-                    params
-                ).fetchone()[0]
-                rows_deleted += int(cnt or 0)
-                cur.execute(
-                    f"DELETE FROM {t} WHERE {col} IN ({placeholders})",
-                    params
-                )
-            except Exception as ex:
-                # No frenamos si una tabla falla
-                print(f"WARN borrar en {t}:", ex)
-
-    conn.commit()
-    conn.close()
-    return {"tables": tables_touched, "rows": rows_deleted}
-
-
-def _fmt_dmy(s):
-    if not s:
-        return ""
-    s = str(s).strip()
-    from datetime import datetime
-
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d"):
-        try:
-            d = datetime.strptime(s, fmt).date()
-            return d.strftime("%d/%m/%Y")
-        except Exception:
-            pass
-    return s
-
-
-# --- Normalizador universal de parámetros para sqlite ---
-
-
-def _as_params(data, cols):
-    """
-    Acepta:
-      - tuple/list ya en orden
-      - dict con las keys de 'cols'
-      - tuple/list con un único dict adentro
-    Devuelve siempre una tupla en el orden de 'cols'.
-    """
-    if isinstance(data, dict):
-        return tuple(data.get(k) for k in cols)
-    if isinstance(data, (list, tuple)) and len(data) == 1 and isinstance(data[0], dict):
-        d = data[0]
-        return tuple(d.get(k) for k in cols)
-    return tuple(data)
-
-
-# -------------------- INIT / MIGRACIONES --------------------
-
-
-def _table_info(conn, table):
-    try:
-        rows = conn.execute(f"PRAGMA table_info({table});").fetchall()
-        return {r[1]: r for r in rows}
-    except Exception:
-        return {}
-
-
-def _ensure_numeradores(conn):
-    """
-    Asegura tabla numeradores (tipo TEXT PK, valor INTEGER).
-    Si existe con columnas raras, la migra limpiamente.
-    """
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS numeradores (
-            tipo   TEXT PRIMARY KEY,
-            valor  INTEGER NOT NULL DEFAULT 0
-        )
-    """
-    )
-    cols = _table_info(conn, "numeradores").keys()
-    ok = "tipo" in cols and "valor" in cols and len(cols) == 2
-    if not ok:
-        # Migración: renombro, creo bien, intento copiar si hay columnas compatibles
-        try:
-            cur.execute("ALTER TABLE numeradores RENAME TO numeradores_bak")
-        except Exception:
-            pass
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS numeradores (
-                tipo   TEXT PRIMARY KEY,
-                valor  INTEGER NOT NULL DEFAULT 0
-            )
-        """
-        )
-        try:
-            bcols = _table_info(conn, "numeradores_bak").keys()
-            if "tipo" in bcols and "valor" in bcols:
-                cur.execute(
-                    "INSERT INTO numeradores(tipo,valor) SELECT tipo, valor FROM numeradores_bak"
-                )
-            cur.execute("DROP TABLE IF EXISTS numeradores_bak")
-        except Exception:
-            cur.execute("DROP TABLE IF EXISTS numeradores_bak")
-
-    # Semillas necesarias
-    for t in ("recibo", "op"):
-        cur.execute(
-            "INSERT OR IGNORE INTO numeradores (tipo, valor) VALUES (?, 0)", (t,)
-        )
-
-
-def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
-
-    # Clientes
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS clientes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        tipo TEXT,
-        razon_social TEXT,
-        condicion_iva TEXT,
-        cuit_dni TEXT,
-        tel1 TEXT, cont1 TEXT,
-        tel2 TEXT, cont2 TEXT,
-        email TEXT,
-        calle TEXT, nro TEXT, entre TEXT,
-        localidad TEXT, cp TEXT, provincia TEXT,
-        estado TEXT
-    )
-    """
-    )
-
-    # Divisas (compra/venta de USD) — linkeado a movimientos de caja
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS divisas (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha      TEXT,
-        tipo       TEXT,      -- 'compra' | 'venta'
-        usd        REAL,
-        tc         REAL,      -- tipo de cambio (pesos por USD)
-        pesos      REAL,      -- importe en pesos
-        cuenta     TEXT,      -- cuenta1 | cuenta2 | ambas | NULL
-        mov_caja_id INTEGER,  -- vínculo a movimientos_caja.id
-        obs        TEXT
-    )
-    """
-    )
-
-    # Proveedores
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS proveedores (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        tipo TEXT,
-        razon_social TEXT,
-        condicion_iva TEXT,
-        cuit_dni TEXT,
-        tel1 TEXT, cont1 TEXT,
-        tel2 TEXT, cont2 TEXT,
-        email TEXT,
-        calle TEXT, nro TEXT, entre TEXT,
-        localidad TEXT, cp TEXT, provincia TEXT,
-        estado TEXT
-    )
-    """
-    )
-
-    # Empleados (según tu dump)
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS empleados (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nombre TEXT,
-        apellido TEXT,
-        dni_cuil TEXT,
-        telefono TEXT,
-        email TEXT,
-        calle TEXT,
-        numero TEXT,
-        entre_calles TEXT,
-        localidad TEXT,
-        cp TEXT,
-        provincia TEXT,
-        puesto TEXT,
-        fecha_ingreso TEXT,
-        tel_emergencias TEXT,
-        contacto_emergencias TEXT,
-        estado TEXT,
-        fecha_egreso TEXT
-    )
-    """
-    )
-
-    # Caja (con 'cuenta')
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS movimientos_caja (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT,
-        tipo TEXT,                 -- ingreso | egreso
-        medio TEXT,                -- efectivo | cheque | banco | otro
-        concepto TEXT,
-        detalle TEXT,
-        monto REAL,
-        tercero_tipo TEXT,         -- cliente | proveedor | ''
-        tercero_id INTEGER,
-        estado TEXT,               -- confirmado | pendiente
-        origen_tipo TEXT,          -- recibo | orden_pago | factura | etc
-        origen_id INTEGER,
-        categoria_id INTEGER,
-        centro_costo_id INTEGER,
-        cuenta TEXT                -- cuenta1 | cuenta2 | ambas | NULL
-    )
-    """
-    )
-
-    # Cheques (con 'cuenta' opcional y estado)
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS cheques (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        numero TEXT,
-        banco TEXT,
-        importe REAL,
-        fecha_recibido TEXT,
-        fecha_cobro TEXT,
-        cliente_id INTEGER,
-        firmante_nombre TEXT,
-        firmante_cuit TEXT,
-        estado TEXT,               -- en_cartera | depositado | endosado | rechazado
-        fecha_estado TEXT,
-        obs TEXT,
-        mov_caja_id INTEGER,
-        proveedor_id INTEGER,
-        cuenta_banco TEXT,
-        gastos_bancarios REAL,
-        cuenta TEXT                -- cuenta1 | cuenta2 | NULL
-    )
-    """
-    )
-
-    # Cuentas corrientes separadas: CLIENTES
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS cc_clientes_c1 (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT,
-        cliente_id INTEGER,
-        doc TEXT,
-        numero TEXT,
-        concepto TEXT,
-        medio TEXT,
-        debe REAL,
-        haber REAL,
-        caja_mov_id INTEGER,
-        cheque_id INTEGER,
-        obs TEXT
-    )
-    """
-    )
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS cc_clientes_c2 (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT,
-        cliente_id INTEGER,
-        doc TEXT,
-        numero TEXT,
-        concepto TEXT,
-        medio TEXT,
-        debe REAL,
-        haber REAL,
-        caja_mov_id INTEGER,
-        cheque_id INTEGER,
-        obs TEXT
-    )
-    """
-    )
-
-    # Cuentas corrientes separadas: PROVEEDORES
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS cc_proveedores_c1 (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT,
-        proveedor_id INTEGER,
-        doc TEXT,
-        numero TEXT,
-        concepto TEXT,
-        medio TEXT,
-        debe REAL,
-        haber REAL,
-        caja_mov_id INTEGER,
-        cheque_id INTEGER,
-        obs TEXT
-    )
-    """
-    )
-    cur.execute(
-        """
-    CREATE TABLE IF NOT EXISTS cc_proveedores_c2 (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        fecha TEXT,
-        proveedor_id INTEGER,
-        doc TEXT,
-        numero TEXT,
-        concepto TEXT,
-        medio TEXT,
-        debe REAL,
-        haber REAL,
-        caja_mov_id INTEGER,
-        cheque_id INTEGER,
-        obs TEXT
-    )
-    """
-    )
-
-    # Numeradores (para next_num)
-    _ensure_numeradores(conn)
-
-    conn.commit()
-    conn.close()
-
-
-init_db()
-
-
-# -------- Numeradores / IDs --------
-
-
-def next_num(tipo: str, sucursal: str = "0001") -> str:
-    """
-    Devuelve un número tipo '0001-00000001' por cada 'tipo' (p.ej. 'recibo', 'op').
-    Persistente en tabla numeradores(tipo, valor).
-    """
-    tipo = (tipo or "").strip().lower()
-    if tipo not in ("recibo", "op"):
-        # Permitimos otros tipos, pero sembramos si no existe
-        pass
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "INSERT OR IGNORE INTO numeradores (tipo, valor) VALUES (?, 0)", (tipo,)
-    )
-    cur.execute("UPDATE numeradores SET valor = valor + 1 WHERE tipo = ?", (tipo,))
-    cur.execute("SELECT valor FROM numeradores WHERE tipo = ?", (tipo,))
-    n = int(cur.fetchone()[0])
-    conn.commit()
-    conn.close()
-    return f"{sucursal}-{n:08d}"
-
-
-def next_id(tabla: str) -> int:
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute(f"SELECT COALESCE(MAX(id),0)+1 FROM {tabla}")
-        nid = int(cur.fetchone()[0] or 1)
-    except Exception:
-        nid = 1
-    conn.close()
-    return nid
-
-
-# -------------------- CLIENTES / PROVEEDORES --------------------
-
-
-def listar_clientes():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT
-            id,           -- 0
-            tipo,         -- 1
-            razon_social, -- 2
-            condicion_iva,-- 3
-            cuit_dni,     -- 4
-            tel1,         -- 5
-            cont1,        -- 6
-            tel2,         -- 7
-            cont2,        -- 8
-            email,        -- 9
-            calle,        -- 10
-            nro,          -- 11
-            entre,        -- 12
-            localidad,    -- 13
-            cp,           -- 14
-            provincia,    -- 15
-            estado        -- 16
-        FROM clientes
-        ORDER BY id
-    """
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def obtener_cliente(cid: int):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id,tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
-               calle,nro,entre,localidad,cp,provincia,estado
-        FROM clientes WHERE id=?
-    """,
-        (cid,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
-
-
-def listar_clientes_id_nombre():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT id, razon_social FROM clientes ORDER BY razon_social")
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def agregar_cliente(data, id_manual=None):
-    # data = (tipo, razon_social, condicion_iva, cuit_dni, tel1, cont1, tel2, cont2,
-    #         email, calle, nro, entre, localidad, cp, provincia, estado)
-    conn = get_conn()
-    cur = conn.cursor()
-    if id_manual is not None:
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO clientes
-            (id,tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
-             calle,nro,entre,localidad,cp,provincia,estado)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            (id_manual, *data),
-        )
-    else:
-        cur.execute(
-            """
-            INSERT INTO clientes
-            (tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
-             calle,nro,entre,localidad,cp,provincia,estado)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            data,
-        )
-    conn.commit()
-    conn.close()
-
-
-def editar_cliente(cid, data):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE clientes SET
-            tipo=?, razon_social=?, condicion_iva=?, cuit_dni=?, tel1=?, cont1=?,
-            tel2=?, cont2=?, email=?, calle=?, nro=?, entre=?, localidad=?, cp=?, provincia=?, estado=?
-        WHERE id=?
-    """,
-        (*data, cid),
-    )
-    conn.commit()
-    conn.close()
-
-
-def borrar_cliente(cid):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM clientes WHERE id=?", (cid,))
-    conn.commit()
-    conn.close()
-
-
-# --- PROVEEDORES: CRUD básico y listados ---
-
-
-def listar_proveedores():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, tipo, razon_social, condicion_iva, cuit_dni,
-               tel1, cont1, tel2, cont2, email,
-               calle, nro, entre, localidad, cp, provincia, estado
-        FROM proveedores
-        ORDER BY id ASC
-    """
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def listar_proveedores_id_nombre():
-    # Para combos / selección rápida (usa en Endosar cheque)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, razon_social FROM proveedores ORDER BY razon_social COLLATE NOCASE"
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def obtener_proveedor(proveedor_id: int):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, tipo, razon_social, condicion_iva, cuit_dni,
-               tel1, cont1, tel2, cont2, email,
-               calle, nro, entre, localidad, cp, provincia, estado
-        FROM proveedores
-        WHERE id=?
-    """,
-        (proveedor_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
-
-
-def agregar_proveedor(data, id_manual=None):
-    """
-    data = (tipo, razon_social, condicion_iva, cuit_dni,
-            tel1, cont1, tel2, cont2, email,
-            calle, nro, entre, localidad, cp, provincia, estado)
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    if id_manual is None:
-        cur.execute(
-            """
-            INSERT INTO proveedores
-            (tipo, razon_social, condicion_iva, cuit_dni,
-             tel1, cont1, tel2, cont2, email,
-             calle, nro, entre, localidad, cp, provincia, estado)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            tuple(data),
-        )
-    else:
-        # Permití alta con ID manual
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO proveedores
-            (id, tipo, razon_social, condicion_iva, cuit_dni,
-             tel1, cont1, tel2, cont2, email,
-             calle, nro, entre, localidad, cp, provincia, estado)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            (id_manual,) + tuple(data),
-        )
-    conn.commit()
-    conn.close()
-
-
-def editar_proveedor(proveedor_id: int, data):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE proveedores
-        SET tipo=?, razon_social=?, condicion_iva=?, cuit_dni=?,
-            tel1=?, cont1=?, tel2=?, cont2=?, email=?,
-            calle=?, nro=?, entre=?, localidad=?, cp=?, provincia=?, estado=?
-        WHERE id=?
-    """,
-        tuple(data) + (proveedor_id,),
-    )
-    conn.commit()
-    conn.close()
-
-
-def borrar_proveedor(pid):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM proveedores WHERE id=?", (pid,))
-    conn.commit()
-    conn.close()
-
-
-# -------------------- EMPLEADOS (NUEVO) --------------------
-
-
-def listar_empleados():
-    conn = get_conn()
-    cur = conn.cursor()
-    rows = cur.execute(
-        """
-        SELECT id, nombre, apellido, dni_cuil, telefono, email,
-               calle, numero, entre_calles, localidad, cp, provincia,
-               puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
-               estado, fecha_egreso
-        FROM empleados
-        ORDER BY id ASC
-    """
-    ).fetchall()
-    conn.close()
-    return rows
-
-
-def obtener_empleado(emp_id: int):
-    conn = get_conn()
-    cur = conn.cursor()
-    row = cur.execute(
-        """
-        SELECT id, nombre, apellido, dni_cuil, telefono, email,
-               calle, numero, entre_calles, localidad, cp, provincia,
-               puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
-               estado, fecha_egreso
-        FROM empleados
-        WHERE id=?
-    """,
-        (emp_id,),
-    ).fetchone()
-    conn.close()
-    return row
-
-
-def agregar_empleado(data_tuple, id_manual: int | None = None):
-    """
-    data_tuple = (
-      nombre, apellido, dni_cuil, telefono, email,
-      calle, numero, entre_calles, localidad, cp, provincia,
-      puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
-      estado, fecha_egreso
-    )
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    if id_manual is not None:
-        cur.execute(
-            """
-            INSERT OR REPLACE INTO empleados(
-              id, nombre, apellido, dni_cuil, telefono, email,
-              calle, numero, entre_calles, localidad, cp, provincia,
-              puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
-              estado, fecha_egreso
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            (id_manual, *data_tuple),
-        )
-    else:
-        cur.execute(
-            """
-            INSERT INTO empleados(
-              nombre, apellido, dni_cuil, telefono, email,
-              calle, numero, entre_calles, localidad, cp, provincia,
-              puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
-              estado, fecha_egreso
-            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-            data_tuple,
-        )
-    conn.commit()
-    conn.close()
-
-
-def editar_empleado(emp_id: int, data_tuple):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE empleados SET
-          nombre=?, apellido=?, dni_cuil=?, telefono=?, email=?,
-          calle=?, numero=?, entre_calles=?, localidad=?, cp=?, provincia=?,
-          puesto=?, fecha_ingreso=?, tel_emergencias=?, contacto_emergencias=?,
-          estado=?, fecha_egreso=?
-        WHERE id=?
-    """,
-        (*data_tuple, emp_id),
-    )
-    conn.commit()
-    conn.close()
-
-
-def borrar_empleado(emp_id: int):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM empleados WHERE id=?", (emp_id,))
-    conn.commit()
-    conn.close()
-
-
-# -------------------- CAJA --------------------
-
-
-def agregar_movimiento(data, id_manual=None):
-    """
-    data: (fecha, tipo, medio, concepto, detalle, monto,
-           tercero_tipo, tercero_id, estado, origen_tipo, origen_id,
-           categoria_id, centro_costo_id, cuenta)
-    También acepta dict con esas keys, o ([dict],).
-    """
-    cols = (
-        "fecha",
-        "tipo",
-        "medio",
-        "concepto",
-        "detalle",
-        "monto",
-        "tercero_tipo",
-        "tercero_id",
-        "estado",
-        "origen_tipo",
-        "origen_id",
-        "categoria_id",
-        "centro_costo_id",
-        "cuenta",
-    )
-
-    params = _as_params(data, cols)
-
-    conn = get_conn()
-    cur = conn.cursor()
-    placeholders = ",".join(["?"] * len(cols))
-    if id_manual is not None:
-        cur.execute(
-            f"INSERT INTO movimientos_caja (id,{','.join(cols)}) VALUES ({id_manual},{placeholders})",
-            params,
-        )
-    else:
-        cur.execute(
-            f"INSERT INTO movimientos_caja ({','.join(cols)}) VALUES ({placeholders})",
-            params,
-        )
-    conn.commit()
-    last = cur.lastrowid
-    conn.close()
-    return last
-
-
-# ===================== CAJA: helpers =====================
-
-
-def caja_agregar(
-    fecha,
-    tipo,
-    medio,
-    concepto,
-    detalle,
-    monto,
-    tercero_tipo,
-    tercero_id,
-    cuenta,
-    origen_tipo=None,
-    origen_id=None,
-    id_manual=None,
-) -> int:
-    """
-    Crea un movimiento en 'movimientos_caja' y devuelve su ID.
-    tipo: 'ingreso' | 'egreso'
-    tercero_tipo: 'cliente' | 'proveedor'
-    cuenta: 'cuenta1' | 'cuenta2' | 1 | 2  (se normaliza a 1/2)
-    """
-    cuenta_n = 1 if str(cuenta).strip().lower().endswith("1") else 2
-    conn = get_conn()
-    cur = conn.cursor()
-
-    cols = [
-        "fecha",
-        "tipo",
-        "medio",
-        "concepto",
-        "detalle",
-        "monto",
-        "tercero_tipo",
-        "tercero_id",
-        "estado",
-        "origen_tipo",
-        "origen_id",
-        "categoria_id",
-        "centro_costo_id",
-        "cuenta",
-    ]
-    placeholders = ",".join(["?"] * len(cols))
-    params = (
-        str(fecha or ""),
-        str(tipo or "").lower(),
-        str(medio or ""),
-        str(concepto or ""),
-        str(detalle or ""),
-        float(monto or 0),
-        str(tercero_tipo or "").lower(),
-        int(tercero_id or 0),
-        "ok",  # estado por defecto
-        origen_tipo,
-        origen_id,
-        None,
-        None,
-        cuenta_n,
-    )
-
-    if id_manual is not None:
-        cur.execute(
-            f"INSERT INTO movimientos_caja (id,{','.join(cols)}) VALUES ({int(id_manual)},{placeholders})",
-            params,
-        )
-    else:
-        cur.execute(
-            f"INSERT INTO movimientos_caja ({','.join(cols)}) VALUES ({placeholders})",
-            params,
-        )
-
-    conn.commit()
-    mov_id = cur.lastrowid
-    conn.close()
-    return mov_id
-
-
-def caja_set_origen(mov_id: int, origen_tipo: str, origen_id: int) -> None:
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        "UPDATE movimientos_caja SET origen_tipo=?, origen_id=? WHERE id=?",
-        (str(origen_tipo or ""), int(origen_id or 0), int(mov_id)),
-    )
-    conn.commit()
-    conn.close()
-
-
-def caja_listar():
-    """
-    Devuelve filas para listar caja en UI.
-    (id, fecha, tipo, tercero_tipo, tercero_id, concepto, detalle, monto, medio, origen_tipo, origen_id, cuenta)
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, fecha, tipo, tercero_tipo, tercero_id, concepto, detalle, monto, medio,
-               origen_tipo, origen_id, cuenta
-        FROM movimientos_caja
-        ORDER BY date(fecha) DESC, id DESC
-    """
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def listar_movimientos():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """SELECT id, fecha, tipo, medio, concepto, detalle, monto,
-                          tercero_tipo, tercero_id, estado, origen_tipo, origen_id,
-                          categoria_id, centro_costo_id, cuenta
-                   FROM movimientos_caja
-                   ORDER BY date(fecha) DESC, id DESC"""
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def borrar_mov_caja(mov_id: int):
-    """Borra un movimiento de caja y desengancha todas las referencias (cheques y CC)."""
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        # Desvincular cheques que apuntan a este movimiento de caja
-        cur.execute(
-            "UPDATE cheques SET mov_caja_id=NULL WHERE mov_caja_id=?", (mov_id,)
-        )
-        # Desvincular CC (clientes y proveedores) que apuntan a este movimiento de caja
-        for t in (
-            "cc_clientes_c1",
-            "cc_clientes_c2",
-            "cc_proveedores_c1",
-            "cc_proveedores_c2",
-        ):
-            cur.execute(
-                f"UPDATE {t} SET caja_mov_id=NULL WHERE caja_mov_id=?", (mov_id,)
-            )
-        # Borrar el movimiento de caja
-        cur.execute("DELETE FROM movimientos_caja WHERE id=?", (mov_id,))
-        conn.commit()
-    finally:
-        conn.close()
-
-
-# -------------------- CHEQUES --------------------
-
-
-def agregar_cheque(data, id_manual=None):
-    """
-    data = (
-        numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
-        firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
-        mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
-    )
-    También acepta dict con esas keys, o ([dict],).
-    """
-    cols = (
-        "numero",
-        "banco",
-        "importe",
-        "fecha_recibido",
-        "fecha_cobro",
-        "cliente_id",
-        "firmante_nombre",
-        "firmante_cuit",
-        "estado",
-        "fecha_estado",
-        "obs",
-        "mov_caja_id",
-        "proveedor_id",
-        "cuenta_banco",
-        "gastos_bancarios",
-        "cuenta",
-    )
-
-    params = _as_params(data, cols)
-
-    conn = get_conn()
-    cur = conn.cursor()
-    placeholders = ",".join(["?"] * len(cols))
-    if id_manual is not None:
-        cur.execute(
-            f"INSERT INTO cheques (id,{','.join(cols)}) VALUES ({id_manual},{placeholders})",
-            params,
-        )
-    else:
-        cur.execute(
-            f"INSERT INTO cheques ({','.join(cols)}) VALUES ({placeholders})", params
-        )
-    conn.commit()
-    last = cur.lastrowid
-    conn.close()
-    return last
-
-
-def listar_cheques():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
-               firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
-               mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
-        FROM cheques
-        ORDER BY
-            CASE LOWER(COALESCE(estado,'')) WHEN 'en_cartera' THEN 0 ELSE 1 END,
-            date(fecha_cobro) ASC,
-            id ASC
-    """
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def listar_cheques_por_estado(estado: str):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
-               firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
-               mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
-        FROM cheques
-        WHERE LOWER(COALESCE(estado,'')) = LOWER(?)
-        ORDER BY date(fecha_cobro) ASC, id ASC
-    """,
-        (estado,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def listar_cheques_en_cartera():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """SELECT id, numero, banco, importe, fecha_cobro, cliente_id, firmante_nombre, firmante_cuit, cuenta
-                   FROM cheques
-                   WHERE LOWER(COALESCE(estado,''))='en_cartera'
-                   ORDER BY date(fecha_cobro) ASC, id ASC"""
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def obtener_cheque(cid):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
-                          firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
-                          mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
-                   FROM cheques WHERE id=?""",
-        (cid,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
-
-
-def actualizar_estado_cheque(
-    cid,
-    nuevo_estado,
-    fecha_estado,
-    proveedor_id=None,
-    cuenta_banco=None,
-    gastos_bancarios=None,
-):
-    conn = get_conn()
-    cur = conn.cursor()
-    sets = ["estado=?", "fecha_estado=?"]
-    params = [nuevo_estado, fecha_estado]
-    if proveedor_id is not None:
-        sets.append("proveedor_id=?")
-        params.append(proveedor_id)
-    if cuenta_banco is not None:
-        sets.append("cuenta_banco=?")
-        params.append(cuenta_banco)
-    if gastos_bancarios is not None:
-        sets.append("gastos_bancarios=?")
-        params.append(gastos_bancarios)
-    params.append(cid)
-    cur.execute(f"UPDATE cheques SET {', '.join(sets)} WHERE id=?", params)
-    conn.commit()
-    conn.close()
-
-
-def set_mov_caja_en_cheque(cheque_id, mov_id):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("PRAGMA foreign_keys=ON;")
-    cur.execute("UPDATE cheques SET mov_caja_id=? WHERE id=?", (mov_id, cheque_id))
-    conn.commit()
-    conn.close()
-
-
-# -------------------- CC CLIENTES (C1/C2) --------------------
-
-
-def _cli_table(cuenta):
-    return "cc_clientes_c1" if str(cuenta).lower().endswith("1") else "cc_clientes_c2"
-
-
-def cc_cli_agregar_mov(
-    cuenta,
-    fecha,
-    cliente_id,
-    doc,
-    numero,
-    concepto,
-    medio,
-    debe,
-    haber,
-    caja_mov_id=None,
-    cheque_id=None,
-    obs=None,
-):
-    table = _cli_table(cuenta)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        INSERT INTO {table}
-        (fecha, cliente_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?)
-    """,
-        (
-            fecha,
-            int(cliente_id),
-            doc,
-            numero,
-            concepto,
-            medio,
-            float(debe or 0),
-            float(haber or 0),
-            caja_mov_id,
-            cheque_id,
-            obs,
-        ),
-    )
-    conn.commit()
-    last = cur.lastrowid
-    conn.close()
-    return last
-
-def cc_cli_agregar_con_caja(
-    cuenta,
-    fecha,
-    cliente_id,
-    doc,
-    numero,
-    concepto,
-    medio,
-    debe,
-    haber,
-    cuenta_caja=None,
-    cheque_id=None,
-    obs=None,
-):
-    """
-    Crea CC Clientes + movimiento de Caja vinculado.
-    Regla: si HABER > 0 -> ingreso; si DEBE > 0 -> egreso (casos raros como devolución).
-    Devuelve (cc_id, caja_id).
-    """
-    # 1) Creo Caja primero
-    monto = float(haber or 0) if float(haber or 0) > 0 else float(debe or 0)
-    tipo_caja = "ingreso" if float(haber or 0) > 0 else "egreso"
-    caja_id = caja_agregar(
-        fecha=fecha,
-        tipo=tipo_caja,
-        medio=medio,
-        concepto=concepto,
-        detalle=f"{str(doc or '').upper()} {str(numero or '')}".strip(),
-        monto=monto,
-        tercero_tipo="cliente",
-        tercero_id=cliente_id,
-        cuenta=(cuenta_caja if cuenta_caja is not None else cuenta),
-        origen_tipo=None,
-        origen_id=None,
-    )
-
-    # 2) Inserto CC con el id de caja ya asignado
-    table = "cc_clientes_c1" if str(cuenta).lower().endswith("1") else "cc_clientes_c2"
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        INSERT INTO {table}
-        (fecha, cliente_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?)
-    """,
-        (
-            fecha,
-            int(cliente_id),
-            doc,
-            numero,
-            concepto,
-            medio,
-            float(debe or 0),
-            float(haber or 0),
-            int(caja_id),
-            cheque_id,
-            obs,
-        ),
-    )
-    conn.commit()
-    cc_id = cur.lastrowid
-    conn.close()
-
-    # 3) Actualizo el origen en Caja
-    caja_set_origen(caja_id, "cc_cli", cc_id)
-    return cc_id, caja_id
-
-
-def cc_cli_listar(cliente_id, cuenta):
-    conn = get_conn()
-    cur = conn.cursor()
-    if cuenta == "ambas":
-        cur.execute(
-            """
-            SELECT 'C1' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
-            FROM cc_clientes_c1 WHERE cliente_id=?
-            UNION ALL
-            SELECT 'C2' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
-            FROM cc_clientes_c2 WHERE cliente_id=?
-            ORDER BY date(fecha) DESC, id DESC
-        """,
-            (cliente_id, cliente_id),
-        )
-    else:
-        table = _cli_table(cuenta)
-        cur.execute(
-            f"""
-            SELECT '{'C1' if table.endswith('c1') else 'C2'}' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
-            FROM {table} WHERE cliente_id=?
-            ORDER BY date(fecha) DESC, id DESC
-        """,
-            (cliente_id,),
-        )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def _dmy_to_iso(s: str) -> str:
-    try:
-        d, m, y = s.strip().split("/")
-        return f"{y}-{int(m):02d}-{int(d):02d}"
-    except Exception:
-        return s  # si ya viene ISO o algo raro, lo dejo pasar
-
-
-def cc_cli_saldo(cliente_id, cuenta):
-    conn = get_conn()
-    cur = conn.cursor()
-
-    def _sum(table):
-        cur.execute(
-            f"SELECT COALESCE(SUM(debe)-SUM(haber),0) FROM {table} WHERE cliente_id=?",
-            (cliente_id,),
-        )
-        r = cur.fetchone()
-        return float(r[0] or 0)
-
-    if cuenta == "ambas":
-        s = _sum("cc_clientes_c1") + _sum("cc_clientes_c2")
-    else:
-        s = _sum(_cli_table(cuenta))
-    conn.close()
-    return s
-
-
-# -------- CC CLIENTES: editar / borrar / obtener por id --------
-
-
-def _cli_table_by_flag(cuenta_flag: str):
-    c = (cuenta_flag or "").strip().lower()
-    return "cc_clientes_c1" if c.endswith("1") else "cc_clientes_c2"
-
-
-def cc_cli_obtener(cuenta_flag: str, mov_id: int):
-    table = _cli_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        SELECT id, fecha, cliente_id, doc, numero, concepto, medio,
-               COALESCE(debe,0), COALESCE(haber,0),
-               caja_mov_id, cheque_id, obs
-        FROM {table} WHERE id=?
-    """,
-        (mov_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
-
-
-# --- CLIENTES ---
-
-
-def cc_cli_actualizar(cuenta_flag: str, mov_id: int, data):
-    """
-    data = (fecha, doc, numero, concepto, medio, debe, haber, obs)
-    """
-    table = _cli_table_by_flag(cuenta_flag)  # -> "cc_clientes_c1" / "cc_clientes_c2"
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        UPDATE {table}
-        SET fecha=?, doc=?, numero=?, concepto=?, medio=?, debe=?, haber=?, obs=?
-        WHERE id=?
-    """,
-        (*data, mov_id),
-    )
-    conn.commit()
-    conn.close()
-
-
-def cc_cli_borrar(cuenta_flag: str, mov_id: int):
-    table = _cli_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
-    conn.commit()
-    conn.close()
-
-
-def cc_cli_borrar_cascada(cuenta_flag: str, mov_id: int):
-    """Borra una fila de CC Clientes y, si corresponde, su mov. de caja y/o cheque."""
-    table = _cli_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute(f"SELECT caja_mov_id, cheque_id FROM {table} WHERE id=?", (mov_id,))
-        row = cur.fetchone()
-        caja_id = row[0] if row else None
-        cheque_id = row[1] if row else None
-    finally:
-        conn.close()
-
-    # Borrar primero caja (si existe) porque ya se encargará de desenganchar referencias
-    if caja_id:
-        borrar_mov_caja(int(caja_id))
-
-    # Borrar cheque (si quedó alguno suelto)
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        if cheque_id:
-            cur.execute("DELETE FROM cheques WHERE id=?", (cheque_id,))
-        cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
-        conn.commit()
-    finally:
-        conn.close()
-
-
-# -------- CC PROVEEDORES: editar / borrar / obtener por id --------
-
-
-def _prov_table_by_flag(cuenta_flag: str):
-    c = (cuenta_flag or "").strip().lower()
-    return "cc_proveedores_c1" if c.endswith("1") else "cc_proveedores_c2"
-
-
-def cc_prov_obtener(cuenta_flag: str, mov_id: int):
-    table = _prov_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        SELECT id, fecha, proveedor_id, doc, numero, concepto, medio,
-               COALESCE(debe,0), COALESCE(haber,0),
-               caja_mov_id, cheque_id, obs
-        FROM {table} WHERE id=?
-    """,
-        (mov_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    return row
-
-
-# --- PROVEEDORES ---
-
-
-def cc_prov_actualizar(cuenta_flag: str, mov_id: int, data):
-    """
-    data = (fecha, doc, numero, concepto, medio, debe, haber, obs)
-    """
-    table = _prov_table_by_flag(
-        cuenta_flag
-    )  # -> "cc_proveedores_c1" / "cc_proveedores_c2"
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        UPDATE {table}
-        SET fecha=?, doc=?, numero=?, concepto=?, medio=?, debe=?, haber=?, obs=?
-        WHERE id=?
-    """,
-        (*data, mov_id),
-    )
-    conn.commit()
-    conn.close()
-
-
-def cc_prov_borrar(cuenta_flag: str, mov_id: int):
-    table = _prov_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
-    conn.commit()
-    conn.close()
-
-
-def cc_prov_borrar_cascada(cuenta_flag: str, mov_id: int):
-    """Borra una fila de CC Proveedores y, si corresponde, su mov. de caja y/o cheque."""
-    table = _prov_table_by_flag(cuenta_flag)
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute(f"SELECT caja_mov_id, cheque_id FROM {table} WHERE id=?", (mov_id,))
-        row = cur.fetchone()
-        caja_id = row[0] if row else None
-        cheque_id = row[1] if row else None
-    finally:
-        conn.close()
-
-    if caja_id:
-        borrar_mov_caja(int(caja_id))
-
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        if cheque_id:
-            cur.execute("DELETE FROM cheques WHERE id=?", (cheque_id,))
-        cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
-        conn.commit()
-    finally:
-        conn.close()
-
-
-# -------- CAJA: borrado forzado (desvincula CC y Cheques) --------
-
-
-def borrar_movimiento_caja_forzado(mov_id: int):
-    """
-    - Setea a NULL los vínculos hacia este mov:
-      * cheques.mov_caja_id
-      * cc_clientes_c1/2.caja_mov_id
-      * cc_proveedores_c1/2.caja_mov_id
-    - Borra el movimiento de caja.
-    Nota: NO cambia estado de cheques ni borra líneas de CC (solo los desvincula).
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    try:
-        cur.execute("PRAGMA foreign_keys=ON;")
-        # Desvincular cheques
-        cur.execute(
-            "UPDATE cheques SET mov_caja_id=NULL WHERE mov_caja_id=?", (mov_id,)
-        )
-        # Desvincular CC
-        for t in (
-            "cc_clientes_c1",
-            "cc_clientes_c2",
-            "cc_proveedores_c1",
-            "cc_proveedores_c2",
-        ):
-            cur.execute(
-                f"UPDATE {t} SET caja_mov_id=NULL WHERE caja_mov_id=?", (mov_id,)
-            )
-        # Borrar movimiento
-        cur.execute("DELETE FROM movimientos_caja WHERE id=?", (mov_id,))
-        conn.commit()
-    finally:
-        conn.close()
-
-
-# -------------------- CC PROVEEDORES (C1/C2) --------------------
-
-
-def _prov_table(cuenta):
-    return (
-        "cc_proveedores_c1"
-        if str(cuenta).lower().endswith("1")
-        else "cc_proveedores_c2"
-    )
-
-
-def cc_prov_agregar_mov(
-    cuenta,
-    fecha,
-    proveedor_id,
-    doc,
-    numero,
-    concepto,
-    medio,
-    debe,
-    haber,
-    caja_mov_id=None,
-    cheque_id=None,
-    obs=None,
-):
-    table = _prov_table(cuenta)
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        INSERT INTO {table}
-        (fecha, proveedor_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?)
-    """,
-        (
-            fecha,
-            int(proveedor_id),
-            doc,
-            numero,
-            concepto,
-            medio,
-            float(debe or 0),
-            float(haber or 0),
-            caja_mov_id,
-            cheque_id,
-            obs,
-        ),
-    )
-    conn.commit()
-    last = cur.lastrowid
-    conn.close()
-    return last
-
-
-def cc_prov_agregar_con_caja(
-    cuenta,
-    fecha,
-    proveedor_id,
-    doc,
-    numero,
-    concepto,
-    medio,
-    debe,
-    haber,
-    cuenta_caja=None,
-    cheque_id=None,
-    obs=None,
-):
-    """
-    Crea CC Proveedores + movimiento de Caja vinculado.
-    Regla: si HABER > 0 -> egreso (pago); si DEBE > 0 -> ingreso (nota de crédito recibida, etc).
-    Devuelve (cc_id, caja_id).
-    """
-    monto = float(haber or 0) if float(haber or 0) > 0 else float(debe or 0)
-    tipo_caja = "egreso" if float(haber or 0) > 0 else "ingreso"
-    caja_id = caja_agregar(
-        fecha=fecha,
-        tipo=tipo_caja,
-        medio=medio,
-        concepto=concepto,
-        detalle=f"{str(doc or '').upper()} {str(numero or '')}".strip(),
-        monto=monto,
-        tercero_tipo="proveedor",
-        tercero_id=proveedor_id,
-        cuenta=(cuenta_caja if cuenta_caja is not None else cuenta),
-        origen_tipo=None,
-        origen_id=None,
-    )
-
-    table = (
-        "cc_proveedores_c1"
-        if str(cuenta).lower().endswith("1")
-        else "cc_proveedores_c2"
-    )
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        f"""
-        INSERT INTO {table}
-        (fecha, proveedor_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?)
-    """,
-        (
-            fecha,
-            int(proveedor_id),
-            doc,
-            numero,
-            concepto,
-            medio,
-            float(debe or 0),
-            float(haber or 0),
-            int(caja_id),
-            cheque_id,
-            obs,
-        ),
-    )
-    conn.commit()
-    cc_id = cur.lastrowid
-    conn.close()
-
-    caja_set_origen(caja_id, "cc_prov", cc_id)
-    return cc_id, caja_id
-
-
-def cc_prov_listar(proveedor_id, cuenta):
-    conn = get_conn()
-    cur = conn.cursor()
-    if cuenta == "ambas":
-        cur.execute(
-            """
-            SELECT 'C1' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
-            FROM cc_proveedores_c1 WHERE proveedor_id=?
-            UNION ALL
-            SELECT 'C2' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
-            FROM cc_proveedores_c2 WHERE proveedor_id=?
-            ORDER BY date(fecha) DESC, id DESC
-        """,
-            (proveedor_id, proveedor_id),
-        )
-    else:
-        table = _prov_table(cuenta)
-        cur.execute(
-            f"""
-            SELECT '{'C1' if table.endswith('c1') else 'C2'}' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
-            FROM {table} WHERE proveedor_id=?
-            ORDER BY date(fecha) DESC, id DESC
-        """,
-            (proveedor_id,),
-        )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-def cc_prov_saldo(proveedor_id, cuenta):
-    conn = get_conn()
-    cur = conn.cursor()
-
-    def _sum(table):
-        cur.execute(
-            f"SELECT COALESCE(SUM(debe)-SUM(haber),0) FROM {table} WHERE proveedor_id=?",
-            (proveedor_id,),
-        )
-        r = cur.fetchone()
-        return float(r[0] or 0)
-
-    if cuenta == "ambas":
-        s = _sum("cc_proveedores_c1") + _sum("cc_proveedores_c2")
-    else:
-        s = _sum(_prov_table(cuenta))
-    conn.close()
-    return s
-
-
-# ================== Helpers extra / Resets ==================
-
-
-def _filtrar_por_fecha(movs, fecha_desde=None, fecha_hasta=None):
-    """
-    movs: lista de tuplas (id, fecha, doc, numero, concepto, medio, debe, haber)
-    fecha_desde / fecha_hasta: 'YYYY-MM-DD' o None
-    Devuelve los movimientos dentro del rango (inclusive).
-    """
-    if not (fecha_desde or fecha_hasta):
-        return movs
-
-    def ok(fecha):
-        f = (str(fecha) or "").strip()
-        if fecha_desde and f < fecha_desde:
-            return False
-        if fecha_hasta and f > fecha_hasta:
-            return False
-        return True
-
-    return [m for m in movs if ok(m[1])]
-
-
-# -------------------- DIVISAS (USD) --------------------
-
-
-def agregar_divisa_compra(
-    fecha, usd, tc, pesos, cuenta=None, mov_caja_id=None, obs=None
-):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO divisas (fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs)
-        VALUES (?, 'compra', ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            fecha,
-            float(usd or 0),
-            float(tc or 0),
-            float(pesos or 0),
-            cuenta,
-            mov_caja_id,
-            obs,
-        ),
-    )
-    conn.commit()
-    rid = cur.lastrowid
-    conn.close()
-    return rid
-
-
-def listar_divisas(tipo=None):
-    conn = get_conn()
-    cur = conn.cursor()
-    if tipo:
-        cur.execute(
-            """
-            SELECT id, fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs
-            FROM divisas
-            WHERE LOWER(tipo)=LOWER(?)
-            ORDER BY date(fecha) DESC, id DESC
-        """,
-            (tipo,),
-        )
-    else:
-        cur.execute(
-            """
-            SELECT id, fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs
-            FROM divisas
-            ORDER BY date(fecha) DESC, id DESC
-        """
-        )
-    rows = cur.fetchall()
-    conn.close()
-    return rows
-
-
-# (OJO) No duplicar obtener_proveedor/obtener_cliente – ya definidos arriba con columnas explícitas
-
-
-def reset_tablas(que="todo"):
-    conn = get_conn()
-    cur = conn.cursor()
-    if que in ("todo", "caja"):
-        cur.execute("DELETE FROM movimientos_caja")
-    if que in ("todo", "cheques"):
-        cur.execute("DELETE FROM cheques")
-    if que in ("todo", "cc_clientes"):
-        cur.execute("DELETE FROM cc_clientes_c1")
-        cur.execute("DELETE FROM cc_clientes_c2")
-    if que in ("todo", "cc_proveedores"):
-        cur.execute("DELETE FROM cc_proveedores_c1")
-        cur.execute("DELETE FROM cc_proveedores_c2")
-    conn.commit()
-    conn.close()
-
-
-def reset_cc_cliente(cliente_id: int, cuenta: str = "ambas") -> int:
-    """
-    Borra los movimientos de CC del cliente indicado.
-    cuenta: 'cuenta1' | 'cuenta2' | 'ambas' (default)
-    Devuelve la cantidad de filas borradas.
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    total = 0
-    c = (cuenta or "ambas").strip().lower()
-    try:
-        if c in ("cuenta1", "1"):
-            cur.execute("DELETE FROM cc_clientes_c1 WHERE cliente_id=?", (cliente_id,))
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        elif c in ("cuenta2", "2"):
-            cur.execute("DELETE FROM cc_clientes_c2 WHERE cliente_id=?", (cliente_id,))
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        else:
-            cur.execute("DELETE FROM cc_clientes_c1 WHERE cliente_id=?", (cliente_id,))
-            total += cur.rowcount if cur.rowcount != -1 else 0
-            cur.execute("DELETE FROM cc_clientes_c2 WHERE cliente_id=?", (cliente_id,))
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        conn.commit()
-        return int(total)
-    finally:
-        conn.close()
-
-
-def reset_cc_proveedor(proveedor_id: int, cuenta: str = "ambas") -> int:
-    """
-    Borra los movimientos de CC del proveedor indicado.
-    cuenta: 'cuenta1' | 'cuenta2' | 'ambas' (default)
-    Devuelve la cantidad de filas borradas.
-    """
-    conn = get_conn()
-    cur = conn.cursor()
-    total = 0
-    c = (cuenta or "ambas").strip().lower()
-    try:
-        if c in ("cuenta1", "1"):
-            cur.execute(
-                "DELETE FROM cc_proveedores_c1 WHERE proveedor_id=?", (proveedor_id,)
-            )
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        elif c in ("cuenta2", "2"):
-            cur.execute(
-                "DELETE FROM cc_proveedores_c2 WHERE proveedor_id=?", (proveedor_id,)
-            )
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        else:
-            cur.execute(
-                "DELETE FROM cc_proveedores_c1 WHERE proveedor_id=?", (proveedor_id,)
-            )
-            total += cur.rowcount if cur.rowcount != -1 else 0
-            cur.execute(
-                "DELETE FROM cc_proveedores_c2 WHERE proveedor_id=?", (proveedor_id,)
-            )
-            total += cur.rowcount if cur.rowcount != -1 else 0
-        conn.commit()
-        return int(total)
-    finally:
-        conn.close()
-
-
-# ====== REPORTES CC: OBTENER MOVS, CORTAR POR SALDO Y PDF ======
-
-
-def ensure_folder(path: str):
-    os.makedirs(path, exist_ok=True)
-    return path
-
-
-def get_cliente_nombre(conn, cliente_id: int) -> str:
-    try:
-        row = conn.execute(
-            "SELECT razon_social FROM clientes WHERE id = ?", (cliente_id,)
-        ).fetchone()
-        return row[0] if row and row[0] else f"Cliente {cliente_id}"
-    except Exception:
-        return f"Cliente {cliente_id}"
-
-
-def get_proveedor_nombre(conn, proveedor_id: int) -> str:
-    try:
-        row = conn.execute(
-            "SELECT razon_social FROM proveedores WHERE id = ?", (proveedor_id,)
-        ).fetchone()
-        return row[0] if row and row[0] else f"Proveedor {proveedor_id}"
-    except Exception:
-        return f"Proveedor {proveedor_id}"
-
-
-def _cc_rows_for_cliente(conn, cliente_id: int, cuenta: int):
-    table = "cc_clientes_c1" if int(cuenta) == 1 else "cc_clientes_c2"
-    q = f"""
-        SELECT id, fecha, doc, numero, concepto, medio,
-               COALESCE(debe,0) AS debe, COALESCE(haber,0) AS haber
-        FROM {table}
-        WHERE cliente_id = ?
-        ORDER BY date(fecha) ASC, id ASC
-    """
-    return conn.execute(q, (cliente_id,)).fetchall()
-
-
-def _cc_rows_for_proveedor(conn, proveedor_id: int, cuenta: int):
-    table = "cc_proveedores_c1" if int(cuenta) == 1 else "cc_proveedores_c2"
-    q = f"""
-        SELECT id, fecha, doc, numero, concepto, medio,
-               COALESCE(debe,0) AS debe, COALESCE(haber,0) AS haber
-        FROM {table}
-        WHERE proveedor_id = ?
-        ORDER BY date(fecha) ASC, id ASC
-    """
-    return conn.execute(q, (proveedor_id,)).fetchall()
-
-
-def get_saldo_actual_cc_cliente(conn, cliente_id: int, cuenta: int) -> float:
-    table = "cc_clientes_c1" if int(cuenta) == 1 else "cc_clientes_c2"
-    row = conn.execute(
-        f"SELECT COALESCE(SUM(debe)-SUM(haber),0) FROM {table} WHERE cliente_id=?",
-        (cliente_id,),
-    ).fetchone()
-    return float(row[0] or 0.0)
-
-
-def get_saldo_actual_cc_proveedor(conn, proveedor_id: int, cuenta: int) -> float:
-    table = "cc_proveedores_c1" if int(cuenta) == 1 else "cc_proveedores_c2"
-    row = conn.execute(
-        f"SELECT COALESCE(SUM(debe)-SUM(haber),0) FROM {table} WHERE proveedor_id=?",
-        (proveedor_id,),
-    ).fetchone()
-    return float(row[0] or 0.0)
-
-
-def slice_movs_desde_debe_que_cubre_saldo(movs, saldo_objetivo: float):
-    """
-    movs esperado: lista de tuplas con (id, fecha, doc, numero, concepto, medio, debe, haber)
-    Devuelve sublista desde el primer DEBE acumulado que cubre 'saldo_objetivo' hasta el final.
-    """
-    if not movs:
-        return []
-
-    if saldo_objetivo <= 0:
-        # Si no hay saldo, devolvemos vacío o solo el día actual como contexto
-        hoy = datetime.now().strftime("%Y-%m-%d")
-        tail = [m for m in movs if (str(m[1]) or "").startswith(hoy)]
-        return tail if tail else []
-
-    acumulado = 0.0
-    for idx in range(len(movs) - 1, -1, -1):
-        debe = float(movs[idx][6] or 0)
-        acumulado += debe
-        if acumulado + 1e-9 >= saldo_objetivo:
-            return movs[idx:]
-    return movs
-
-
-def _pdf_table_story_for_movs(movs):
-    # Convierte filas CC en data para reportlab (con saldo parcial)
-    data = [["Fecha", "Comprobante", "Detalle", "Debe", "Haber", "Saldo"]]
-    saldo_parcial = 0.0
-    for _id, fecha, doc, numero, concepto, medio, debe, haber in movs:
-        saldo_parcial += float(debe or 0) - float(haber or 0)
-        comp = f"{doc.upper()} {numero or ''}".strip()
-        data.append(
-            [
-                _fmt_dmy(fecha) or "",
-                comp,
-                str(concepto or ""),
-                f"{float(debe or 0):,.2f}",
-                f"{float(haber or 0):,.2f}",
-                f"{saldo_parcial:,.2f}",
-            ]
-        )
-
-    return data
-
-
-def crear_pdf_cc_cliente(
-    conn, cliente_id: int, cuenta: int = 1, output_base: str = "reportes/cc_clientes"
-) -> str:
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.platypus import (
-            SimpleDocTemplate,
-            Paragraph,
-            Spacer,
-            Table,
-            TableStyle,
-        )
-        from reportlab.lib.styles import getSampleStyleSheet
-    except ImportError as e:
-        raise RuntimeError(
-            "Falta 'reportlab'. Instalá con: pip install reportlab"
-        ) from e
-
-    saldo = get_saldo_actual_cc_cliente(conn, cliente_id, cuenta)
-    movs = _cc_rows_for_cliente(conn, cliente_id, cuenta)
-    sub = slice_movs_desde_debe_que_cubre_saldo(movs, saldo)
-
-    ensure_folder(output_base)
-    fecha_str = datetime.now().strftime("%Y%m%d")
-    filename = os.path.join(output_base, f"{cliente_id}-{cuenta}-{fecha_str}.pdf")
-
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=A4,
-        leftMargin=25,
-        rightMargin=25,
-        topMargin=25,
-        bottomMargin=25,
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("Resumen Cuenta Corriente (Cliente)", styles["Title"]))
-    story.append(
-        Paragraph(
-            f"<b>Cliente ID:</b> {cliente_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-            styles["Normal"],
-        )
-    )
-    story.append(Paragraph(f"<b>Saldo actual:</b> {saldo:,.2f}", styles["Normal"]))
-    story.append(Spacer(1, 10))
-
-    data = _pdf_table_story_for_movs(sub)
-    #            Fecha  Comp.  Detalle  Debe Haber Saldo
-    tbl = Table(data, repeatRows=1, colWidths=[55, 130, 135, 65, 65, 65])
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("ALIGN", (3, 1), (-1, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-            ]
-        )
-    )
-    story.append(tbl)
-
-    story.append(Spacer(1, 10))
-    tot_debe = sum(float(m[6] or 0) for m in sub)
-    tot_haber = sum(float(m[7] or 0) for m in sub)
-    story.append(
-        Paragraph(
-            f"<b>Total Debe (período):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
-            f"<b>Total Haber (período):</b> {tot_haber:,.2f}",
-            styles["Normal"],
-        )
-    )
-
-    doc.build(story)
-    return filename
-
-
-def crear_pdf_cc_proveedor(
-    conn,
-    proveedor_id: int,
-    cuenta: int = 1,
-    output_base: str = "reportes/cc_proveedores",
-) -> str:
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.platypus import (
-            SimpleDocTemplate,
-            Paragraph,
-            Spacer,
-            Table,
-            TableStyle,
-        )
-        from reportlab.lib.styles import getSampleStyleSheet
-    except ImportError as e:
-        raise RuntimeError(
-            "Falta 'reportlab'. Instalá con: pip install reportlab"
-        ) from e
-
-    saldo = get_saldo_actual_cc_proveedor(conn, proveedor_id, cuenta)
-    movs = _cc_rows_for_proveedor(conn, proveedor_id, cuenta)
-    sub = slice_movs_desde_debe_que_cubre_saldo(movs, saldo)
-
-    ensure_folder(output_base)
-    fecha_str = datetime.now().strftime("%Y%m%d")
-    filename = os.path.join(output_base, f"{proveedor_id}-{cuenta}-{fecha_str}.pdf")
-
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=A4,
-        leftMargin=25,
-        rightMargin=25,
-        topMargin=25,
-        bottomMargin=25,
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("Resumen Cuenta Corriente (Proveedor)", styles["Title"]))
-    story.append(
-        Paragraph(
-            f"<b>Proveedor ID:</b> {proveedor_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-            styles["Normal"],
-        )
-    )
-    story.append(Paragraph(f"<b>Saldo actual:</b> {saldo:,.2f}", styles["Normal"]))
-    story.append(Spacer(1, 10))
-
-    data = _pdf_table_story_for_movs(sub)
-    tbl = Table(data, repeatRows=1, colWidths=[55, 130, 135, 65, 65, 65])
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("ALIGN", (3, 1), (-1, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-            ]
-        )
-    )
-    story.append(tbl)
-
-    story.append(Spacer(1, 10))
-    tot_debe = sum(float(m[6] or 0) for m in sub)
-    tot_haber = sum(float(m[7] or 0) for m in sub)
-    story.append(
-        Paragraph(
-            f"<b>Total Debe (período):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
-            f"<b>Total Haber (período):</b> {tot_haber:,.2f}",
-            styles["Normal"],
-        )
-    )
-
-    doc.build(story)
-    return filename
-
-
-def crear_pdf_cc_cliente_rango(
-    conn,
-    cliente_id: int,
-    cuenta: int = 1,
-    fecha_desde: str = None,
-    fecha_hasta: str = None,
-    output_base: str = "reportes/cc_clientes",
-) -> str:
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.platypus import (
-            SimpleDocTemplate,
-            Paragraph,
-            Spacer,
-            Table,
-            TableStyle,
-        )
-        from reportlab.lib.styles import getSampleStyleSheet
-    except ImportError as e:
-        raise RuntimeError(
-            "Falta 'reportlab'. Instalá con: pip install reportlab"
-        ) from e
-
-    movs = _cc_rows_for_cliente(conn, cliente_id, cuenta)  # todos (asc)
-    movs = _filtrar_por_fecha(movs, fecha_desde, fecha_hasta)
-
-    ensure_folder(output_base)
-    fecha_str = datetime.now().strftime("%Y%m%d")
-    suf_rango = f"{(fecha_desde or 'ini').replace('-', '')}-{(fecha_hasta or 'hoy').replace('-', '')}"
-    filename = os.path.join(
-        output_base, f"{cliente_id}-{cuenta}-hist-{suf_rango}-{fecha_str}.pdf"
-    )
-
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=A4,
-        leftMargin=25,
-        rightMargin=25,
-        topMargin=25,
-        bottomMargin=25,
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(
-        Paragraph("Resumen CC (Cliente) — Histórico por fechas", styles["Title"])
-    )
-    story.append(
-        Paragraph(
-            f"<b>Cliente ID:</b> {cliente_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Rango:</b> {fecha_desde or '—'} a {fecha_hasta or '—'}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-            styles["Normal"],
-        )
-    )
-    story.append(Spacer(1, 10))
-
-    data = _pdf_table_story_for_movs(movs)
-    tbl = Table(data, repeatRows=1, colWidths=[55, 130, 135, 65, 65, 65])
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("ALIGN", (3, 1), (-1, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-            ]
-        )
-    )
-    story.append(tbl)
-
-    story.append(Spacer(1, 10))
-    tot_debe = sum(float(m[6] or 0) for m in movs)
-    tot_haber = sum(float(m[7] or 0) for m in movs)
-    story.append(
-        Paragraph(
-            f"<b>Total Debe (rango):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
-            f"<b>Total Haber (rango):</b> {tot_haber:,.2f}",
-            styles["Normal"],
-        )
-    )
-
-    doc.build(story)
-    return filename
-
-
-def crear_pdf_cc_proveedor_rango(
-    conn,
-    proveedor_id: int,
-    cuenta: int = 1,
-    fecha_desde: str = None,
-    fecha_hasta: str = None,
-    output_base: str = "reportes/cc_proveedores",
-) -> str:
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.platypus import (
-            SimpleDocTemplate,
-            Paragraph,
-            Spacer,
-            Table,
-            TableStyle,
-        )
-        from reportlab.lib.styles import getSampleStyleSheet
-    except ImportError as e:
-        raise RuntimeError(
-            "Falta 'reportlab'. Instalá con: pip install reportlab"
-        ) from e
-
-    movs = _cc_rows_for_proveedor(conn, proveedor_id, cuenta)  # todos (asc)
-    movs = _filtrar_por_fecha(movs, fecha_desde, fecha_hasta)
-
-    ensure_folder(output_base)
-    fecha_str = datetime.now().strftime("%Y%m%d")
-    suf_rango = f"{(fecha_desde or 'ini').replace('-', '')}-{(fecha_hasta or 'hoy').replace('-', '')}"
-    filename = os.path.join(
-        output_base, f"{proveedor_id}-{cuenta}-hist-{suf_rango}-{fecha_str}.pdf"
-    )
-
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=A4,
-        leftMargin=25,
-        rightMargin=25,
-        topMargin=25,
-        bottomMargin=25,
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(
-        Paragraph("Resumen CC (Proveedor) — Histórico por fechas", styles["Title"])
-    )
-    story.append(
-        Paragraph(
-            f"<b>Proveedor ID:</b> {proveedor_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Rango:</b> {fecha_desde or '—'} a {fecha_hasta or '—'}",
-            styles["Normal"],
-        )
-    )
-    story.append(
-        Paragraph(
-            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-            styles["Normal"],
-        )
-    )
-    story.append(Spacer(1, 10))
-
-    data = _pdf_table_story_for_movs(movs)
-    tbl = Table(data, repeatRows=1, colWidths=[55, 130, 135, 65, 65, 65])
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("ALIGN", (3, 1), (-1, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
-            ]
-        )
-    )
-    story.append(tbl)
-
-    story.append(Spacer(1, 10))
-    tot_debe = sum(float(m[6] or 0) for m in movs)
-    tot_haber = sum(float(m[7] or 0) for m in movs)
-    story.append(
-        Paragraph(
-            f"<b>Total Debe (rango):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
-            f"<b>Total Haber (rango):</b> {tot_haber:,.2f}",
-            styles["Normal"],
-        )
-    )
-
-    doc.build(story)
-    return filename
+# SQLite backend para Gestión Textil (CC dual, cheques, caja, reportes)
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import re
+from datetime import datetime, timedelta
+import pdf_render
+
+DB_PATH = Path("gestion_textil.db")
+
+
+# -------------------- POOL DE CONEXIONES --------------------
+# Cada hilo tiene su propia lista de conexiones libres (sqlite3 no deja
+# compartir una conexión entre hilos). get_conn() reutiliza una libre si hay
+# y conn.close() la devuelve al pool en vez de cerrarla: el código existente
+# (get_conn / commit / close) no cambia y deja de abrir una conexión nueva
+# con sus 3 PRAGMAs por cada consulta.
+
+POOL_MAX_LIBRES = 4  # conexiones ociosas que se guardan por hilo
+
+_pool_local = threading.local()
+_pool_lock = threading.Lock()
+_pool_stats = {"abiertas": 0, "reusadas": 0, "cerradas": 0}
+
+
+class _PooledConnection(sqlite3.Connection):
+    """Conexión sqlite3 cuyo close() la devuelve al pool del hilo."""
+
+    def close(self):
+        _pool_release(self)
+
+    def _cerrar_real(self):
+        with _pool_lock:
+            _pool_stats["cerradas"] += 1
+        super().close()
+
+
+def _pool_libres():
+    libres = getattr(_pool_local, "libres", None)
+    if libres is None:
+        libres = _pool_local.libres = []
+    return libres
+
+
+def _pool_release(conn):
+    if getattr(conn, "_en_pool", False):
+        return  # doble close(): ya estaba devuelta
+    try:
+        # igual que un close() real: lo no commiteado se descarta
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+    except sqlite3.ProgrammingError:
+        # ya cerrada o creada en otro hilo: no se reutiliza
+        return
+    libres = _pool_libres()
+    if conn._owner != threading.get_ident() or len(libres) >= POOL_MAX_LIBRES:
+        conn._cerrar_real()
+        return
+    conn._en_pool = True
+    libres.append(conn)
+
+
+def _abrir_conexion():
+    # timeout alto + WAL + busy_timeout para minimizar "database is locked"
+    conn = sqlite3.connect(DB_PATH, timeout=10, factory=_PooledConnection)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA busy_timeout = 10000;")
+    # conn.set_trace_callback(print)  # ← descomentá si querés log de cada SQL
+    conn._db_path = str(DB_PATH)
+    conn._owner = threading.get_ident()
+    conn._en_pool = False
+    with _pool_lock:
+        _pool_stats["abiertas"] += 1
+    return conn
+
+
+class _ConexionEnTransaccion:
+    """
+    Lo que devuelve get_conn() mientras el hilo tiene un transaccion() abierto:
+    la MISMA conexión, pero commit()/close() no hacen nada. Así las funciones
+    de siempre (get_conn/commit/close) se pueden componer dentro de una sola
+    transacción; confirma o revierte el transaccion() de afuera.
+    """
+
+    def __init__(self, conn):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_row_factory", conn.row_factory)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self._conn.row_factory = self._row_factory
+
+    def rollback(self):
+        # revertir a medias rompería la transacción de afuera: que aborte entera
+        raise sqlite3.OperationalError("rollback dentro de transaccion(): se aborta el documento")
+
+    def __getattr__(self, nombre):
+        return getattr(self._conn, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._conn, nombre, valor)
+
+
+def get_conn():
+    activa = getattr(_pool_local, "tx", None)
+    if activa is not None:
+        return _ConexionEnTransaccion(activa[0])
+    if str(DB_PATH) not in _bases_listas:
+        _asegurar_base()  # primera vez sobre esta base (ver ARRANQUE)
+    libres = _pool_libres()
+    while libres:
+        conn = libres.pop()
+        if conn._db_path != str(DB_PATH):
+            # cambió DB_PATH (otra base): descarto la conexión vieja
+            conn._cerrar_real()
+            continue
+        conn._en_pool = False
+        with _pool_lock:
+            _pool_stats["reusadas"] += 1
+        return conn
+    return _abrir_conexion()
+
+
+def cerrar_pool():
+    """Cierra de verdad las conexiones libres del hilo actual."""
+    libres = _pool_libres()
+    while libres:
+        libres.pop()._cerrar_real()
+
+
+def pool_stats() -> dict:
+    """Contadores del pool: conexiones abiertas, reusadas y cerradas."""
+    with _pool_lock:
+        return dict(_pool_stats)
+
+
+@contextmanager
+def conexion():
+    """
+    with conexion() as conn: ...
+    Toma una conexión del pool y la devuelve al salir (no hace commit).
+    """
+    conn = get_conn()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaccion(inmediata: bool = True):
+    """
+    with transaccion() as conn: ...
+    BEGIN IMMEDIATE al entrar, commit al salir y rollback si hay excepción.
+    Si el hilo ya tiene una transacción abierta se usa la misma conexión con
+    un SAVEPOINT, así las funciones que usan transaccion() se pueden anidar.
+    Mientras tanto get_conn() devuelve esa misma conexión (commit/close sin
+    efecto), así que cualquier función de este módulo queda adentro.
+    """
+    activa = getattr(_pool_local, "tx", None)
+    if activa is not None:
+        conn, nivel = activa
+        sp = f"sp_{nivel + 1}"
+        _pool_local.tx = (conn, nivel + 1)
+        conn.execute(f"SAVEPOINT {sp}")
+        try:
+            yield conn
+            conn.execute(f"RELEASE {sp}")
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {sp}")
+            conn.execute(f"RELEASE {sp}")
+            raise
+        finally:
+            _pool_local.tx = (conn, nivel)
+        return
+
+    conn = get_conn()
+    _pool_local.tx = (conn, 0)
+    try:
+        conn.execute("BEGIN IMMEDIATE" if inmediata else "BEGIN")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _pool_local.tx = None
+        conn.close()
+
+def _t_exists(cur, name: str) -> bool:
+    return bool(cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+        (name,)
+    ).fetchone())
+
+def _col_exists(cur, table: str, col: str) -> bool:
+    try:
+        cols = [r[1] for r in cur.execute(f"PRAGMA table_info({table})")]
+        return col in cols
+    except Exception:
+        return False
+
+def cc_cli_reset_por_ids(ids):
+    """
+    Elimina movimientos/materializaciones de CC de clientes SOLO para los IDs dados,
+    cubriendo ambos esquemas posibles (cc_clientes_* y cc_cli_*).
+    Devuelve un dict con métricas para debug.
+    """
+    # Normalizar ids a ints
+    try:
+        ids = [int(str(x).strip()) for x in (ids or []) if str(x).strip() != ""]
+    except Exception:
+        ids = []
+
+    if not ids:
+        return {"tables": 0, "rows": 0}
+
+    conn = get_conn()
+    cur = conn.cursor()
+
+    # Tabla, columna del id
+    candidates = [
+        ("cc_clientes_cuenta1", "cliente_id"),
+        ("cc_clientes_cuenta2", "cliente_id"),
+        ("cc_clientes",        "cliente_id"),
+        ("cc_cli_cuenta1",     "ent_id"),
+        ("cc_cli_cuenta2",     "ent_id"),
+        ("cc_cli",             "ent_id"),
+    ]
+
+    tables_touched = 0
+    rows_deleted = 0
+    placeholders = ",".join(["?"] * len(ids))
+    params = tuple(ids)
+
+    for t, col in candidates:
+        if _t_exists(cur, t) and _col_exists(cur, t, col):
+            tables_touched += 1
+            try:
+                cnt = cur.execute(
+                    f"SELECT COUNT(*) FROM {t} WHERE {col} IN ({placeholders})",
+                    params
+                ).fetchone()[0]
+                rows_deleted += int(cnt or 0)
+                cur.execute(
+                    f"DELETE FROM {t} WHERE {col} IN ({placeholders})",
+                    params
+                )
+            except Exception as ex:
+                # No frenamos si una tabla falla
+                print(f"WARN borrar en {t}:", ex)
+
+    conn.commit()
+    conn.close()
+    return {"tables": tables_touched, "rows": rows_deleted}
+
+
+def _fmt_dmy(s):
+    if not s:
+        return ""
+    s = str(s).strip()
+    from datetime import datetime
+
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d"):
+        try:
+            d = datetime.strptime(s, fmt).date()
+            return d.strftime("%d/%m/%Y")
+        except Exception:
+            pass
+    return s
+
+
+def fecha_iso(v):
+    """
+    Normaliza una fecha a 'YYYY-MM-DD' (formato canónico en la base).
+    Acepta ISO, DD/MM/YYYY, D/M/YYYY, DD-MM-YYYY, YYYY/MM/DD, YYYYMMDD,
+    'YYYY-MM-DD HH:MM:SS', date/datetime y seriales de Excel (ej. 45123).
+    Vacío/None se devuelve tal cual; si no se entiende, el texto original.
+    """
+    if v is None:
+        return None
+    if hasattr(v, "strftime"):
+        return v.strftime("%Y-%m-%d")
+    s = str(v).strip()
+    if not s:
+        return s
+    if s.isdigit() and len(s) == 5:
+        # serial de Excel (días desde 1899-12-30)
+        from datetime import date, timedelta
+
+        return (date(1899, 12, 30) + timedelta(days=int(s))).isoformat()
+    if len(s) > 10 and s[10] in " T":
+        s = s[:10]
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d", "%d/%m/%y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%Y-%m-%d")
+        except Exception:
+            pass
+    return s
+
+
+_fecha_iso = fecha_iso  # nombre usado dentro del módulo
+
+
+def _fechas_iso_params(cols, params):
+    """Aplica _fecha_iso a los valores de las columnas 'fecha*' de una tupla de params."""
+    return tuple(
+        _fecha_iso(v) if str(c).startswith("fecha") else v for c, v in zip(cols, params)
+    ) + tuple(params[len(cols):])
+
+
+def _rango_fecha_sql(desde=None, hasta=None, col="fecha"):
+    """Predicado ' AND fecha >= ? AND fecha <= ?' (solo los extremos dados) y sus params."""
+    sql, params = "", []
+    if desde:
+        sql += f" AND {col} >= ?"
+        params.append(_fecha_iso(desde))
+    if hasta:
+        sql += f" AND {col} <= ?"
+        params.append(_fecha_iso(hasta))
+    return sql, params
+
+
+# Orden del listado de cheques: en cartera con fecha de cobro (por fecha),
+# en cartera sin fecha, y el resto por id. Son expresiones fijas para que
+# SQLite use ix_cheques_listado (migración 3): no cambiar el texto sin migrar.
+_CHQ_CARTERA = (
+    "REPLACE(REPLACE(REPLACE(LOWER(TRIM(COALESCE(estado,''))),' ',''),'_',''),'-','')"
+    " IN ('encartera','cartera')"
+)
+_CHQ_GRUPO = (
+    f"(CASE WHEN {_CHQ_CARTERA} THEN "
+    "(CASE WHEN COALESCE(fecha_cobro,'')='' THEN 1 ELSE 0 END) ELSE 2 END)"
+)
+_CHQ_FCLAVE = f"(CASE WHEN {_CHQ_GRUPO}=0 THEN fecha_cobro ELSE '' END)"
+
+# Clave de orden de caja: fecha sin NULL (varios escritores de app.py pueden
+# dejarla en NULL y la comparación por clave las saltearía). Usa ix_caja_orden
+# (migración 8): no cambiar el texto sin migrar.
+_CAJA_FCLAVE = "COALESCE(fecha,'')"
+
+
+# Columnas de fecha por tabla (se guardan siempre en ISO)
+_FECHA_COLS = (
+    ("movimientos_caja", ("fecha",)),
+    ("cheques", ("fecha_recibido", "fecha_cobro", "fecha_estado")),
+    ("cc_clientes_c1", ("fecha",)),
+    ("cc_clientes_c2", ("fecha",)),
+    ("cc_proveedores_c1", ("fecha",)),
+    ("cc_proveedores_c2", ("fecha",)),
+    ("divisas", ("fecha",)),
+    ("empleados", ("fecha_ingreso", "fecha_egreso")),
+)
+
+
+# --- Normalizador universal de parámetros para sqlite ---
+
+
+def _as_params(data, cols):
+    """
+    Acepta:
+      - tuple/list ya en orden
+      - dict con las keys de 'cols'
+      - tuple/list con un único dict adentro
+    Devuelve siempre una tupla en el orden de 'cols'.
+    """
+    if isinstance(data, dict):
+        return tuple(data.get(k) for k in cols)
+    if isinstance(data, (list, tuple)) and len(data) == 1 and isinstance(data[0], dict):
+        d = data[0]
+        return tuple(d.get(k) for k in cols)
+    return tuple(data)
+
+
+# -------------------- INIT / MIGRACIONES --------------------
+
+
+def _table_info(conn, table):
+    try:
+        rows = conn.execute(f"PRAGMA table_info({table});").fetchall()
+        return {r[1]: r for r in rows}
+    except Exception:
+        return {}
+
+
+def _ensure_numeradores(conn):
+    """
+    Asegura tabla numeradores (tipo TEXT PK, valor INTEGER).
+    Si existe con columnas raras, la migra limpiamente.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS numeradores (
+            tipo   TEXT PRIMARY KEY,
+            valor  INTEGER NOT NULL DEFAULT 0
+        )
+    """
+    )
+    cols = _table_info(conn, "numeradores").keys()
+    ok = "tipo" in cols and "valor" in cols and len(cols) == 2
+    if not ok:
+        # Migración: renombro, creo bien, intento copiar si hay columnas compatibles
+        try:
+            cur.execute("ALTER TABLE numeradores RENAME TO numeradores_bak")
+        except Exception:
+            pass
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS numeradores (
+                tipo   TEXT PRIMARY KEY,
+                valor  INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+        try:
+            bcols = _table_info(conn, "numeradores_bak").keys()
+            if "tipo" in bcols and "valor" in bcols:
+                cur.execute(
+                    "INSERT INTO numeradores(tipo,valor) SELECT tipo, valor FROM numeradores_bak"
+                )
+            cur.execute("DROP TABLE IF EXISTS numeradores_bak")
+        except Exception:
+            cur.execute("DROP TABLE IF EXISTS numeradores_bak")
+
+    # Semillas necesarias
+    for t in ("recibo", "op"):
+        cur.execute(
+            "INSERT OR IGNORE INTO numeradores (tipo, valor) VALUES (?, 0)", (t,)
+        )
+
+
+# Tablas de CC -> (tipo, columna de la entidad, cuenta) para cc_saldos
+_CC_TABLAS = (
+    ("cc_clientes_c1", "clientes", "cliente_id", 1),
+    ("cc_clientes_c2", "clientes", "cliente_id", 2),
+    ("cc_proveedores_c1", "proveedores", "proveedor_id", 1),
+    ("cc_proveedores_c2", "proveedores", "proveedor_id", 2),
+)
+
+
+def _cuenta_n(cuenta) -> int:
+    """1 | 2 desde 1, "1", "c1", "cuenta1", "Cuenta 1"... (misma regla que _cli_table)."""
+    return 2 if str(cuenta).strip().lower().endswith("2") else 1
+
+
+def _ensure_cc_saldos(conn):
+    """
+    Saldos materializados: cc_saldos(tipo, entidad_id, cuenta) -> saldo.
+    Los mantienen triggers sobre las 4 tablas de CC, así quedan al día con
+    CUALQUIER alta/edición/borrado (db_access o SQL directo desde la app).
+    Si la tabla es nueva se carga desde los movimientos existentes.
+    """
+    cur = conn.cursor()
+    nueva = not _t_exists(cur, "cc_saldos")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cc_saldos (
+            tipo       TEXT    NOT NULL,   -- clientes | proveedores
+            entidad_id INTEGER NOT NULL,
+            cuenta     INTEGER NOT NULL,   -- 1 | 2
+            saldo      REAL    NOT NULL DEFAULT 0,
+            movs       INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tipo, entidad_id, cuenta)
+        )
+    """
+    )
+    for table, tipo, col, cuenta in _CC_TABLAS:
+        suma = f"""
+            INSERT INTO cc_saldos (tipo, entidad_id, cuenta, saldo, movs)
+            VALUES ('{tipo}', NEW.{col}, {cuenta},
+                    COALESCE(NEW.debe,0) - COALESCE(NEW.haber,0), 1)
+            ON CONFLICT (tipo, entidad_id, cuenta) DO UPDATE
+            SET saldo = saldo + excluded.saldo, movs = movs + 1;
+        """
+        resta = f"""
+            UPDATE cc_saldos
+            SET saldo = saldo - (COALESCE(OLD.debe,0) - COALESCE(OLD.haber,0)),
+                movs = movs - 1
+            WHERE tipo='{tipo}' AND entidad_id=OLD.{col} AND cuenta={cuenta};
+            DELETE FROM cc_saldos
+            WHERE tipo='{tipo}' AND entidad_id=OLD.{col} AND cuenta={cuenta}
+              AND movs <= 0;
+        """
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_saldo_ins
+            AFTER INSERT ON {table} WHEN NEW.{col} IS NOT NULL
+            BEGIN {suma} END
+        """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_saldo_del
+            AFTER DELETE ON {table} WHEN OLD.{col} IS NOT NULL
+            BEGIN {resta} END
+        """
+        )
+        # UPDATE = sacar la fila vieja + sumar la nueva (cubre cambio de entidad)
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_saldo_upd_old
+            AFTER UPDATE OF {col}, debe, haber ON {table} WHEN OLD.{col} IS NOT NULL
+            BEGIN {resta} END
+        """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_saldo_upd_new
+            AFTER UPDATE OF {col}, debe, haber ON {table} WHEN NEW.{col} IS NOT NULL
+            BEGIN {suma} END
+        """
+        )
+    if nueva:
+        _cc_saldos_rebuild(cur)
+
+
+def _cc_saldos_calcular(cur):
+    """Saldos recalculados desde los movimientos: {(tipo, id, cuenta): (saldo, movs)}."""
+    out = {}
+    for table, tipo, col, cuenta in _CC_TABLAS:
+        if not _t_exists(cur, table):
+            continue
+        for eid, saldo, movs in cur.execute(
+            f"""
+            SELECT {col}, SUM(COALESCE(debe,0) - COALESCE(haber,0)), COUNT(*)
+            FROM {table} WHERE {col} IS NOT NULL GROUP BY {col}
+        """
+        ):
+            out[(tipo, eid, cuenta)] = (float(saldo or 0), int(movs))
+    return out
+
+
+def _cc_saldos_rebuild(cur):
+    reales = _cc_saldos_calcular(cur)
+    cur.execute("DELETE FROM cc_saldos")
+    cur.executemany(
+        "INSERT INTO cc_saldos (tipo, entidad_id, cuenta, saldo, movs) VALUES (?,?,?,?,?)",
+        [(t, e, c, s, m) for (t, e, c), (s, m) in reales.items()],
+    )
+    return len(reales)
+
+
+def _crear_indice(cur, nombre: str, tabla: str, expr: str, cols=()):
+    """CREATE INDEX IF NOT EXISTS, salteando bases viejas sin la tabla/columnas."""
+    if not _t_exists(cur, tabla):
+        return False
+    for c in cols:
+        if not _col_exists(cur, tabla, c):
+            return False
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({expr})")
+    return True
+
+
+def _mig_001_indices(conn):
+    """Índices según los accesos reales (entidad+fecha, vínculos caja/cheque, recibos)."""
+    cur = conn.cursor()
+    for table, _tipo, col, _cuenta in _CC_TABLAS:
+        _crear_indice(cur, f"ix_{table}_ent_fecha", table, f"{col}, fecha, id", (col, "fecha"))
+        _crear_indice(cur, f"ix_{table}_caja", table, "caja_mov_id", ("caja_mov_id",))
+        _crear_indice(cur, f"ix_{table}_cheque", table, "cheque_id", ("cheque_id",))
+        _crear_indice(cur, f"ix_{table}_numero", table, "numero, doc", ("numero", "doc"))
+    _crear_indice(cur, "ix_caja_fecha", "movimientos_caja", "fecha, id", ("fecha",))
+    _crear_indice(
+        cur, "ix_caja_origen", "movimientos_caja", "origen_id, origen_tipo",
+        ("origen_id", "origen_tipo"),
+    )
+    _crear_indice(cur, "ix_cheques_caja", "cheques", "mov_caja_id", ("mov_caja_id",))
+    # misma expresión que listar_cheques_por_estado / en_cartera
+    _crear_indice(
+        cur, "ix_cheques_estado_cobro", "cheques",
+        "LOWER(COALESCE(estado,'')), fecha_cobro, id", ("estado", "fecha_cobro"),
+    )
+    _crear_indice(cur, "ix_divisas_caja", "divisas", "mov_caja_id", ("mov_caja_id",))
+
+
+def _mig_002_fechas_iso(conn):
+    """Reescribe a ISO las fechas cargadas en otros formatos (DD/MM/YYYY, Excel, etc.)."""
+    cur = conn.cursor()
+    for table, cols in _FECHA_COLS:
+        if not _t_exists(cur, table):
+            continue
+        for col in cols:
+            if not _col_exists(cur, table, col):
+                continue
+            cambios = []
+            for rid, v in cur.execute(
+                f"SELECT id, {col} FROM {table} WHERE {col} IS NOT NULL AND {col} <> ''"
+            ).fetchall():
+                nv = _fecha_iso(v)
+                if nv != v:
+                    cambios.append((nv, rid))
+            if cambios:
+                cur.executemany(f"UPDATE {table} SET {col}=? WHERE id=?", cambios)
+    _crear_indice(
+        cur, "ix_cheques_cobro", "cheques", "fecha_cobro, id", ("fecha_cobro",)
+    )
+
+
+def _mig_003_paginado(conn):
+    """Índice para el listado paginado de cheques (sus claves nunca son NULL)."""
+    _crear_indice(
+        conn.cursor(), "ix_cheques_listado", "cheques", f"{_CHQ_GRUPO}, {_CHQ_FCLAVE}, id",
+        ("fecha_cobro", "estado"),
+    )
+
+
+# Tag de recibo en obs de cheques: "REC 0001-00000049" o "REC 49".
+_REC_TAG = re.compile(r"(?i)\bREC[\s:#]*(\d+)(?:-(\d+))?")
+
+
+def _recibo_clave(txt, solo_tag: bool = False):
+    """
+    ('0001-00000049', 49) para "REC 0001-00000049", "0001-00000049" o "REC 49"
+    (con número simple el texto queda "49"). Toma el último tag. None si no hay.
+    solo_tag=True (textos libres como obs): exige el prefijo "REC".
+    """
+    s = str(txt or "").strip()
+    tags = _REC_TAG.findall(s)
+    if not tags and not solo_tag:
+        tags = _REC_TAG.findall("REC " + s)
+    if not tags:
+        return None
+    pv, nro = tags[-1]
+    if nro:
+        return f"{int(pv):04d}-{int(nro):08d}", int(nro)
+    return str(int(pv)), int(pv)
+
+
+def _mig_004_recibo_cheques(conn):
+    """Vínculo cheque -> recibo en tabla propia (antes: LIKE '%REC n%' sobre obs)."""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS recibo_cheques (
+            cheque_id INTEGER PRIMARY KEY,
+            recibo    TEXT NOT NULL,
+            recibo_n  INTEGER NOT NULL
+        )
+    """
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS ix_recibo_cheques_n ON recibo_cheques (recibo_n, cheque_id)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS ix_recibo_cheques_recibo ON recibo_cheques (recibo)"
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_cheques_recibo_del
+        AFTER DELETE ON cheques
+        BEGIN DELETE FROM recibo_cheques WHERE cheque_id = OLD.id; END
+    """
+    )
+    if not _col_exists(cur, "cheques", "obs"):
+        return
+    vinc = []
+    for cid, obs in cur.execute(
+        "SELECT id, obs FROM cheques WHERE obs LIKE '%REC%'"
+    ).fetchall():
+        k = _recibo_clave(obs, solo_tag=True)
+        if k:
+            vinc.append((cid, k[0], k[1]))
+    cur.executemany(
+        "INSERT OR REPLACE INTO recibo_cheques (cheque_id, recibo, recibo_n) VALUES (?,?,?)",
+        vinc,
+    )
+
+
+def _mig_005_indice_saldos(conn):
+    """
+    ix_<cc>_ent_fecha pasa a cubrir debe/haber: el saldo a una fecha
+    (cc_saldo_anterior) se suma desde el índice sin leer las filas.
+    """
+    cur = conn.cursor()
+    for table, _tipo, col, _cuenta in _CC_TABLAS:
+        if not (_t_exists(cur, table) and _col_exists(cur, table, "debe")
+                and _col_exists(cur, table, "haber")):
+            continue
+        cur.execute(f"DROP INDEX IF EXISTS ix_{table}_ent_fecha")
+        _crear_indice(
+            cur, f"ix_{table}_ent_fecha", table, f"{col}, fecha, id, debe, haber", (col, "fecha")
+        )
+
+
+def _mig_006_cc_cierres(conn):
+    """
+    Cierres de período: saldo de cada (entidad, cuenta) al `corte` (primer día
+    del período siguiente, exclusivo). Los triggers borran los cierres que
+    quedan invalidados cuando se carga, edita o borra un movimiento anterior
+    al corte (los posteriores al último cierre no tocan nada).
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cc_cierres (
+            tipo       TEXT    NOT NULL,   -- clientes | proveedores
+            entidad_id INTEGER NOT NULL,
+            cuenta     INTEGER NOT NULL,   -- 1 | 2
+            corte      TEXT    NOT NULL,   -- 'YYYY-MM-DD': saldo de fecha < corte
+            periodo    TEXT    NOT NULL,   -- 'YYYY-MM' cerrado
+            saldo      REAL    NOT NULL,
+            movs       INTEGER NOT NULL,
+            cerrado    TEXT,
+            PRIMARY KEY (tipo, entidad_id, cuenta, corte)
+        )
+    """
+    )
+    for table, tipo, col, cuenta in _CC_TABLAS:
+        if not _t_exists(cur, table):
+            continue
+
+        def _borrar(fila):
+            return f"""
+                DELETE FROM cc_cierres
+                WHERE tipo='{tipo}' AND entidad_id={fila}.{col} AND cuenta={cuenta}
+                  AND corte > COALESCE({fila}.fecha, '');
+            """
+
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_cierre_ins
+            AFTER INSERT ON {table} BEGIN {_borrar("NEW")} END
+        """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_cierre_del
+            AFTER DELETE ON {table} BEGIN {_borrar("OLD")} END
+        """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_cierre_upd
+            AFTER UPDATE OF {col}, fecha, debe, haber ON {table}
+            BEGIN {_borrar("OLD")} {_borrar("NEW")} END
+        """
+        )
+
+
+# Tablas con registro de cambios (tabla `cambios`, ver REGISTRO DE CAMBIOS).
+# cc_saldos / cc_cierres no: son derivadas y las mantienen sus triggers.
+_CAMBIOS_TABLAS = ("clientes", "proveedores", "cheques", "movimientos_caja") + tuple(
+    t for t, _tipo, _col, _n in _CC_TABLAS
+)
+
+
+def _cambios_triggers(cur, rehacer: bool = False):
+    """
+    Triggers que anotan en `cambios` cada INSERT/UPDATE/DELETE, dentro de la
+    misma transacción que el cambio (sirven también para SQL directo desde la
+    app). datos es JSON compacto:
+      I -> {col: valor} de las columnas no nulas de la fila nueva
+      U -> {col: [antes, después]} SÓLO de las columnas que cambiaron
+      D -> {col: valor} de las columnas no nulas de la fila borrada
+    Las columnas se leen al crear el trigger: una migración que agregue
+    columnas a estas tablas tiene que llamar _cambios_triggers(cur, rehacer=True).
+    """
+    for table in _CAMBIOS_TABLAS:
+        if not _t_exists(cur, table):
+            continue
+        cols = [r[1] for r in cur.execute(f"PRAGMA table_info({table})")]
+        if rehacer:
+            for op in ("ins", "upd", "del"):
+                cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_cambio_{op}")
+
+        def _fila(f):
+            partes = " || ".join(
+                f"""CASE WHEN {f}."{c}" IS NULL THEN ''"""
+                f""" ELSE ',{json.dumps(c)}:' || json_quote({f}."{c}") END"""
+                for c in cols
+            )
+            return f"'{{' || substr({partes}, 2) || '}}'"
+
+        difs = " || ".join(
+            f"""CASE WHEN NEW."{c}" IS NOT OLD."{c}" THEN ',{json.dumps(c)}:['"""
+            f""" || json_quote(OLD."{c}") || ',' || json_quote(NEW."{c}") || ']'"""
+            f""" ELSE '' END"""
+            for c in cols
+        )
+        cambio = " OR ".join(f'NEW."{c}" IS NOT OLD."{c}"' for c in cols)
+        for op, evento, fila, datos, cuando in (
+            ("ins", "INSERT", "NEW", _fila("NEW"), ""),
+            ("del", "DELETE", "OLD", _fila("OLD"), ""),
+            ("upd", "UPDATE", "NEW", f"'{{' || substr({difs}, 2) || '}}'", f"WHEN {cambio}"),
+        ):
+            cur.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_cambio_{op}
+                AFTER {evento} ON {table} {cuando}
+                BEGIN
+                    INSERT INTO cambios (tabla, fila, op, datos)
+                    VALUES ('{table}', {fila}.rowid, '{op[0].upper()}', {datos});
+                END
+            """
+            )
+
+
+def _mig_007_cambios(conn):
+    """
+    Registro de cambios (solo se agrega): una fila por INSERT/UPDATE/DELETE de
+    clientes, proveedores, cheques, caja y CC, escrita por triggers en la misma
+    transacción. El id (rowid) es la secuencia: quien guarda el último id que
+    vio (cachés, backups, pantallas) lee sólo lo nuevo con id > visto.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cambios (
+            id     INTEGER PRIMARY KEY,   -- secuencia de cambios
+            cuando TEXT    NOT NULL
+                   DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')),
+            tabla  TEXT    NOT NULL,
+            fila   INTEGER,               -- rowid (id) de la fila afectada
+            op     TEXT    NOT NULL,      -- I | U | D
+            datos  TEXT                   -- JSON (ver _cambios_triggers)
+        )
+    """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_cambios_fila ON cambios (tabla, fila)")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_cambios_cuando ON cambios (cuando)")
+    _cambios_triggers(cur)
+
+
+def _mig_008_caja_orden(conn):
+    """Índice por la clave de orden de caja con fecha NULL como '' (caja_pagina)."""
+    _crear_indice(
+        conn.cursor(), "ix_caja_orden", "movimientos_caja", f"{_CAJA_FCLAVE}, id", ("fecha",)
+    )
+
+
+# (versión, descripción, función). Agregar siempre al final con versión nueva.
+_MIGRACIONES = [
+    (1, "índices CC / caja / cheques", _mig_001_indices),
+    (2, "fechas en formato ISO", _mig_002_fechas_iso),
+    (3, "paginado de caja y cheques", _mig_003_paginado),
+    (4, "vínculo recibo <-> cheques", _mig_004_recibo_cheques),
+    (5, "índice de saldos por fecha", _mig_005_indice_saldos),
+    (6, "cierres de período de CC", _mig_006_cc_cierres),
+    (7, "registro de cambios", _mig_007_cambios),
+    (8, "orden de caja sin fechas NULL", _mig_008_caja_orden),
+]
+
+SCHEMA_VERSION = _MIGRACIONES[-1][0]
+
+
+def _migrar(conn):
+    """
+    Corre una sola vez cada migración pendiente según PRAGMA user_version
+    y deja registro en la tabla schema_version.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version     INTEGER PRIMARY KEY,
+            descripcion TEXT,
+            aplicada    TEXT
+        )
+    """
+    )
+    actual = int(cur.execute("PRAGMA user_version").fetchone()[0] or 0)
+    for version, desc, fn in _MIGRACIONES:
+        if version <= actual:
+            continue
+        fn(conn)
+        cur.execute(
+            "INSERT OR REPLACE INTO schema_version (version, descripcion, aplicada) VALUES (?,?,?)",
+            (version, desc, datetime.now().isoformat(timespec="seconds")),
+        )
+        cur.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+        actual = version
+    return actual
+
+
+# -------------------- MAPA DE ESQUEMA --------------------
+# Tablas/columnas reales de CC y divisas, resueltas una vez al abrir la base
+# (init_db, después de migrar) en vez de probar nombres con PRAGMA en cada operación.
+
+_CC_CANDIDATAS = {
+    "clientes": (
+        "cc_clientes_c{n}", "cc_clientes_cuenta{n}", "cc_cli_cuenta{n}", "cc_clientes", "cc_cli",
+    ),
+    "proveedores": (
+        "cc_proveedores_c{n}", "cc_proveedores_cuenta{n}", "cc_prov_cuenta{n}",
+        "cc_proveedores", "cc_prov",
+    ),
+}
+_CC_COLS = {
+    "ent": {
+        "clientes": ("cliente_id", "entidad_id", "ent_id", "id_cliente"),
+        "proveedores": ("proveedor_id", "entidad_id", "ent_id", "id_proveedor"),
+    },
+    "doc": ("doc", "documento", "tipo_doc"),
+    "numero": ("numero", "nro", "num", "recibo"),
+    "debe": ("debe", "debito", "debit"),
+    "haber": ("haber", "monto", "importe", "credit", "credito"),
+}
+
+_esquema = None
+_esquema_lock = threading.Lock()
+
+
+def _primera(cols, cands):
+    return next((c for c in cands if c in cols), None)
+
+
+def _esquema_resolver(cur) -> dict:
+    tablas = {}
+    for (t,) in cur.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall():
+        tablas[t] = [r[1] for r in cur.execute(f"PRAGMA table_info({t})")]
+
+    cc = {}
+    for tipo, cands in _CC_CANDIDATAS.items():
+        for n in (1, 2):
+            for patron in cands:
+                t = patron.format(n=n)
+                cols = tablas.get(t)
+                if not cols:
+                    continue
+                m = {"tabla": t, "tipo": tipo, "cuenta": n}
+                m["ent"] = _primera(cols, _CC_COLS["ent"][tipo])
+                for k in ("doc", "numero", "debe", "haber"):
+                    m[k] = _primera(cols, _CC_COLS[k])
+                if m["ent"] and m["haber"]:
+                    cc[(tipo, n)] = m
+                    break
+
+    div = {"tabla": None}
+    if "divisas" in tablas:
+        cols = tablas["divisas"]
+        div = {
+            "tabla": "divisas",
+            "tipo": _primera(cols, ("tipo", "operacion")),
+            "ars": _primera(cols, ("ars", "total_ars")),
+            "usd": "usd" if "usd" in cols else None,
+            "tc": "tc" if "tc" in cols else None,
+            "cuenta": "cuenta" if "cuenta" in cols else None,
+            "obs": "obs" if "obs" in cols else None,
+            "mov_caja_id": "mov_caja_id" if "mov_caja_id" in cols else None,
+        }
+    elif "movimientos_divisas" in tablas:
+        div = {"tabla": "movimientos_divisas"}
+
+    return {"tablas": tablas, "cc": cc, "divisas": div}
+
+
+def _esquema_refrescar(conn):
+    global _esquema
+    nuevo = _esquema_resolver(conn.cursor())
+    with _esquema_lock:
+        _esquema = nuevo
+    return nuevo
+
+
+def esquema(refrescar: bool = False) -> dict:
+    """
+    Mapa resuelto del esquema:
+      {"tablas": {tabla: [cols]},
+       "cc": {(tipo, cuenta): {"tabla","ent","doc","numero","debe","haber",...}},
+       "divisas": {"tabla", "tipo", "ars", ...}}
+    """
+    if _esquema is None or refrescar:
+        conn = get_conn()
+        try:
+            return _esquema_refrescar(conn)
+        finally:
+            conn.close()
+    return _esquema
+
+
+def cc_tabla(tipo: str, cuenta) -> dict | None:
+    """Tabla CC real de clientes/proveedores para la cuenta 1/2 (None si no hay)."""
+    n = 2 if str(cuenta).endswith("2") else 1
+    return esquema()["cc"].get((tipo, n))
+
+
+def cc_tablas(tipo: str) -> list[dict]:
+    """Tablas CC reales del tipo (sin repetir, cuenta 1 primero)."""
+    out, vistas = [], set()
+    for n in (1, 2):
+        m = esquema()["cc"].get((tipo, n))
+        if m and m["tabla"] not in vistas:
+            vistas.add(m["tabla"])
+            out.append(m)
+    return out
+
+
+def _crear_esquema(conn):
+    """CREATE TABLE/INDEX IF NOT EXISTS de todo el esquema + migraciones pendientes."""
+    cur = conn.cursor()
+
+    # Clientes
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS clientes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT,
+        razon_social TEXT,
+        condicion_iva TEXT,
+        cuit_dni TEXT,
+        tel1 TEXT, cont1 TEXT,
+        tel2 TEXT, cont2 TEXT,
+        email TEXT,
+        calle TEXT, nro TEXT, entre TEXT,
+        localidad TEXT, cp TEXT, provincia TEXT,
+        estado TEXT
+    )
+    """
+    )
+
+    # Divisas (compra/venta de USD) — linkeado a movimientos de caja
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS divisas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha      TEXT,
+        tipo       TEXT,      -- 'compra' | 'venta'
+        usd        REAL,
+        tc         REAL,      -- tipo de cambio (pesos por USD)
+        pesos      REAL,      -- importe en pesos
+        cuenta     TEXT,      -- cuenta1 | cuenta2 | ambas | NULL
+        mov_caja_id INTEGER,  -- vínculo a movimientos_caja.id
+        obs        TEXT
+    )
+    """
+    )
+
+    # Proveedores
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS proveedores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT,
+        razon_social TEXT,
+        condicion_iva TEXT,
+        cuit_dni TEXT,
+        tel1 TEXT, cont1 TEXT,
+        tel2 TEXT, cont2 TEXT,
+        email TEXT,
+        calle TEXT, nro TEXT, entre TEXT,
+        localidad TEXT, cp TEXT, provincia TEXT,
+        estado TEXT
+    )
+    """
+    )
+
+    # Empleados (según tu dump)
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS empleados (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT,
+        apellido TEXT,
+        dni_cuil TEXT,
+        telefono TEXT,
+        email TEXT,
+        calle TEXT,
+        numero TEXT,
+        entre_calles TEXT,
+        localidad TEXT,
+        cp TEXT,
+        provincia TEXT,
+        puesto TEXT,
+        fecha_ingreso TEXT,
+        tel_emergencias TEXT,
+        contacto_emergencias TEXT,
+        estado TEXT,
+        fecha_egreso TEXT
+    )
+    """
+    )
+
+    # Caja (con 'cuenta')
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS movimientos_caja (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT,
+        tipo TEXT,                 -- ingreso | egreso
+        medio TEXT,                -- efectivo | cheque | banco | otro
+        concepto TEXT,
+        detalle TEXT,
+        monto REAL,
+        tercero_tipo TEXT,         -- cliente | proveedor | ''
+        tercero_id INTEGER,
+        estado TEXT,               -- confirmado | pendiente
+        origen_tipo TEXT,          -- recibo | orden_pago | factura | etc
+        origen_id INTEGER,
+        categoria_id INTEGER,
+        centro_costo_id INTEGER,
+        cuenta TEXT                -- cuenta1 | cuenta2 | ambas | NULL
+    )
+    """
+    )
+
+    # Cheques (con 'cuenta' opcional y estado)
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS cheques (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero TEXT,
+        banco TEXT,
+        importe REAL,
+        fecha_recibido TEXT,
+        fecha_cobro TEXT,
+        cliente_id INTEGER,
+        firmante_nombre TEXT,
+        firmante_cuit TEXT,
+        estado TEXT,               -- en_cartera | depositado | endosado | rechazado
+        fecha_estado TEXT,
+        obs TEXT,
+        mov_caja_id INTEGER,
+        proveedor_id INTEGER,
+        cuenta_banco TEXT,
+        gastos_bancarios REAL,
+        cuenta TEXT                -- cuenta1 | cuenta2 | NULL
+    )
+    """
+    )
+
+    # Cuentas corrientes separadas: CLIENTES
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS cc_clientes_c1 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT,
+        cliente_id INTEGER,
+        doc TEXT,
+        numero TEXT,
+        concepto TEXT,
+        medio TEXT,
+        debe REAL,
+        haber REAL,
+        caja_mov_id INTEGER,
+        cheque_id INTEGER,
+        obs TEXT
+    )
+    """
+    )
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS cc_clientes_c2 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT,
+        cliente_id INTEGER,
+        doc TEXT,
+        numero TEXT,
+        concepto TEXT,
+        medio TEXT,
+        debe REAL,
+        haber REAL,
+        caja_mov_id INTEGER,
+        cheque_id INTEGER,
+        obs TEXT
+    )
+    """
+    )
+
+    # Cuentas corrientes separadas: PROVEEDORES
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS cc_proveedores_c1 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT,
+        proveedor_id INTEGER,
+        doc TEXT,
+        numero TEXT,
+        concepto TEXT,
+        medio TEXT,
+        debe REAL,
+        haber REAL,
+        caja_mov_id INTEGER,
+        cheque_id INTEGER,
+        obs TEXT
+    )
+    """
+    )
+    cur.execute(
+        """
+    CREATE TABLE IF NOT EXISTS cc_proveedores_c2 (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        fecha TEXT,
+        proveedor_id INTEGER,
+        doc TEXT,
+        numero TEXT,
+        concepto TEXT,
+        medio TEXT,
+        debe REAL,
+        haber REAL,
+        caja_mov_id INTEGER,
+        cheque_id INTEGER,
+        obs TEXT
+    )
+    """
+    )
+
+    # Numeradores (para next_num)
+    _ensure_numeradores(conn)
+
+    # Saldos materializados de CC (tabla + triggers)
+    _ensure_cc_saldos(conn)
+
+    conn.commit()
+
+    # Migraciones versionadas (PRAGMA user_version)
+    _migrar(conn)
+    _esquema_refrescar(conn)
+
+
+# -------------------- ARRANQUE --------------------
+# Importar db_access no toca la base. La primera get_conn() sobre cada
+# DB_PATH la prepara una sola vez: si PRAGMA user_version ya es
+# SCHEMA_VERSION sólo se lee el mapa de esquema; si no, se arma/migra todo.
+# Por eso todo cambio de esquema tiene que ir como migración nueva.
+
+_init_lock = threading.RLock()
+_bases_listas = set()  # rutas (str) ya preparadas en este proceso
+_bases_en_curso = set()
+
+
+def _asegurar_base():
+    ruta = str(DB_PATH)
+    with _init_lock:
+        if ruta in _bases_listas or ruta in _bases_en_curso:
+            return
+        _bases_en_curso.add(ruta)
+        conn = _abrir_conexion()
+        try:
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0] or 0)
+            if version >= SCHEMA_VERSION:
+                _esquema_refrescar(conn)
+            else:
+                _crear_esquema(conn)
+            _bases_listas.add(ruta)
+        finally:
+            _bases_en_curso.discard(ruta)
+            conn.close()
+
+
+def init_db():
+    """Arma el esquema completo de DB_PATH sin mirar la versión (idempotente)."""
+    ruta = str(DB_PATH)
+    with _init_lock:
+        _bases_en_curso.add(ruta)
+        conn = _abrir_conexion()
+        try:
+            _crear_esquema(conn)
+            _bases_listas.add(ruta)
+        finally:
+            _bases_en_curso.discard(ruta)
+            conn.close()
+
+
+def iniciar(db_path=None) -> dict:
+    """
+    Fase de arranque explícita (app, scripts, CLI): fija la base y la deja
+    lista. Devuelve {"db", "version", "segundos"}.
+    """
+    global DB_PATH
+    if db_path is not None:
+        DB_PATH = Path(db_path)
+    t0 = time.perf_counter()
+    _asegurar_base()
+    conn = get_conn()
+    try:
+        version = int(conn.execute("PRAGMA user_version").fetchone()[0] or 0)
+    finally:
+        conn.close()
+    return {"db": str(DB_PATH), "version": version, "segundos": time.perf_counter() - t0}
+
+
+# -------- Numeradores / IDs --------
+
+
+# Reserva por bloques: cada proceso toma NUM_BLOQUE números de una vez y los
+# entrega desde memoria. Los que no llegue a usar quedan como salto de numeración.
+NUM_BLOQUE = 50
+_num_lock = threading.Lock()
+_num_reservas = {}  # (DB_PATH, tipo) -> [siguiente, último]
+
+
+def _num_tomar(cur, tipo: str, cantidad: int = 1) -> int:
+    """Avanza el numerador `cantidad` y devuelve el último valor tomado (UPDATE ... RETURNING)."""
+    cur.execute(
+        "INSERT INTO numeradores (tipo, valor) VALUES (?, 0) ON CONFLICT(tipo) DO NOTHING",
+        (tipo,),
+    )
+    row = cur.execute(
+        "UPDATE numeradores SET valor = valor + ? WHERE tipo = ? RETURNING valor",
+        (int(cantidad), tipo),
+    ).fetchone()
+    return int(row[0])
+
+
+def next_num(tipo: str, sucursal: str = "0001", bloque: bool = False) -> str:
+    """
+    Devuelve un número tipo '0001-00000001' por cada 'tipo' (p.ej. 'recibo', 'op').
+    Persistente en tabla numeradores(tipo, valor).
+    El incremento es un solo UPDATE ... RETURNING dentro de transaccion(): si el
+    llamador ya tiene una abierta el número sale de ESA transacción (y vuelve
+    atrás con ella); si no, BEGIN IMMEDIATE propio.
+    bloque=True: entrega desde la reserva del proceso (NUM_BLOQUE números por
+    cada ida a la base), para emisión masiva.
+    """
+    tipo = (tipo or "").strip().lower()
+    if bloque:
+        clave = (str(DB_PATH), tipo)
+        with _num_lock:
+            r = _num_reservas.get(clave)
+            if r and r[0] <= r[1]:
+                n = r[0]
+                r[0] += 1
+                return f"{sucursal}-{n:08d}"
+            if getattr(_pool_local, "tx", None) is None:
+                # la reserva se confirma sola: si no, un rollback de afuera
+                # dejaría en memoria números que otro proceso puede volver a tomar
+                with transaccion() as conn:
+                    hasta = _num_tomar(conn.cursor(), tipo, NUM_BLOQUE)
+                _num_reservas[clave] = [hasta - NUM_BLOQUE + 2, hasta]
+                return f"{sucursal}-{hasta - NUM_BLOQUE + 1:08d}"
+        # sin reserva y con transacción abierta: número suelto dentro de ella
+
+    with transaccion() as conn:
+        n = _num_tomar(conn.cursor(), tipo)
+    return f"{sucursal}-{n:08d}"
+
+
+def numerador_reservas_liberar():
+    """Olvida las reservas en memoria (los números sin usar quedan como salto)."""
+    with _num_lock:
+        _num_reservas.clear()
+
+
+def next_id(tabla: str) -> int:
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT COALESCE(MAX(id),0)+1 FROM {tabla}")
+        nid = int(cur.fetchone()[0] or 1)
+    except Exception:
+        nid = 1
+    conn.close()
+    return nid
+
+
+# -------------------- CLIENTES / PROVEEDORES --------------------
+
+# Directorio en memoria: id -> razon_social / estado, por tipo. Se carga la
+# primera vez que se pide y se invalida en cada alta/edición/baja de
+# clientes o proveedores hecha por estas funciones, o al pedirlo si el
+# registro de cambios muestra cambios en la tabla después de armarlo (SQL
+# directo, otro proceso). entidades_version() sube con cada invalidación:
+# si no cambió, los mapas siguen siendo válidos.
+_ent_lock = threading.Lock()
+_ent_cache = {}  # tipo -> {"nombres": {id: nombre}, "estados": {id: estado}}
+_ent_version = 0
+
+
+def _ent_tabla(tipo: str) -> str:
+    return "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+
+
+def invalidar_entidades(tipo: str | None = None):
+    """Descarta el directorio cacheado (de un tipo o de ambos) y sube la versión."""
+    global _ent_version
+    with _ent_lock:
+        if tipo is None:
+            _ent_cache.clear()
+        else:
+            _ent_cache.pop(_ent_tabla(tipo), None)
+        _ent_version += 1
+
+
+def entidades_version() -> int:
+    return _ent_version
+
+
+def _ent_vigente(tabla: str, d: dict) -> bool:
+    """
+    ¿Sigue valiendo d? Mira sólo los cambios registrados después del último
+    control (id > d["cambio"]) y, si ninguno es de `tabla`, avanza la marca.
+    """
+    conn = get_conn()
+    try:
+        ultimo, hubo = conn.execute(
+            "SELECT MAX(id), MAX(tabla = ?) FROM cambios WHERE id > ?", (tabla, d["cambio"])
+        ).fetchone()
+    finally:
+        conn.close()
+    if hubo:
+        return False
+    if ultimo:
+        d["cambio"] = ultimo
+    return True
+
+
+def _ent_directorio(tipo: str) -> dict:
+    tabla = _ent_tabla(tipo)
+    with _ent_lock:
+        d = _ent_cache.get(tabla)
+    if d is not None:
+        if _ent_vigente(tabla, d):
+            return d
+        invalidar_entidades(tabla)
+    with _ent_lock:
+        version = _ent_version
+    conn = get_conn()
+    try:
+        # la marca se toma antes de leer: lo que entre en el medio se ve la próxima vez
+        cambio = cambios_ultimo(conn)
+        rows = conn.execute(f"SELECT id, razon_social, estado FROM {tabla}").fetchall()
+    finally:
+        conn.close()
+    d = {
+        "nombres": {i: (n or "") for i, n, _e in rows},
+        "estados": {i: (e or "") for i, _n, e in rows},
+        "cambio": cambio,
+    }
+    with _ent_lock:
+        # si alguien invalidó mientras leíamos, no guardo datos viejos
+        if version == _ent_version:
+            _ent_cache[tabla] = d
+    return d
+
+
+def mapa_nombres(tipo: str) -> dict:
+    """{id: razon_social} de clientes o proveedores (cacheado; no modificar)."""
+    return _ent_directorio(tipo)["nombres"]
+
+
+def mapa_estados(tipo: str) -> dict:
+    """{id: estado} de clientes o proveedores (cacheado; no modificar)."""
+    return _ent_directorio(tipo)["estados"]
+
+
+
+def listar_clientes():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            id,           -- 0
+            tipo,         -- 1
+            razon_social, -- 2
+            condicion_iva,-- 3
+            cuit_dni,     -- 4
+            tel1,         -- 5
+            cont1,        -- 6
+            tel2,         -- 7
+            cont2,        -- 8
+            email,        -- 9
+            calle,        -- 10
+            nro,          -- 11
+            entre,        -- 12
+            localidad,    -- 13
+            cp,           -- 14
+            provincia,    -- 15
+            estado        -- 16
+        FROM clientes
+        ORDER BY id
+    """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def obtener_cliente(cid: int):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id,tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
+               calle,nro,entre,localidad,cp,provincia,estado
+        FROM clientes WHERE id=?
+    """,
+        (cid,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def listar_clientes_id_nombre():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT id, razon_social FROM clientes ORDER BY razon_social")
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def agregar_cliente(data, id_manual=None):
+    # data = (tipo, razon_social, condicion_iva, cuit_dni, tel1, cont1, tel2, cont2,
+    #         email, calle, nro, entre, localidad, cp, provincia, estado)
+    conn = get_conn()
+    cur = conn.cursor()
+    if id_manual is not None:
+        cur.execute(
+            """
+            INSERT OR REPLACE INTO clientes
+            (id,tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
+             calle,nro,entre,localidad,cp,provincia,estado)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            (id_manual, *data),
+        )
+    else:
+        cur.execute(
+            """
+            INSERT INTO clientes
+            (tipo,razon_social,condicion_iva,cuit_dni,tel1,cont1,tel2,cont2,email,
+             calle,nro,entre,localidad,cp,provincia,estado)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            data,
+        )
+    conn.commit()
+    conn.close()
+    invalidar_entidades("clientes")
+
+
+def editar_cliente(cid, data):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE clientes SET
+            tipo=?, razon_social=?, condicion_iva=?, cuit_dni=?, tel1=?, cont1=?,
+            tel2=?, cont2=?, email=?, calle=?, nro=?, entre=?, localidad=?, cp=?, provincia=?, estado=?
+        WHERE id=?
+    """,
+        (*data, cid),
+    )
+    conn.commit()
+    conn.close()
+    invalidar_entidades("clientes")
+
+
+def borrar_cliente(cid):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM clientes WHERE id=?", (cid,))
+    conn.commit()
+    conn.close()
+    invalidar_entidades("clientes")
+
+
+# --- PROVEEDORES: CRUD básico y listados ---
+
+
+def listar_proveedores():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, tipo, razon_social, condicion_iva, cuit_dni,
+               tel1, cont1, tel2, cont2, email,
+               calle, nro, entre, localidad, cp, provincia, estado
+        FROM proveedores
+        ORDER BY id ASC
+    """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def listar_proveedores_id_nombre():
+    # Para combos / selección rápida (usa en Endosar cheque)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, razon_social FROM proveedores ORDER BY razon_social COLLATE NOCASE"
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def obtener_proveedor(proveedor_id: int):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, tipo, razon_social, condicion_iva, cuit_dni,
+               tel1, cont1, tel2, cont2, email,
+               calle, nro, entre, localidad, cp, provincia, estado
+        FROM proveedores
+        WHERE id=?
+    """,
+        (proveedor_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def agregar_proveedor(data, id_manual=None):
+    """
+    data = (tipo, razon_social, condicion_iva, cuit_dni,
+            tel1, cont1, tel2, cont2, email,
+            calle, nro, entre, localidad, cp, provincia, estado)
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    if id_manual is None:
+        cur.execute(
+            """
+            INSERT INTO proveedores
+            (tipo, razon_social, condicion_iva, cuit_dni,
+             tel1, cont1, tel2, cont2, email,
+             calle, nro, entre, localidad, cp, provincia, estado)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            tuple(data),
+        )
+    else:
+        # Permití alta con ID manual
+        cur.execute(
+            """
+            INSERT OR REPLACE INTO proveedores
+            (id, tipo, razon_social, condicion_iva, cuit_dni,
+             tel1, cont1, tel2, cont2, email,
+             calle, nro, entre, localidad, cp, provincia, estado)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            (id_manual,) + tuple(data),
+        )
+    conn.commit()
+    conn.close()
+    invalidar_entidades("proveedores")
+
+
+def editar_proveedor(proveedor_id: int, data):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE proveedores
+        SET tipo=?, razon_social=?, condicion_iva=?, cuit_dni=?,
+            tel1=?, cont1=?, tel2=?, cont2=?, email=?,
+            calle=?, nro=?, entre=?, localidad=?, cp=?, provincia=?, estado=?
+        WHERE id=?
+    """,
+        tuple(data) + (proveedor_id,),
+    )
+    conn.commit()
+    conn.close()
+    invalidar_entidades("proveedores")
+
+
+def borrar_proveedor(pid):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM proveedores WHERE id=?", (pid,))
+    conn.commit()
+    conn.close()
+    invalidar_entidades("proveedores")
+
+
+# -------------------- EMPLEADOS (NUEVO) --------------------
+
+
+def listar_empleados():
+    conn = get_conn()
+    cur = conn.cursor()
+    rows = cur.execute(
+        """
+        SELECT id, nombre, apellido, dni_cuil, telefono, email,
+               calle, numero, entre_calles, localidad, cp, provincia,
+               puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
+               estado, fecha_egreso
+        FROM empleados
+        ORDER BY id ASC
+    """
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def obtener_empleado(emp_id: int):
+    conn = get_conn()
+    cur = conn.cursor()
+    row = cur.execute(
+        """
+        SELECT id, nombre, apellido, dni_cuil, telefono, email,
+               calle, numero, entre_calles, localidad, cp, provincia,
+               puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
+               estado, fecha_egreso
+        FROM empleados
+        WHERE id=?
+    """,
+        (emp_id,),
+    ).fetchone()
+    conn.close()
+    return row
+
+
+_EMP_COLS = (
+    "nombre", "apellido", "dni_cuil", "telefono", "email",
+    "calle", "numero", "entre_calles", "localidad", "cp", "provincia",
+    "puesto", "fecha_ingreso", "tel_emergencias", "contacto_emergencias",
+    "estado", "fecha_egreso",
+)
+
+
+def agregar_empleado(data_tuple, id_manual: int | None = None):
+    """
+    data_tuple = (
+      nombre, apellido, dni_cuil, telefono, email,
+      calle, numero, entre_calles, localidad, cp, provincia,
+      puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
+      estado, fecha_egreso
+    )
+    """
+    data_tuple = _fechas_iso_params(_EMP_COLS, data_tuple)
+    conn = get_conn()
+    cur = conn.cursor()
+    if id_manual is not None:
+        cur.execute(
+            """
+            INSERT OR REPLACE INTO empleados(
+              id, nombre, apellido, dni_cuil, telefono, email,
+              calle, numero, entre_calles, localidad, cp, provincia,
+              puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
+              estado, fecha_egreso
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            (id_manual, *data_tuple),
+        )
+    else:
+        cur.execute(
+            """
+            INSERT INTO empleados(
+              nombre, apellido, dni_cuil, telefono, email,
+              calle, numero, entre_calles, localidad, cp, provincia,
+              puesto, fecha_ingreso, tel_emergencias, contacto_emergencias,
+              estado, fecha_egreso
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+            data_tuple,
+        )
+    conn.commit()
+    conn.close()
+
+
+def editar_empleado(emp_id: int, data_tuple):
+    data_tuple = _fechas_iso_params(_EMP_COLS, data_tuple)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE empleados SET
+          nombre=?, apellido=?, dni_cuil=?, telefono=?, email=?,
+          calle=?, numero=?, entre_calles=?, localidad=?, cp=?, provincia=?,
+          puesto=?, fecha_ingreso=?, tel_emergencias=?, contacto_emergencias=?,
+          estado=?, fecha_egreso=?
+        WHERE id=?
+    """,
+        (*data_tuple, emp_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def borrar_empleado(emp_id: int):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM empleados WHERE id=?", (emp_id,))
+    conn.commit()
+    conn.close()
+
+
+# -------------------- CAJA --------------------
+
+
+def agregar_movimiento(data, id_manual=None):
+    """
+    data: (fecha, tipo, medio, concepto, detalle, monto,
+           tercero_tipo, tercero_id, estado, origen_tipo, origen_id,
+           categoria_id, centro_costo_id, cuenta)
+    También acepta dict con esas keys, o ([dict],).
+    """
+    cols = (
+        "fecha",
+        "tipo",
+        "medio",
+        "concepto",
+        "detalle",
+        "monto",
+        "tercero_tipo",
+        "tercero_id",
+        "estado",
+        "origen_tipo",
+        "origen_id",
+        "categoria_id",
+        "centro_costo_id",
+        "cuenta",
+    )
+
+    params = _fechas_iso_params(cols, _as_params(data, cols))
+
+    conn = get_conn()
+    cur = conn.cursor()
+    placeholders = ",".join(["?"] * len(cols))
+    if id_manual is not None:
+        cur.execute(
+            f"INSERT INTO movimientos_caja (id,{','.join(cols)}) VALUES ({id_manual},{placeholders})",
+            params,
+        )
+    else:
+        cur.execute(
+            f"INSERT INTO movimientos_caja ({','.join(cols)}) VALUES ({placeholders})",
+            params,
+        )
+    conn.commit()
+    last = cur.lastrowid
+    conn.close()
+    return last
+
+
+# ===================== CAJA: helpers =====================
+
+
+def caja_agregar(
+    fecha,
+    tipo,
+    medio,
+    concepto,
+    detalle,
+    monto,
+    tercero_tipo,
+    tercero_id,
+    cuenta,
+    origen_tipo=None,
+    origen_id=None,
+    id_manual=None,
+) -> int:
+    """
+    Crea un movimiento en 'movimientos_caja' y devuelve su ID.
+    tipo: 'ingreso' | 'egreso'
+    tercero_tipo: 'cliente' | 'proveedor'
+    cuenta: 'cuenta1' | 'cuenta2' | 1 | 2  (se normaliza a 1/2)
+    """
+    cuenta_n = 1 if str(cuenta).strip().lower().endswith("1") else 2
+    conn = get_conn()
+    cur = conn.cursor()
+
+    cols = [
+        "fecha",
+        "tipo",
+        "medio",
+        "concepto",
+        "detalle",
+        "monto",
+        "tercero_tipo",
+        "tercero_id",
+        "estado",
+        "origen_tipo",
+        "origen_id",
+        "categoria_id",
+        "centro_costo_id",
+        "cuenta",
+    ]
+    placeholders = ",".join(["?"] * len(cols))
+    params = (
+        _fecha_iso(str(fecha or "")),
+        str(tipo or "").lower(),
+        str(medio or ""),
+        str(concepto or ""),
+        str(detalle or ""),
+        float(monto or 0),
+        str(tercero_tipo or "").lower(),
+        int(tercero_id or 0),
+        "ok",  # estado por defecto
+        origen_tipo,
+        origen_id,
+        None,
+        None,
+        cuenta_n,
+    )
+
+    if id_manual is not None:
+        cur.execute(
+            f"INSERT INTO movimientos_caja (id,{','.join(cols)}) VALUES ({int(id_manual)},{placeholders})",
+            params,
+        )
+    else:
+        cur.execute(
+            f"INSERT INTO movimientos_caja ({','.join(cols)}) VALUES ({placeholders})",
+            params,
+        )
+
+    conn.commit()
+    mov_id = cur.lastrowid
+    conn.close()
+    return mov_id
+
+
+def caja_set_origen(mov_id: int, origen_tipo: str, origen_id: int) -> None:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE movimientos_caja SET origen_tipo=?, origen_id=? WHERE id=?",
+        (str(origen_tipo or ""), int(origen_id or 0), int(mov_id)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def caja_listar(desde=None, hasta=None):
+    """
+    Devuelve filas para listar caja en UI.
+    (id, fecha, tipo, tercero_tipo, tercero_id, concepto, detalle, monto, medio, origen_tipo, origen_id, cuenta)
+    desde / hasta: rango opcional de fechas (inclusive).
+    """
+    rango, rp = _rango_fecha_sql(desde, hasta)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT id, fecha, tipo, tercero_tipo, tercero_id, concepto, detalle, monto, medio,
+               origen_tipo, origen_id, cuenta
+        FROM movimientos_caja
+        WHERE 1=1{rango}
+        ORDER BY fecha DESC, id DESC
+    """,
+        rp,
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def caja_pagina(cursor=None, limite: int = 200):
+    """
+    Página de movimientos de caja (mismas columnas que listar_movimientos),
+    orden fecha DESC, id DESC, paginada por clave (fecha, id) — sin OFFSET.
+    Fecha NULL cuenta como '' (van al final), así ninguna fila queda afuera.
+    cursor: None para la primera página, o el devuelto por la llamada anterior.
+    Devuelve (filas, cursor_siguiente); cursor_siguiente=None si no hay más.
+    """
+    where, params = "", []
+    if cursor is not None:
+        # el <= sobre la clave sola deja a SQLite buscar en el índice
+        where = f"WHERE {_CAJA_FCLAVE} <= ? AND ({_CAJA_FCLAVE}, id) < (?, ?)"
+        params = [cursor[0], *cursor]
+    conn = get_conn()
+    cur = conn.cursor()
+    rows = cur.execute(
+        f"""SELECT id, fecha, tipo, medio, concepto, detalle, monto,
+                   tercero_tipo, tercero_id, estado, origen_tipo, origen_id,
+                   categoria_id, centro_costo_id, cuenta
+            FROM movimientos_caja
+            {where}
+            ORDER BY {_CAJA_FCLAVE} DESC, id DESC
+            LIMIT ?""",
+        (*params, int(limite)),
+    ).fetchall()
+    conn.close()
+    sig = (rows[-1][1] or "", rows[-1][0]) if len(rows) == int(limite) else None
+    return rows, sig
+
+
+def caja_totales():
+    """(saldo = ingresos - egresos, cantidad de movimientos) en una sola consulta."""
+    conn = get_conn()
+    row = conn.execute(
+        """SELECT COALESCE(SUM(CASE WHEN tipo='ingreso' THEN COALESCE(monto,0)
+                                    ELSE -COALESCE(monto,0) END), 0),
+                  COUNT(*)
+           FROM movimientos_caja"""
+    ).fetchone()
+    conn.close()
+    return float(row[0] or 0), int(row[1] or 0)
+
+
+def listar_movimientos():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT id, fecha, tipo, medio, concepto, detalle, monto,
+                          tercero_tipo, tercero_id, estado, origen_tipo, origen_id,
+                          categoria_id, centro_costo_id, cuenta
+                   FROM movimientos_caja
+                   ORDER BY fecha DESC, id DESC"""
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def borrar_mov_caja(mov_id: int):
+    """Borra un movimiento de caja y desengancha todas las referencias (cheques y CC)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        # Desvincular cheques que apuntan a este movimiento de caja
+        cur.execute(
+            "UPDATE cheques SET mov_caja_id=NULL WHERE mov_caja_id=?", (mov_id,)
+        )
+        # Desvincular CC (clientes y proveedores) que apuntan a este movimiento de caja
+        for t in (
+            "cc_clientes_c1",
+            "cc_clientes_c2",
+            "cc_proveedores_c1",
+            "cc_proveedores_c2",
+        ):
+            cur.execute(
+                f"UPDATE {t} SET caja_mov_id=NULL WHERE caja_mov_id=?", (mov_id,)
+            )
+        # Borrar el movimiento de caja
+        cur.execute("DELETE FROM movimientos_caja WHERE id=?", (mov_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# -------------------- CHEQUES --------------------
+
+
+def agregar_cheque(data, id_manual=None):
+    """
+    data = (
+        numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
+        firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
+        mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
+    )
+    También acepta dict con esas keys, o ([dict],).
+    """
+    cols = (
+        "numero",
+        "banco",
+        "importe",
+        "fecha_recibido",
+        "fecha_cobro",
+        "cliente_id",
+        "firmante_nombre",
+        "firmante_cuit",
+        "estado",
+        "fecha_estado",
+        "obs",
+        "mov_caja_id",
+        "proveedor_id",
+        "cuenta_banco",
+        "gastos_bancarios",
+        "cuenta",
+    )
+
+    params = _fechas_iso_params(cols, _as_params(data, cols))
+
+    conn = get_conn()
+    cur = conn.cursor()
+    placeholders = ",".join(["?"] * len(cols))
+    if id_manual is not None:
+        cur.execute(
+            f"INSERT INTO cheques (id,{','.join(cols)}) VALUES ({id_manual},{placeholders})",
+            params,
+        )
+    else:
+        cur.execute(
+            f"INSERT INTO cheques ({','.join(cols)}) VALUES ({placeholders})", params
+        )
+    last = cur.lastrowid
+    k = _recibo_clave(params[cols.index("obs")], solo_tag=True)
+    if k:
+        _recibo_vincular(cur, last, k)
+    conn.commit()
+    conn.close()
+    return last
+
+
+def cheques_pagina(cursor=None, limite: int = 200, solo_cartera: bool = False):
+    """
+    Página de cheques (mismas columnas que listar_cheques más recibo_n del
+    vínculo recibo_cheques, None si no tiene), en cartera primero por fecha de
+    cobro y después el resto por id; paginada por clave, sin OFFSET.
+    Devuelve (filas, cursor_siguiente); cursor_siguiente=None si no hay más.
+    """
+    where, params = [], []
+    if cursor is not None:
+        where.append(f"({_CHQ_GRUPO}, {_CHQ_FCLAVE}, id) > (?, ?, ?)")
+        params.extend(cursor)
+    if solo_cartera:
+        where.append(f"{_CHQ_GRUPO} < 2")
+    conn = get_conn()
+    cur = conn.cursor()
+    rows = cur.execute(
+        f"""
+        SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
+               firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
+               mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta,
+               rc.recibo_n, {_CHQ_GRUPO}, {_CHQ_FCLAVE}
+        FROM cheques
+        LEFT JOIN recibo_cheques rc ON rc.cheque_id = cheques.id
+        {("WHERE " + " AND ".join(where)) if where else ""}
+        ORDER BY {_CHQ_GRUPO}, {_CHQ_FCLAVE}, id
+        LIMIT ?
+    """,
+        (*params, int(limite)),
+    ).fetchall()
+    conn.close()
+    sig = None
+    if len(rows) == int(limite):
+        last = rows[-1]
+        sig = (last[18], last[19], last[0])
+    return [r[:18] for r in rows], sig
+
+
+def cheques_totales():
+    """{'cantidad', 'en_cartera', 'importe_cartera'} en una sola consulta."""
+    conn = get_conn()
+    row = conn.execute(
+        f"""SELECT COUNT(*),
+                   COALESCE(SUM(CASE WHEN {_CHQ_CARTERA} THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN {_CHQ_CARTERA} THEN COALESCE(importe,0) ELSE 0 END), 0)
+            FROM cheques"""
+    ).fetchone()
+    conn.close()
+    return {
+        "cantidad": int(row[0] or 0),
+        "en_cartera": int(row[1] or 0),
+        "importe_cartera": float(row[2] or 0),
+    }
+
+
+def listar_cheques():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
+               firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
+               mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
+        FROM cheques
+        ORDER BY
+            CASE LOWER(COALESCE(estado,'')) WHEN 'en_cartera' THEN 0 ELSE 1 END,
+            fecha_cobro ASC,
+            id ASC
+    """
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def listar_cheques_por_estado(estado: str):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
+               firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
+               mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
+        FROM cheques
+        WHERE LOWER(COALESCE(estado,'')) = LOWER(?)
+        ORDER BY fecha_cobro ASC, id ASC
+    """,
+        (estado,),
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def listar_cheques_en_cartera():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT id, numero, banco, importe, fecha_cobro, cliente_id, firmante_nombre, firmante_cuit, cuenta
+                   FROM cheques
+                   WHERE LOWER(COALESCE(estado,''))='en_cartera'
+                   ORDER BY fecha_cobro ASC, id ASC"""
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def obtener_cheque(cid):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT id, numero, banco, importe, fecha_recibido, fecha_cobro, cliente_id,
+                          firmante_nombre, firmante_cuit, estado, fecha_estado, obs,
+                          mov_caja_id, proveedor_id, cuenta_banco, gastos_bancarios, cuenta
+                   FROM cheques WHERE id=?""",
+        (cid,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def actualizar_estado_cheque(
+    cid,
+    nuevo_estado,
+    fecha_estado,
+    proveedor_id=None,
+    cuenta_banco=None,
+    gastos_bancarios=None,
+):
+    conn = get_conn()
+    cur = conn.cursor()
+    sets = ["estado=?", "fecha_estado=?"]
+    params = [nuevo_estado, _fecha_iso(fecha_estado)]
+    if proveedor_id is not None:
+        sets.append("proveedor_id=?")
+        params.append(proveedor_id)
+    if cuenta_banco is not None:
+        sets.append("cuenta_banco=?")
+        params.append(cuenta_banco)
+    if gastos_bancarios is not None:
+        sets.append("gastos_bancarios=?")
+        params.append(gastos_bancarios)
+    params.append(cid)
+    cur.execute(f"UPDATE cheques SET {', '.join(sets)} WHERE id=?", params)
+    conn.commit()
+    conn.close()
+
+
+def set_mov_caja_en_cheque(cheque_id, mov_id):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("PRAGMA foreign_keys=ON;")
+    cur.execute("UPDATE cheques SET mov_caja_id=? WHERE id=?", (mov_id, cheque_id))
+    conn.commit()
+    conn.close()
+
+
+# -------------------- RECIBO <-> CHEQUES --------------------
+
+
+def _recibo_vincular(cur, cheque_id, clave):
+    cur.execute(
+        """INSERT INTO recibo_cheques (cheque_id, recibo, recibo_n) VALUES (?,?,?)
+           ON CONFLICT(cheque_id) DO UPDATE SET recibo=excluded.recibo, recibo_n=excluded.recibo_n""",
+        (int(cheque_id), clave[0], clave[1]),
+    )
+
+
+def recibo_vincular_cheque(cheque_id, recibo):
+    """Asocia el cheque al recibo ("0001-00000049", "49" o "REC 49"). False si no se entiende."""
+    k = _recibo_clave(recibo)
+    if not k:
+        return False
+    conn = get_conn()
+    _recibo_vincular(conn.cursor(), cheque_id, k)
+    conn.commit()
+    conn.close()
+    return True
+
+
+def recibo_de_obs(obs):
+    """Recibo anotado en un texto libre ("... | REC 0001-00000049"), o None."""
+    return _recibo_clave(obs, solo_tag=True)
+
+
+def recibo_de_cheque(cheque_id):
+    """Recibo vinculado al cheque como ('0001-00000049', 49), o None."""
+    conn = get_conn()
+    row = conn.execute(
+        "SELECT recibo, recibo_n FROM recibo_cheques WHERE cheque_id=?", (int(cheque_id),)
+    ).fetchone()
+    conn.close()
+    return (row[0], int(row[1])) if row else None
+
+
+def cheques_de_recibo(recibo):
+    """
+    Cheques del recibo como dicts (todas las columnas de cheques), por índice.
+    Con número completo ("0001-00000049") compara exacto; con número simple
+    ("49") compara el número entero, así "REC 12" no trae los de "REC 123".
+    """
+    k = _recibo_clave(recibo)
+    if not k:
+        return []
+    if "-" in k[0]:
+        where, param = "r.recibo=?", k[0]
+    else:
+        where, param = "r.recibo_n=?", k[1]
+    conn = get_conn()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        f"""SELECT c.* FROM recibo_cheques r JOIN cheques c ON c.id = r.cheque_id
+            WHERE {where} ORDER BY c.id""",
+        (param,),
+    ).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def cc_recibo_actualizar(recibo, total, cliente_id=None, cuenta=None, cur=None) -> int:
+    """
+    Fija el HABER (y DEBE=0) del REC en la CC del cliente. `recibo` es el número
+    o una lista de variantes ("0001-00000049", "49"). Un UPDATE por el índice
+    (numero, doc) en la tabla resuelta por esquema(); sin cuenta prueba C1 y
+    después C2. Con `cur` corre dentro de la transacción del llamador.
+    Devuelve las filas tocadas.
+    """
+    numeros = [str(x) for x in (recibo if isinstance(recibo, (list, tuple)) else [recibo]) if x]
+    if not numeros:
+        return 0
+    mapas = [cc_tabla("clientes", cuenta)] if cuenta else cc_tablas("clientes")
+
+    def _aplicar(c):
+        for m in mapas:
+            if not m or not m["numero"]:
+                continue
+            sets = f"{m['haber']}=?" + (f", {m['debe']}=0" if m["debe"] else "")
+            where = [f"{m['numero']} IN ({','.join('?' * len(numeros))})"]
+            params = [float(total), *numeros]
+            if m["doc"]:
+                where.append(f"UPPER({m['doc']}) IN ('REC','RECIBO')")
+            if cliente_id:
+                # "+" = filtro sin índice: que el planner busque por (numero, doc)
+                where.append(f"+{m['ent']}=?")
+                params.append(int(cliente_id))
+            c.execute(f"UPDATE {m['tabla']} SET {sets} WHERE {' AND '.join(where)}", params)
+            if c.rowcount:
+                return c.rowcount
+        return 0
+
+    if cur is not None:
+        return _aplicar(cur)
+    with transaccion() as conn:
+        return _aplicar(conn.cursor())
+
+
+# -------------------- CC CLIENTES (C1/C2) --------------------
+
+
+def _cli_table(cuenta):
+    return "cc_clientes_c1" if str(cuenta).lower().endswith("1") else "cc_clientes_c2"
+
+
+def cc_cli_agregar_mov(
+    cuenta,
+    fecha,
+    cliente_id,
+    doc,
+    numero,
+    concepto,
+    medio,
+    debe,
+    haber,
+    caja_mov_id=None,
+    cheque_id=None,
+    obs=None,
+):
+    table = _cli_table(cuenta)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        INSERT INTO {table}
+        (fecha, cliente_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    """,
+        (
+            _fecha_iso(fecha),
+            int(cliente_id),
+            doc,
+            numero,
+            concepto,
+            medio,
+            float(debe or 0),
+            float(haber or 0),
+            caja_mov_id,
+            cheque_id,
+            obs,
+        ),
+    )
+    conn.commit()
+    last = cur.lastrowid
+    conn.close()
+    return last
+
+def cc_cli_agregar_con_caja(
+    cuenta,
+    fecha,
+    cliente_id,
+    doc,
+    numero,
+    concepto,
+    medio,
+    debe,
+    haber,
+    cuenta_caja=None,
+    cheque_id=None,
+    obs=None,
+):
+    """
+    Crea CC Clientes + movimiento de Caja vinculado.
+    Regla: si HABER > 0 -> ingreso; si DEBE > 0 -> egreso (casos raros como devolución).
+    Devuelve (cc_id, caja_id).
+    """
+    # 1) Creo Caja primero
+    monto = float(haber or 0) if float(haber or 0) > 0 else float(debe or 0)
+    tipo_caja = "ingreso" if float(haber or 0) > 0 else "egreso"
+    caja_id = caja_agregar(
+        fecha=fecha,
+        tipo=tipo_caja,
+        medio=medio,
+        concepto=concepto,
+        detalle=f"{str(doc or '').upper()} {str(numero or '')}".strip(),
+        monto=monto,
+        tercero_tipo="cliente",
+        tercero_id=cliente_id,
+        cuenta=(cuenta_caja if cuenta_caja is not None else cuenta),
+        origen_tipo=None,
+        origen_id=None,
+    )
+
+    # 2) Inserto CC con el id de caja ya asignado
+    table = "cc_clientes_c1" if str(cuenta).lower().endswith("1") else "cc_clientes_c2"
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        INSERT INTO {table}
+        (fecha, cliente_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    """,
+        (
+            _fecha_iso(fecha),
+            int(cliente_id),
+            doc,
+            numero,
+            concepto,
+            medio,
+            float(debe or 0),
+            float(haber or 0),
+            int(caja_id),
+            cheque_id,
+            obs,
+        ),
+    )
+    conn.commit()
+    cc_id = cur.lastrowid
+    conn.close()
+
+    # 3) Actualizo el origen en Caja
+    caja_set_origen(caja_id, "cc_cli", cc_id)
+    return cc_id, caja_id
+
+
+def cc_cli_listar(cliente_id, cuenta, desde=None, hasta=None):
+    # desde / hasta: rango opcional de fechas (inclusive, se normalizan a ISO)
+    rango, rp = _rango_fecha_sql(desde, hasta)
+    conn = get_conn()
+    cur = conn.cursor()
+    if cuenta == "ambas":
+        cur.execute(
+            f"""
+            SELECT 'C1' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
+            FROM cc_clientes_c1 WHERE cliente_id=?{rango}
+            UNION ALL
+            SELECT 'C2' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
+            FROM cc_clientes_c2 WHERE cliente_id=?{rango}
+            ORDER BY fecha DESC, id DESC
+        """,
+            (cliente_id, *rp, cliente_id, *rp),
+        )
+    else:
+        table = _cli_table(cuenta)
+        cur.execute(
+            f"""
+            SELECT '{'C1' if table.endswith('c1') else 'C2'}' AS cta, id, fecha, cliente_id, doc, numero, concepto, medio, debe, haber
+            FROM {table} WHERE cliente_id=?{rango}
+            ORDER BY fecha DESC, id DESC
+        """,
+            (cliente_id, *rp),
+        )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def _dmy_to_iso(s: str) -> str:
+    try:
+        d, m, y = s.strip().split("/")
+        return f"{y}-{int(m):02d}-{int(d):02d}"
+    except Exception:
+        return s  # si ya viene ISO o algo raro, lo dejo pasar
+
+
+def _saldo_mat(cur, tipo: str, entidad_id, cuenta: int) -> float:
+    row = cur.execute(
+        "SELECT saldo FROM cc_saldos WHERE tipo=? AND entidad_id=? AND cuenta=?",
+        (tipo, entidad_id, int(cuenta)),
+    ).fetchone()
+    return float(row[0] or 0) if row else 0.0
+
+
+def cc_cli_saldo(cliente_id, cuenta):
+    # lectura O(1) del saldo materializado (ver _ensure_cc_saldos)
+    conn = get_conn()
+    cur = conn.cursor()
+    if cuenta == "ambas":
+        s = _saldo_mat(cur, "clientes", cliente_id, 1) + _saldo_mat(cur, "clientes", cliente_id, 2)
+    else:
+        s = _saldo_mat(cur, "clientes", cliente_id, 1 if _cli_table(cuenta).endswith("1") else 2)
+    conn.close()
+    return s
+
+
+# -------- CC CLIENTES: editar / borrar / obtener por id --------
+
+
+def _cli_table_by_flag(cuenta_flag: str):
+    c = (cuenta_flag or "").strip().lower()
+    return "cc_clientes_c1" if c.endswith("1") else "cc_clientes_c2"
+
+
+def cc_cli_obtener(cuenta_flag: str, mov_id: int):
+    table = _cli_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT id, fecha, cliente_id, doc, numero, concepto, medio,
+               COALESCE(debe,0), COALESCE(haber,0),
+               caja_mov_id, cheque_id, obs
+        FROM {table} WHERE id=?
+    """,
+        (mov_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+# --- CLIENTES ---
+
+
+def cc_cli_actualizar(cuenta_flag: str, mov_id: int, data):
+    """
+    data = (fecha, doc, numero, concepto, medio, debe, haber, obs)
+    """
+    table = _cli_table_by_flag(cuenta_flag)  # -> "cc_clientes_c1" / "cc_clientes_c2"
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        UPDATE {table}
+        SET fecha=?, doc=?, numero=?, concepto=?, medio=?, debe=?, haber=?, obs=?
+        WHERE id=?
+    """,
+        (_fecha_iso(data[0]), *data[1:], mov_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def cc_cli_borrar(cuenta_flag: str, mov_id: int):
+    table = _cli_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
+    conn.commit()
+    conn.close()
+
+
+def cc_cli_borrar_cascada(cuenta_flag: str, mov_id: int):
+    """Borra una fila de CC Clientes y, si corresponde, su mov. de caja y/o cheque."""
+    table = _cli_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT caja_mov_id, cheque_id FROM {table} WHERE id=?", (mov_id,))
+        row = cur.fetchone()
+        caja_id = row[0] if row else None
+        cheque_id = row[1] if row else None
+    finally:
+        conn.close()
+
+    # Borrar primero caja (si existe) porque ya se encargará de desenganchar referencias
+    if caja_id:
+        borrar_mov_caja(int(caja_id))
+
+    # Borrar cheque (si quedó alguno suelto)
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        if cheque_id:
+            cur.execute("DELETE FROM cheques WHERE id=?", (cheque_id,))
+        cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# -------- CC PROVEEDORES: editar / borrar / obtener por id --------
+
+
+def _prov_table_by_flag(cuenta_flag: str):
+    c = (cuenta_flag or "").strip().lower()
+    return "cc_proveedores_c1" if c.endswith("1") else "cc_proveedores_c2"
+
+
+def cc_prov_obtener(cuenta_flag: str, mov_id: int):
+    table = _prov_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT id, fecha, proveedor_id, doc, numero, concepto, medio,
+               COALESCE(debe,0), COALESCE(haber,0),
+               caja_mov_id, cheque_id, obs
+        FROM {table} WHERE id=?
+    """,
+        (mov_id,),
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+# --- PROVEEDORES ---
+
+
+def cc_prov_actualizar(cuenta_flag: str, mov_id: int, data):
+    """
+    data = (fecha, doc, numero, concepto, medio, debe, haber, obs)
+    """
+    table = _prov_table_by_flag(
+        cuenta_flag
+    )  # -> "cc_proveedores_c1" / "cc_proveedores_c2"
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        UPDATE {table}
+        SET fecha=?, doc=?, numero=?, concepto=?, medio=?, debe=?, haber=?, obs=?
+        WHERE id=?
+    """,
+        (_fecha_iso(data[0]), *data[1:], mov_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def cc_prov_borrar(cuenta_flag: str, mov_id: int):
+    table = _prov_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
+    conn.commit()
+    conn.close()
+
+
+def cc_prov_borrar_cascada(cuenta_flag: str, mov_id: int):
+    """Borra una fila de CC Proveedores y, si corresponde, su mov. de caja y/o cheque."""
+    table = _prov_table_by_flag(cuenta_flag)
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute(f"SELECT caja_mov_id, cheque_id FROM {table} WHERE id=?", (mov_id,))
+        row = cur.fetchone()
+        caja_id = row[0] if row else None
+        cheque_id = row[1] if row else None
+    finally:
+        conn.close()
+
+    if caja_id:
+        borrar_mov_caja(int(caja_id))
+
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        if cheque_id:
+            cur.execute("DELETE FROM cheques WHERE id=?", (cheque_id,))
+        cur.execute(f"DELETE FROM {table} WHERE id=?", (mov_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# -------- CAJA: borrado forzado (desvincula CC y Cheques) --------
+
+
+def borrar_movimiento_caja_forzado(mov_id: int):
+    """
+    - Setea a NULL los vínculos hacia este mov:
+      * cheques.mov_caja_id
+      * cc_clientes_c1/2.caja_mov_id
+      * cc_proveedores_c1/2.caja_mov_id
+    - Borra el movimiento de caja.
+    Nota: NO cambia estado de cheques ni borra líneas de CC (solo los desvincula).
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        cur.execute("PRAGMA foreign_keys=ON;")
+        # Desvincular cheques
+        cur.execute(
+            "UPDATE cheques SET mov_caja_id=NULL WHERE mov_caja_id=?", (mov_id,)
+        )
+        # Desvincular CC
+        for t in (
+            "cc_clientes_c1",
+            "cc_clientes_c2",
+            "cc_proveedores_c1",
+            "cc_proveedores_c2",
+        ):
+            cur.execute(
+                f"UPDATE {t} SET caja_mov_id=NULL WHERE caja_mov_id=?", (mov_id,)
+            )
+        # Borrar movimiento
+        cur.execute("DELETE FROM movimientos_caja WHERE id=?", (mov_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# -------------------- CC PROVEEDORES (C1/C2) --------------------
+
+
+def _prov_table(cuenta):
+    return (
+        "cc_proveedores_c1"
+        if str(cuenta).lower().endswith("1")
+        else "cc_proveedores_c2"
+    )
+
+
+def cc_prov_agregar_mov(
+    cuenta,
+    fecha,
+    proveedor_id,
+    doc,
+    numero,
+    concepto,
+    medio,
+    debe,
+    haber,
+    caja_mov_id=None,
+    cheque_id=None,
+    obs=None,
+):
+    table = _prov_table(cuenta)
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        INSERT INTO {table}
+        (fecha, proveedor_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    """,
+        (
+            _fecha_iso(fecha),
+            int(proveedor_id),
+            doc,
+            numero,
+            concepto,
+            medio,
+            float(debe or 0),
+            float(haber or 0),
+            caja_mov_id,
+            cheque_id,
+            obs,
+        ),
+    )
+    conn.commit()
+    last = cur.lastrowid
+    conn.close()
+    return last
+
+
+def cc_prov_agregar_con_caja(
+    cuenta,
+    fecha,
+    proveedor_id,
+    doc,
+    numero,
+    concepto,
+    medio,
+    debe,
+    haber,
+    cuenta_caja=None,
+    cheque_id=None,
+    obs=None,
+):
+    """
+    Crea CC Proveedores + movimiento de Caja vinculado.
+    Regla: si HABER > 0 -> egreso (pago); si DEBE > 0 -> ingreso (nota de crédito recibida, etc).
+    Devuelve (cc_id, caja_id).
+    """
+    monto = float(haber or 0) if float(haber or 0) > 0 else float(debe or 0)
+    tipo_caja = "egreso" if float(haber or 0) > 0 else "ingreso"
+    caja_id = caja_agregar(
+        fecha=fecha,
+        tipo=tipo_caja,
+        medio=medio,
+        concepto=concepto,
+        detalle=f"{str(doc or '').upper()} {str(numero or '')}".strip(),
+        monto=monto,
+        tercero_tipo="proveedor",
+        tercero_id=proveedor_id,
+        cuenta=(cuenta_caja if cuenta_caja is not None else cuenta),
+        origen_tipo=None,
+        origen_id=None,
+    )
+
+    table = (
+        "cc_proveedores_c1"
+        if str(cuenta).lower().endswith("1")
+        else "cc_proveedores_c2"
+    )
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        INSERT INTO {table}
+        (fecha, proveedor_id, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    """,
+        (
+            _fecha_iso(fecha),
+            int(proveedor_id),
+            doc,
+            numero,
+            concepto,
+            medio,
+            float(debe or 0),
+            float(haber or 0),
+            int(caja_id),
+            cheque_id,
+            obs,
+        ),
+    )
+    conn.commit()
+    cc_id = cur.lastrowid
+    conn.close()
+
+    caja_set_origen(caja_id, "cc_prov", cc_id)
+    return cc_id, caja_id
+
+
+def cc_prov_listar(proveedor_id, cuenta, desde=None, hasta=None):
+    # desde / hasta: rango opcional de fechas (inclusive, se normalizan a ISO)
+    rango, rp = _rango_fecha_sql(desde, hasta)
+    conn = get_conn()
+    cur = conn.cursor()
+    if cuenta == "ambas":
+        cur.execute(
+            f"""
+            SELECT 'C1' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
+            FROM cc_proveedores_c1 WHERE proveedor_id=?{rango}
+            UNION ALL
+            SELECT 'C2' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
+            FROM cc_proveedores_c2 WHERE proveedor_id=?{rango}
+            ORDER BY fecha DESC, id DESC
+        """,
+            (proveedor_id, *rp, proveedor_id, *rp),
+        )
+    else:
+        table = _prov_table(cuenta)
+        cur.execute(
+            f"""
+            SELECT '{'C1' if table.endswith('c1') else 'C2'}' AS cta, id, fecha, proveedor_id, doc, numero, concepto, medio, debe, haber
+            FROM {table} WHERE proveedor_id=?{rango}
+            ORDER BY fecha DESC, id DESC
+        """,
+            (proveedor_id, *rp),
+        )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def cc_prov_saldo(proveedor_id, cuenta):
+    # lectura O(1) del saldo materializado (ver _ensure_cc_saldos)
+    conn = get_conn()
+    cur = conn.cursor()
+    if cuenta == "ambas":
+        s = _saldo_mat(cur, "proveedores", proveedor_id, 1) + _saldo_mat(cur, "proveedores", proveedor_id, 2)
+    else:
+        s = _saldo_mat(cur, "proveedores", proveedor_id, 1 if _prov_table(cuenta).endswith("1") else 2)
+    conn.close()
+    return s
+
+
+# -------------------- DOCUMENTOS (REC / OP) EN UNA TRANSACCIÓN --------------------
+
+
+def postear_documento(
+    tipo,
+    cuenta,
+    fecha,
+    entidad_id,
+    doc,
+    numero=None,
+    concepto="",
+    medio="",
+    debe=0.0,
+    haber=0.0,
+    cuenta_caja=None,
+    obs=None,
+    con_caja=True,
+    numerador=None,
+    cheques_nuevos=(),
+    cheques_endosados=(),
+):
+    """
+    Asienta un documento completo en UNA transacción (un solo commit):
+      - número: si `numero` viene vacío y hay `numerador` ('recibo' / 'op'), se toma adentro
+      - línea de CC (tipo 'clientes' | 'proveedores') + movimiento de Caja vinculado
+        (con_caja=False: sólo CC)
+      - cheques_nuevos: dicts de agregar_cheque (REC con cheques); quedan vinculados
+        a la caja y al recibo
+      - cheques_endosados: ids de cartera que salen con la OP (endosados al proveedor)
+    Si algo falla no queda nada escrito (ni se consume el número).
+    Devuelve {"numero", "cc_id", "caja_id", "cheques": [ids nuevos]}.
+    """
+    clientes = not str(tipo).lower().startswith("prov")
+    with transaccion():
+        if not numero and numerador:
+            numero = next_num(numerador)
+
+        caja_id = None
+        if con_caja:
+            agregar = cc_cli_agregar_con_caja if clientes else cc_prov_agregar_con_caja
+            cc_id, caja_id = agregar(
+                cuenta, fecha, entidad_id, doc, numero, concepto, medio, debe, haber,
+                cuenta_caja=cuenta_caja, cheque_id=None, obs=obs,
+            )
+        else:
+            agregar = cc_cli_agregar_mov if clientes else cc_prov_agregar_mov
+            cc_id = agregar(
+                cuenta, fecha, entidad_id, doc, numero, concepto, medio, debe, haber,
+                None, None, obs,
+            )
+
+        tag = f"REC {numero}" if str(doc).upper() == "REC" and numero else ""
+        nuevos = []
+        for ch in cheques_nuevos:
+            data = dict(ch)
+            data["mov_caja_id"] = caja_id
+            if tag and tag not in str(data.get("obs") or ""):
+                data["obs"] = " | ".join(x for x in (data.get("obs"), tag) if x)
+            # agregar_cheque vincula recibo_cheques desde el tag de obs
+            nuevos.append(agregar_cheque(data))
+
+        for cid in cheques_endosados:
+            actualizar_estado_cheque(int(cid), "endosado", fecha, proveedor_id=entidad_id)
+            if caja_id:
+                set_mov_caja_en_cheque(int(cid), caja_id)
+
+    return {"numero": numero, "cc_id": cc_id, "caja_id": caja_id, "cheques": nuevos}
+
+
+# -------------------- IMPORTACIÓN MASIVA DE CC --------------------
+
+IMPORT_CHUNK = 500  # filas por executemany
+
+
+def cc_importar_movs(
+    tipo: str, cuenta, filas, normalizar=None, chunk: int = IMPORT_CHUNK, progreso=None
+):
+    """
+    Importa movimientos de CC en bloque: UNA transacción, executemany por
+    tandas de 'chunk' filas (no carga todo el archivo en memoria).
+    tipo: "clientes" | "proveedores"; cuenta: 1 | 2 | "cuenta1" | "cuenta2"
+    filas: iterable de (fecha, entidad_id, doc, numero, concepto, medio, debe, haber, obs)
+           o de lo que sea, si se pasa normalizar(fila) -> esa tupla.
+    Una fila con error no corta la importación: se informa y se sigue.
+    progreso(filas_leidas) se llama después de cada tanda; si levanta una
+    excepción (ej. cancelación) se deshace TODA la importación.
+    Devuelve {"ok": n, "errores": [(nro_fila, mensaje), ...]} (filas desde 1).
+    """
+    prov = (tipo or "").lower().startswith("prov")
+    table = _prov_table(cuenta) if prov else _cli_table(cuenta)
+    col = "proveedor_id" if prov else "cliente_id"
+    sql = f"""
+        INSERT INTO {table}
+        (fecha, {col}, doc, numero, concepto, medio, debe, haber, caja_mov_id, cheque_id, obs)
+        VALUES (?,?,?,?,?,?,?,?,NULL,NULL,?)
+    """
+    chunk = max(1, int(chunk or IMPORT_CHUNK))
+    res = {"ok": 0, "errores": []}
+
+    def _preparar(fila):
+        if normalizar is not None:
+            fila = normalizar(fila)
+        fecha, ent, doc, numero, concepto, medio, debe, haber, obs = fila
+        if ent is None or str(ent).strip() == "":
+            raise ValueError("ID vacío")
+        try:
+            ent = int(str(ent).strip())
+        except Exception:
+            raise ValueError(f"ID inválido: {ent!r}")
+        return (
+            _fecha_iso(fecha), ent, doc, numero, concepto, medio,
+            float(debe or 0), float(haber or 0), obs,
+        )
+
+    def _volcar(cur, tanda):
+        # tanda: [(nro_fila, params), ...]
+        try:
+            with transaccion():
+                cur.executemany(sql, [p for _, p in tanda])
+            res["ok"] += len(tanda)
+        except sqlite3.Error:
+            # algo falló en la tanda: reintento fila por fila para aislar el error
+            for n, p in tanda:
+                try:
+                    cur.execute(sql, p)
+                    res["ok"] += 1
+                except sqlite3.Error as ex:
+                    res["errores"].append((n, str(ex)))
+
+    with transaccion() as conn:
+        cur = conn.cursor()
+        tanda = []
+        for n, fila in enumerate(filas, start=1):
+            try:
+                tanda.append((n, _preparar(fila)))
+            except Exception as ex:
+                res["errores"].append((n, str(ex)))
+                continue
+            if len(tanda) >= chunk:
+                _volcar(cur, tanda)
+                tanda = []
+                if progreso is not None:
+                    progreso(n)
+        if tanda:
+            _volcar(cur, tanda)
+    return res
+
+
+# -------------------- SALDOS DE TODAS LAS ENTIDADES --------------------
+
+
+def saldos_cc_todos(tipo: str):
+    """
+    Saldos C1/C2 de todos los clientes o proveedores en UNA sola consulta
+    (sobre cc_saldos), en vez de llamar cc_*_saldo() 2 veces por entidad.
+    tipo: "clientes" | "proveedores"
+    Devuelve [(id, nombre, saldo_c1, saldo_c2), ...] ordenado por id.
+    """
+    tipo = "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT e.id, e.razon_social,
+               COALESCE(s1.saldo, 0), COALESCE(s2.saldo, 0)
+        FROM {tipo} e
+        LEFT JOIN cc_saldos s1
+               ON s1.tipo = ? AND s1.entidad_id = e.id AND s1.cuenta = 1
+        LEFT JOIN cc_saldos s2
+               ON s2.tipo = ? AND s2.entidad_id = e.id AND s2.cuenta = 2
+        ORDER BY e.id
+    """,
+        (tipo, tipo),
+    )
+    rows = [(i, n, float(s1 or 0), float(s2 or 0)) for i, n, s1, s2 in cur.fetchall()]
+    conn.close()
+    return rows
+
+
+def cc_movs_de_entidades(tipo: str, cuenta, ids):
+    """
+    Movimientos CC de varias entidades en una sola consulta por el índice
+    entidad+fecha (para lotes, en vez de cc_*_listar por entidad).
+    Devuelve {entidad_id: [filas con las columnas de cc_cli_listar]}, fecha DESC.
+    """
+    tipo = "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+    n = 2 if str(cuenta).endswith("2") else 1
+    table, col = {
+        ("clientes", 1): ("cc_clientes_c1", "cliente_id"),
+        ("clientes", 2): ("cc_clientes_c2", "cliente_id"),
+        ("proveedores", 1): ("cc_proveedores_c1", "proveedor_id"),
+        ("proveedores", 2): ("cc_proveedores_c2", "proveedor_id"),
+    }[(tipo, n)]
+    out = {int(i): [] for i in ids}
+    if not out:
+        return out
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT 'C{n}' AS cta, id, fecha, {col}, doc, numero, concepto, medio, debe, haber
+        FROM {table}
+        WHERE {col} IN (SELECT value FROM json_each(?))
+        ORDER BY {col}, fecha DESC, id DESC
+    """,
+        (json.dumps(list(out)),),
+    )
+    for r in cur.fetchall():
+        out[r[3]].append(r)
+    conn.close()
+    return out
+
+
+def cc_saldos_verificar(reparar: bool = False, tolerancia: float = 0.005):
+    """
+    Compara cc_saldos contra la suma real de los movimientos y devuelve las
+    diferencias: [(tipo, entidad_id, cuenta, saldo_materializado, saldo_real), ...].
+    Con reparar=True, si hay diferencias reconstruye la tabla completa.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    try:
+        reales = _cc_saldos_calcular(cur)
+        mat = {
+            (t, e, c): (float(s or 0), int(m or 0))
+            for t, e, c, s, m in cur.execute(
+                "SELECT tipo, entidad_id, cuenta, saldo, movs FROM cc_saldos"
+            )
+        }
+        drift = []
+        for k in sorted(set(reales) | set(mat), key=lambda k: (k[0], k[2], str(k[1]))):
+            s_mat, m_mat = mat.get(k, (0.0, 0))
+            s_real, m_real = reales.get(k, (0.0, 0))
+            if abs(s_mat - s_real) > tolerancia or m_mat != m_real:
+                drift.append((k[0], k[1], k[2], s_mat, s_real))
+        if drift and reparar:
+            _cc_saldos_rebuild(cur)
+            conn.commit()
+        return drift
+    finally:
+        conn.close()
+
+
+def cc_saldos_reconstruir() -> int:
+    """Recalcula cc_saldos desde cero. Devuelve la cantidad de saldos cargados."""
+    conn = get_conn()
+    try:
+        n = _cc_saldos_rebuild(conn.cursor())
+        conn.commit()
+        return n
+    finally:
+        conn.close()
+
+
+# -------------------- REGISTRO DE CAMBIOS (cambios) --------------------
+# Lo escriben los triggers de _mig_007_cambios; acá sólo se consulta. El id es
+# la secuencia: cada consumidor guarda el último id que procesó y pide lo que
+# vino después (cambios_desde), que recorre sólo las filas nuevas del rowid.
+#   - directorio de clientes/proveedores (_ent_directorio): se invalida si
+#     hubo cambios en su tabla, aunque vengan de otro proceso o de SQL directo
+#   - backups (backup.respaldar): el modo auto no copia si no hubo cambios
+#   - la app: recarga sólo las pestañas cuyas tablas cambiaron
+
+
+def cambios_ultimo(conn=None) -> int:
+    """id del último cambio registrado (0 si no hay)."""
+    propia = conn is None
+    conn = conn or get_conn()
+    try:
+        return int(conn.execute("SELECT MAX(id) FROM cambios").fetchone()[0] or 0)
+    finally:
+        if propia:
+            conn.close()
+
+
+def cambios_desde(desde_id: int = 0) -> dict:
+    """
+    Resumen de lo registrado con id > desde_id:
+    {"ultimo": id, "tablas": {tabla: {"hasta": último id, "cambios": n}}}
+    ("ultimo" = desde_id si no hubo nada nuevo).
+    """
+    conn = get_conn()
+    try:
+        rows = conn.execute(
+            "SELECT tabla, MAX(id), COUNT(*) FROM cambios WHERE id > ? GROUP BY tabla",
+            (int(desde_id or 0),),
+        ).fetchall()
+    finally:
+        conn.close()
+    tablas = {t: {"hasta": h, "cambios": n} for t, h, n in rows}
+    ultimo = max((v["hasta"] for v in tablas.values()), default=int(desde_id or 0))
+    return {"ultimo": ultimo, "tablas": tablas}
+
+
+def cambios_listar(
+    tabla=None, fila=None, desde=None, hasta=None, op=None, desde_id: int = 0,
+    limite: int = 500,
+):
+    """
+    Cambios registrados, más viejos primero (hasta `limite`):
+    [{"id", "cuando", "tabla", "fila", "op", "datos": dict}, ...]
+    - tabla (+ fila): historial de una tabla / de una fila (índice tabla, fila)
+    - desde / hasta: fecha o fecha-hora sobre `cuando`; hasta con sólo la
+      fecha incluye todo ese día
+    - op: "I" | "U" | "D"; desde_id: para seguir leyendo de a tandas
+    """
+    where, params = ["id > ?"], [int(desde_id or 0)]
+    if tabla:
+        where.append("tabla = ?")
+        params.append(tabla)
+        if fila is not None:
+            where.append("fila = ?")
+            params.append(int(fila))
+    if desde:
+        where.append("cuando >= ?")
+        params.append(str(desde).replace(" ", "T"))
+    if hasta:
+        h = str(hasta).replace(" ", "T")
+        if len(h) == 10:
+            where.append("cuando < ?")
+            dia = datetime.strptime(_fecha_iso(h), "%Y-%m-%d") + timedelta(days=1)
+            params.append(dia.strftime("%Y-%m-%d"))
+        else:
+            where.append("cuando <= ?")
+            params.append(h)
+    if op:
+        where.append("op = ?")
+        params.append(op.upper()[:1])
+    conn = get_conn()
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT id, cuando, tabla, fila, op, datos FROM cambios
+            WHERE {" AND ".join(where)} ORDER BY id LIMIT ?
+        """,
+            (*params, int(limite)),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {"id": i, "cuando": c, "tabla": t, "fila": f, "op": o, "datos": json.loads(d or "{}")}
+        for i, c, t, f, o, d in rows
+    ]
+
+
+# -------------------- CIERRES DE PERÍODO (cc_cierres) --------------------
+
+
+def _mes_siguiente(periodo: str) -> str:
+    """'2024-12' -> '2025-01-01' (primer día del mes siguiente)."""
+    y, m = int(periodo[:4]), int(periodo[5:7])
+    y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return f"{y:04d}-{m:02d}-01"
+
+
+def cc_cerrar_periodos(hasta: str = None, mensual: bool = False, tipo: str = None) -> int:
+    """
+    Cierra la CC de TODAS las entidades al final del mes `hasta` ('YYYY-MM';
+    por defecto el mes anterior al actual) en una pasada por tabla.
+    mensual=True: deja además un cierre por cada mes con movimientos hasta
+    `hasta` (útil la primera vez, para bases con años de historia).
+    tipo: 'clientes' | 'proveedores' | None (ambos).
+    Devuelve la cantidad de cierres grabados.
+    """
+    if not hasta:
+        hoy = datetime.now()
+        hasta = f"{hoy.year - (hoy.month == 1):04d}-{(hoy.month - 2) % 12 + 1:02d}"
+    hasta = str(hasta)[:7]
+    corte_fin = _mes_siguiente(hasta)
+    ahora = datetime.now().isoformat(timespec="seconds")
+    filas = []
+    with transaccion() as conn:
+        cur = conn.cursor()
+        for table, tp, col, cuenta in _CC_TABLAS:
+            if (tipo and tp != tipo) or not _t_exists(cur, table):
+                continue
+            if not mensual:
+                for eid, saldo, movs in cur.execute(
+                    f"""
+                    SELECT {col}, SUM(COALESCE(debe,0) - COALESCE(haber,0)), COUNT(*)
+                    FROM {table} WHERE {col} IS NOT NULL AND fecha < ?
+                    GROUP BY {col}
+                """,
+                    (corte_fin,),
+                ):
+                    filas.append((tp, eid, cuenta, corte_fin, hasta, float(saldo or 0), movs, ahora))
+                continue
+            # acumulado por entidad a lo largo de los meses (ordenados)
+            prev, acum, cant = None, 0.0, 0
+            for eid, per, saldo, movs in cur.execute(
+                f"""
+                SELECT {col}, substr(fecha, 1, 7) AS per,
+                       SUM(COALESCE(debe,0) - COALESCE(haber,0)), COUNT(*)
+                FROM {table} WHERE {col} IS NOT NULL AND fecha < ?
+                GROUP BY {col}, per ORDER BY {col}, per
+            """,
+                (corte_fin,),
+            ):
+                if eid != prev:
+                    prev, acum, cant = eid, 0.0, 0
+                acum += float(saldo or 0)
+                cant += movs
+                if re.fullmatch(r"\d{4}-\d{2}", per or ""):  # vacías / no ISO sólo suman
+                    filas.append((tp, eid, cuenta, _mes_siguiente(per), per, acum, cant, ahora))
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO cc_cierres
+                (tipo, entidad_id, cuenta, corte, periodo, saldo, movs, cerrado)
+            VALUES (?,?,?,?,?,?,?,?)
+        """,
+            filas,
+        )
+    return len(filas)
+
+
+def cc_cierres_listar(tipo: str, entidad_id: int, cuenta=None):
+    """[(cuenta, periodo, corte, saldo, movs, cerrado)] de la entidad, del más nuevo al más viejo."""
+    tipo = "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+    sql = "SELECT cuenta, periodo, corte, saldo, movs, cerrado FROM cc_cierres WHERE tipo=? AND entidad_id=?"
+    params = [tipo, entidad_id]
+    if cuenta is not None:
+        sql += " AND cuenta=?"
+        params.append(_cuenta_n(cuenta))
+    conn = get_conn()
+    try:
+        return conn.execute(sql + " ORDER BY corte DESC, cuenta", params).fetchall()
+    finally:
+        conn.close()
+
+
+def _cc_movs_cola(conn, tipo: str, entidad_id: int, cuenta, basta):
+    """
+    Movimientos (id, fecha, doc, numero, concepto, medio, debe, haber; orden
+    ascendente) leídos desde el último cierre hacia atrás, de a un período:
+    para en cuanto basta(filas, desde) da True (desde = fecha de inicio de lo
+    leído; None = todo).
+    """
+    tabla, col, tipo, n = _cc_tabla_col(tipo, cuenta)
+    cortes = [
+        r[0]
+        for r in conn.execute(
+            "SELECT corte FROM cc_cierres WHERE tipo=? AND entidad_id=? AND cuenta=? ORDER BY corte DESC",
+            (tipo, entidad_id, n),
+        )
+    ]
+    q = f"""
+        SELECT id, fecha, doc, numero, concepto, medio,
+               COALESCE(debe,0) AS debe, COALESCE(haber,0) AS haber
+        FROM {tabla}
+        WHERE {col} = ?{{rango}}
+        ORDER BY fecha ASC, id ASC
+    """
+    filas, hasta = [], None
+    for desde in cortes + [None]:
+        rango, params = "", [entidad_id]
+        if desde is not None:
+            rango += " AND fecha >= ?"
+            params.append(desde)
+        if hasta is not None:
+            rango += " AND fecha < ?"
+            params.append(hasta)
+        filas = conn.execute(q.format(rango=rango), params).fetchall() + filas
+        if desde is None or basta(filas, desde):
+            break
+        hasta = desde
+    return filas
+
+
+# ================== Helpers extra / Resets ==================
+
+
+# -------------------- DIVISAS (USD) --------------------
+
+
+def agregar_divisa_compra(
+    fecha, usd, tc, pesos, cuenta=None, mov_caja_id=None, obs=None
+):
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO divisas (fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs)
+        VALUES (?, 'compra', ?, ?, ?, ?, ?, ?)
+    """,
+        (
+            _fecha_iso(fecha),
+            float(usd or 0),
+            float(tc or 0),
+            float(pesos or 0),
+            cuenta,
+            mov_caja_id,
+            obs,
+        ),
+    )
+    conn.commit()
+    rid = cur.lastrowid
+    conn.close()
+    return rid
+
+
+def listar_divisas(tipo=None):
+    conn = get_conn()
+    cur = conn.cursor()
+    if tipo:
+        cur.execute(
+            """
+            SELECT id, fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs
+            FROM divisas
+            WHERE LOWER(tipo)=LOWER(?)
+            ORDER BY fecha DESC, id DESC
+        """,
+            (tipo,),
+        )
+    else:
+        cur.execute(
+            """
+            SELECT id, fecha, tipo, usd, tc, pesos, cuenta, mov_caja_id, obs
+            FROM divisas
+            ORDER BY fecha DESC, id DESC
+        """
+        )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+# (OJO) No duplicar obtener_proveedor/obtener_cliente – ya definidos arriba con columnas explícitas
+
+
+def reset_tablas(que="todo"):
+    conn = get_conn()
+    cur = conn.cursor()
+    if que in ("todo", "caja"):
+        cur.execute("DELETE FROM movimientos_caja")
+    if que in ("todo", "cheques"):
+        cur.execute("DELETE FROM cheques")
+    if que in ("todo", "cc_clientes"):
+        cur.execute("DELETE FROM cc_clientes_c1")
+        cur.execute("DELETE FROM cc_clientes_c2")
+    if que in ("todo", "cc_proveedores"):
+        cur.execute("DELETE FROM cc_proveedores_c1")
+        cur.execute("DELETE FROM cc_proveedores_c2")
+    conn.commit()
+    conn.close()
+
+
+def reset_cc_cliente(cliente_id: int, cuenta: str = "ambas") -> int:
+    """
+    Borra los movimientos de CC del cliente indicado.
+    cuenta: 'cuenta1' | 'cuenta2' | 'ambas' (default)
+    Devuelve la cantidad de filas borradas.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    total = 0
+    c = (cuenta or "ambas").strip().lower()
+    try:
+        if c in ("cuenta1", "1"):
+            cur.execute("DELETE FROM cc_clientes_c1 WHERE cliente_id=?", (cliente_id,))
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        elif c in ("cuenta2", "2"):
+            cur.execute("DELETE FROM cc_clientes_c2 WHERE cliente_id=?", (cliente_id,))
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        else:
+            cur.execute("DELETE FROM cc_clientes_c1 WHERE cliente_id=?", (cliente_id,))
+            total += cur.rowcount if cur.rowcount != -1 else 0
+            cur.execute("DELETE FROM cc_clientes_c2 WHERE cliente_id=?", (cliente_id,))
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        conn.commit()
+        return int(total)
+    finally:
+        conn.close()
+
+
+def reset_cc_proveedor(proveedor_id: int, cuenta: str = "ambas") -> int:
+    """
+    Borra los movimientos de CC del proveedor indicado.
+    cuenta: 'cuenta1' | 'cuenta2' | 'ambas' (default)
+    Devuelve la cantidad de filas borradas.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    total = 0
+    c = (cuenta or "ambas").strip().lower()
+    try:
+        if c in ("cuenta1", "1"):
+            cur.execute(
+                "DELETE FROM cc_proveedores_c1 WHERE proveedor_id=?", (proveedor_id,)
+            )
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        elif c in ("cuenta2", "2"):
+            cur.execute(
+                "DELETE FROM cc_proveedores_c2 WHERE proveedor_id=?", (proveedor_id,)
+            )
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        else:
+            cur.execute(
+                "DELETE FROM cc_proveedores_c1 WHERE proveedor_id=?", (proveedor_id,)
+            )
+            total += cur.rowcount if cur.rowcount != -1 else 0
+            cur.execute(
+                "DELETE FROM cc_proveedores_c2 WHERE proveedor_id=?", (proveedor_id,)
+            )
+            total += cur.rowcount if cur.rowcount != -1 else 0
+        conn.commit()
+        return int(total)
+    finally:
+        conn.close()
+
+
+# ====== REPORTES CC: OBTENER MOVS, CORTAR POR SALDO Y PDF ======
+
+
+def ensure_folder(path: str):
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_cliente_nombre(conn, cliente_id: int) -> str:
+    try:
+        row = conn.execute(
+            "SELECT razon_social FROM clientes WHERE id = ?", (cliente_id,)
+        ).fetchone()
+        return row[0] if row and row[0] else f"Cliente {cliente_id}"
+    except Exception:
+        return f"Cliente {cliente_id}"
+
+
+def get_proveedor_nombre(conn, proveedor_id: int) -> str:
+    try:
+        row = conn.execute(
+            "SELECT razon_social FROM proveedores WHERE id = ?", (proveedor_id,)
+        ).fetchone()
+        return row[0] if row and row[0] else f"Proveedor {proveedor_id}"
+    except Exception:
+        return f"Proveedor {proveedor_id}"
+
+
+def get_saldo_actual_cc_cliente(conn, cliente_id: int, cuenta: int) -> float:
+    return _saldo_mat(conn.cursor(), "clientes", cliente_id, _cuenta_n(cuenta))
+
+
+def get_saldo_actual_cc_proveedor(conn, proveedor_id: int, cuenta: int) -> float:
+    return _saldo_mat(conn.cursor(), "proveedores", proveedor_id, _cuenta_n(cuenta))
+
+
+def slice_movs_desde_debe_que_cubre_saldo(movs, saldo_objetivo: float):
+    """
+    movs esperado: lista de tuplas con (id, fecha, doc, numero, concepto, medio, debe, haber)
+    Devuelve sublista desde el primer DEBE acumulado que cubre 'saldo_objetivo' hasta el final.
+    """
+    if not movs:
+        return []
+
+    if saldo_objetivo <= 0:
+        # Si no hay saldo, devolvemos vacío o solo el día actual como contexto
+        hoy = datetime.now().strftime("%Y-%m-%d")
+        tail = [m for m in movs if (str(m[1]) or "").startswith(hoy)]
+        return tail if tail else []
+
+    acumulado = 0.0
+    for idx in range(len(movs) - 1, -1, -1):
+        debe = float(movs[idx][6] or 0)
+        acumulado += debe
+        if acumulado + 1e-9 >= saldo_objetivo:
+            return movs[idx:]
+    return movs
+
+
+def _cubre_saldo(saldo_objetivo: float):
+    """Criterio de _cc_movs_cola para slice_movs_desde_debe_que_cubre_saldo."""
+    hoy = datetime.now().strftime("%Y-%m-%d")
+
+    def basta(movs, desde):
+        if saldo_objetivo <= 0:
+            return desde <= hoy  # sólo hacen falta los de hoy
+        return sum(float(m[6] or 0) for m in movs) + 1e-9 >= saldo_objetivo
+
+    return basta
+
+
+def _pdf_table_story_for_movs(movs):
+    # Convierte filas CC en data para reportlab (con saldo parcial)
+    data = [["Fecha", "Comprobante", "Detalle", "Debe", "Haber", "Saldo"]]
+    saldo_parcial = 0.0
+    for _id, fecha, doc, numero, concepto, medio, debe, haber in movs:
+        saldo_parcial += float(debe or 0) - float(haber or 0)
+        comp = f"{doc.upper()} {numero or ''}".strip()
+        data.append(
+            [
+                _fmt_dmy(fecha) or "",
+                comp,
+                str(concepto or ""),
+                f"{float(debe or 0):,.2f}",
+                f"{float(haber or 0):,.2f}",
+                f"{saldo_parcial:,.2f}",
+            ]
+        )
+
+    return data
+
+
+def crear_pdf_cc_cliente(
+    conn, cliente_id: int, cuenta: int = 1, output_base: str = "reportes/cc_clientes"
+) -> str:
+    pdf_render.rl()  # falla antes de consultar si no está reportlab
+
+    saldo = get_saldo_actual_cc_cliente(conn, cliente_id, cuenta)
+    # sólo la cola que hace falta, leída desde el último cierre hacia atrás
+    movs = _cc_movs_cola(conn, "clientes", cliente_id, cuenta, _cubre_saldo(saldo))
+    sub = slice_movs_desde_debe_que_cubre_saldo(movs, saldo)
+
+    ensure_folder(output_base)
+    fecha_str = datetime.now().strftime("%Y%m%d")
+    filename = os.path.join(output_base, f"{cliente_id}-{cuenta}-{fecha_str}.pdf")
+
+    tot_debe = sum(float(m[6] or 0) for m in sub)
+    tot_haber = sum(float(m[7] or 0) for m in sub)
+    pdf_render.resumen_cc_entidad(
+        filename,
+        "Resumen Cuenta Corriente (Cliente)",
+        [
+            f"<b>Cliente ID:</b> {cliente_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
+            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+            f"<b>Saldo actual:</b> {saldo:,.2f}",
+        ],
+        _pdf_table_story_for_movs(sub),
+        f"<b>Total Debe (período):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
+        f"<b>Total Haber (período):</b> {tot_haber:,.2f}",
+    )
+    return filename
+
+
+def crear_pdf_cc_proveedor(
+    conn,
+    proveedor_id: int,
+    cuenta: int = 1,
+    output_base: str = "reportes/cc_proveedores",
+) -> str:
+    pdf_render.rl()  # falla antes de consultar si no está reportlab
+
+    saldo = get_saldo_actual_cc_proveedor(conn, proveedor_id, cuenta)
+    movs = _cc_movs_cola(conn, "proveedores", proveedor_id, cuenta, _cubre_saldo(saldo))
+    sub = slice_movs_desde_debe_que_cubre_saldo(movs, saldo)
+
+    ensure_folder(output_base)
+    fecha_str = datetime.now().strftime("%Y%m%d")
+    filename = os.path.join(output_base, f"{proveedor_id}-{cuenta}-{fecha_str}.pdf")
+
+    tot_debe = sum(float(m[6] or 0) for m in sub)
+    tot_haber = sum(float(m[7] or 0) for m in sub)
+    pdf_render.resumen_cc_entidad(
+        filename,
+        "Resumen Cuenta Corriente (Proveedor)",
+        [
+            f"<b>Proveedor ID:</b> {proveedor_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
+            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+            f"<b>Saldo actual:</b> {saldo:,.2f}",
+        ],
+        _pdf_table_story_for_movs(sub),
+        f"<b>Total Debe (período):</b> {tot_debe:,.2f} &nbsp;&nbsp; "
+        f"<b>Total Haber (período):</b> {tot_haber:,.2f}",
+    )
+    return filename
+
+
+def _cc_tabla_col(tipo: str, cuenta):
+    n = _cuenta_n(cuenta)
+    tipo = "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+    return next((t, c) for t, tp, c, k in _CC_TABLAS if tp == tipo and k == n) + (tipo, n)
+
+
+def _cc_suma(cur, tabla, col, entidad_id, desde=None, hasta=None) -> float:
+    """SUM(debe - haber) de fecha en [desde, hasta) sobre ix_<cc>_ent_fecha."""
+    sql = f"SELECT COALESCE(SUM(COALESCE(debe,0) - COALESCE(haber,0)), 0) FROM {tabla} WHERE {col}=?"
+    params = [entidad_id]
+    if desde is not None:
+        sql += " AND fecha >= ?"
+        params.append(desde)
+    if hasta is not None:
+        sql += " AND fecha < ?"
+        params.append(hasta)
+    return float(cur.execute(sql, params).fetchone()[0] or 0)
+
+
+def _dias(f):
+    try:
+        return datetime.strptime(str(f)[:10], "%Y-%m-%d").toordinal()
+    except Exception:
+        return None
+
+
+def cc_saldo_anterior(conn, tipo: str, entidad_id: int, cuenta, fecha) -> float:
+    """
+    Saldo de la cuenta al comienzo de `fecha` (movimientos con fecha < fecha).
+    Arranca del punto conocido más cercano a la fecha y suma (o descuenta)
+    sólo el tramo entre ese punto y la fecha, con una suma sobre
+    ix_<cc>_ent_fecha (cubre debe/haber). Puntos: el inicio de la cuenta
+    (saldo 0), el cierre de período anterior y el siguiente (cc_cierres) y
+    el saldo actual materializado (cc_saldos). Así un resumen reciente de una
+    cuenta vieja sólo lee los movimientos recientes.
+    """
+    tabla, col, tipo, n = _cc_tabla_col(tipo, cuenta)
+    if not fecha:
+        return 0.0
+    fecha = _fecha_iso(fecha)
+    cur = conn.cursor()
+    # MIN y MAX por separado: así cada uno es un salto en el índice, no un recorrido
+    # (las fechas vacías ordenan primero y cuentan como anteriores a todo)
+    lo, hi = (
+        cur.execute(
+            f"SELECT {f}(fecha) FROM {tabla} WHERE {col}=? AND fecha > ''", (entidad_id,)
+        ).fetchone()[0]
+        for f in ("MIN", "MAX")
+    )
+    clave = (tipo, entidad_id, n, fecha)
+    ant = cur.execute(
+        "SELECT corte, saldo FROM cc_cierres WHERE tipo=? AND entidad_id=? AND cuenta=?"
+        " AND corte <= ? ORDER BY corte DESC LIMIT 1",
+        clave,
+    ).fetchone()
+    sig = cur.execute(
+        "SELECT corte, saldo FROM cc_cierres WHERE tipo=? AND entidad_id=? AND cuenta=?"
+        " AND corte > ? ORDER BY corte LIMIT 1",
+        clave,
+    ).fetchone()
+
+    # (fecha del punto, cómo calcular desde ahí)
+    puntos = [
+        (
+            ant[0] if ant else lo,
+            (lambda: float(ant[1]) + _cc_suma(cur, tabla, col, entidad_id, ant[0], fecha))
+            if ant
+            else (lambda: _cc_suma(cur, tabla, col, entidad_id, None, fecha)),
+        ),
+        (
+            hi,
+            lambda: _saldo_mat(cur, tipo, entidad_id, n)
+            - _cc_suma(cur, tabla, col, entidad_id, fecha, None),
+        ),
+    ]
+    if sig:
+        puntos.append(
+            (sig[0], lambda: float(sig[1]) - _cc_suma(cur, tabla, col, entidad_id, fecha, sig[0]))
+        )
+    d_f = _dias(fecha)
+    if d_f is None:
+        return puntos[0][1]()
+
+    def _dist(p):
+        d = _dias(p[0])
+        return abs(d - d_f) if d is not None else float("inf")
+
+    return min(puntos, key=_dist)[1]()
+
+
+def cc_movs_rango(conn, tipo: str, entidad_id: int, cuenta, desde=None, hasta=None):
+    """
+    Cursor con los movimientos del rango (inclusive, fechas en cualquier
+    formato aceptado por _fecha_iso) en orden (fecha, id):
+    (id, fecha, doc, numero, concepto, medio, debe, haber). Se itera sin
+    cargar todo en memoria.
+    """
+    tabla, col, _tipo, _n = _cc_tabla_col(tipo, cuenta)
+    rango, rp = _rango_fecha_sql(desde, hasta)
+    return conn.execute(
+        f"""
+        SELECT id, fecha, doc, numero, concepto, medio,
+               COALESCE(debe,0) AS debe, COALESCE(haber,0) AS haber
+        FROM {tabla}
+        WHERE {col} = ?{rango}
+        ORDER BY fecha ASC, id ASC
+        """,
+        (entidad_id, *rp),
+    )
+
+
+def _cc_rango_stream(conn, tipo: str, ent_id: int, cuenta: int, fecha_desde=None, fecha_hasta=None):
+    """
+    (saldo_anterior, filas) para el histórico por fechas de una cuenta: el
+    saldo anterior sale de cc_saldo_anterior y las filas del rango del cursor
+    de cc_movs_rango, de a una, como (fecha d/m/a, comprobante, detalle, debe, haber).
+    """
+    saldo_ant = cc_saldo_anterior(conn, tipo, ent_id, cuenta, fecha_desde)
+    cur = cc_movs_rango(conn, tipo, ent_id, cuenta, fecha_desde, fecha_hasta)
+
+    def filas():
+        for _id, fecha, doc, numero, concepto, _medio, debe, haber in cur:
+            comp = f"{(doc or '').upper()} {numero or ''}".strip()
+            yield (_fmt_dmy(fecha) or "", comp, str(concepto or ""), debe, haber)
+
+    return saldo_ant, filas()
+
+
+def _crear_pdf_cc_rango(conn, tipo, ent_id, cuenta, fecha_desde, fecha_hasta, output_base):
+    pdf_render.rl()  # falla antes de consultar si no está reportlab
+    fecha_desde = _fecha_iso(fecha_desde) if fecha_desde else None
+    fecha_hasta = _fecha_iso(fecha_hasta) if fecha_hasta else None
+
+    ensure_folder(output_base)
+    fecha_str = datetime.now().strftime("%Y%m%d")
+    suf_rango = f"{(fecha_desde or 'ini').replace('-', '')}-{(fecha_hasta or 'hoy').replace('-', '')}"
+    filename = os.path.join(
+        output_base, f"{ent_id}-{cuenta}-hist-{suf_rango}-{fecha_str}.pdf"
+    )
+
+    rotulo = "Cliente" if tipo == "clientes" else "Proveedor"
+    saldo_ant, filas = _cc_rango_stream(conn, tipo, ent_id, cuenta, fecha_desde, fecha_hasta)
+    pdf_render.resumen_cc_rango(
+        filename,
+        f"Resumen CC ({rotulo}) — Histórico por fechas",
+        [
+            f"<b>{rotulo} ID:</b> {ent_id} &nbsp;&nbsp; <b>Cuenta:</b> {cuenta}",
+            f"<b>Rango:</b> {fecha_desde or '—'} a {fecha_hasta or '—'}",
+            f"<b>Generado:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+        ],
+        filas,
+        saldo_ant,
+        pie=lambda d, h: (
+            f"<b>Total Debe (rango):</b> {d:,.2f} &nbsp;&nbsp; "
+            f"<b>Total Haber (rango):</b> {h:,.2f}"
+        ),
+    )
+    return filename
+
+
+def crear_pdf_cc_cliente_rango(
+    conn,
+    cliente_id: int,
+    cuenta: int = 1,
+    fecha_desde: str = None,
+    fecha_hasta: str = None,
+    output_base: str = "reportes/cc_clientes",
+) -> str:
+    return _crear_pdf_cc_rango(
+        conn, "clientes", cliente_id, cuenta, fecha_desde, fecha_hasta, output_base
+    )
+
+
+def crear_pdf_cc_proveedor_rango(
+    conn,
+    proveedor_id: int,
+    cuenta: int = 1,
+    fecha_desde: str = None,
+    fecha_hasta: str = None,
+    output_base: str = "reportes/cc_proveedores",
+) -> str:
+    return _crear_pdf_cc_rango(
+        conn, "proveedores", proveedor_id, cuenta, fecha_desde, fecha_hasta, output_base
+    )
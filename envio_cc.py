@@ -0,0 +1,231 @@
+# envio_cc.py — Resúmenes de CC (PDF) de una entidad o de todas en lote
+# -------------------------------------------------
+# - Selección de renglones del resumen (antes funciones internas de Enviar CC):
+#     filas_pdf_clientes: deudor -> DEBE más viejos hasta cubrir el saldo;
+#                         acreedor -> desde el último REC.
+#     filas_pdf_generico: |saldo| cubierto con los movimientos más recientes.
+# - enviar_cc_lote(): todos los clientes/proveedores con saldo != 0.
+#     * entidades y saldos salen de UNA consulta (db.saldos_cc_todos)
+#     * movimientos de cada cuenta en una consulta por tabla
+#     * los PDFs se arman en un pool de procesos (reportlab usa mucha CPU);
+#       cada proceso arma sus estilos una vez (pdf_render) y los reusa
+#     * manifest JSON en la carpeta con firma y tiempo de cada archivo; en la
+#       próxima corrida se saltean las cuentas cuyo resumen no cambió
+# - Los procesos del pool sólo reciben datos ya armados: no tocan la base.
+# -------------------------------------------------
+
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime
+
+import db_access as db
+import pdf_render
+
+MANIFEST = "manifest_cc_{tipo}.json"
+
+
+def _fila_pdf(r):
+    fecha = r[2] or ""
+    docnum = ((r[4] or "") + (" " + (r[5] or "") if r[5] else "")).strip()
+    return (fecha, docnum, r[6] or "", float(r[8] or 0.0), float(r[9] or 0.0))
+
+
+def filas_pdf_generico(movs, saldo):
+    """Cubre |saldo| con los últimos movimientos (más recientes hacia atrás)."""
+    target = abs(float(saldo or 0))
+    if target == 0:
+        sel = []
+    else:
+        ordered = sorted(movs, key=lambda r: ((r[2] or ""), (r[1] or 0)), reverse=True)
+        acc = 0.0
+        sel = []
+        for r in ordered:
+            debe = float(r[8] or 0.0)
+            haber = float(r[9] or 0.0)
+            amt = max(debe, haber) or abs(haber - debe)
+            sel.append(r)
+            acc += amt
+            if acc >= target:
+                break
+        sel = list(reversed(sel)) if sel else list(reversed(ordered))
+    return [_fila_pdf(r) for r in sel]
+
+
+def filas_pdf_clientes(movs, saldo):
+    """
+    Deudor (>0): desde los más antiguos sumando SOLO los DEBE hasta cubrir el saldo.
+    Acreedor (<0): desde el último REC hasta hoy. Siempre en orden cronológico.
+    """
+    if abs(saldo) < 0.0001:
+        return []
+    movs_ord = sorted(movs, key=lambda r: ((r[2] or ""), (r[1] or 0)))
+    if saldo > 0:
+        acc = 0.0
+        sel = []
+        for r in movs_ord:
+            debe = float(r[8] or 0.0)
+            if debe > 0:
+                sel.append(r)
+                acc += debe
+                if acc >= saldo:
+                    break
+        if not sel:
+            sel = movs_ord
+    else:
+        idx = None
+        for i in range(len(movs_ord) - 1, -1, -1):
+            if (movs_ord[i][4] or "").strip().upper() == "REC":
+                idx = i
+                break
+        sel = movs_ord[idx:] if idx is not None else movs_ord
+    return [_fila_pdf(r) for r in sel]
+
+
+def emitir_resumen_cc_pdf(path, titulo, encabezado, cuenta_label, filas, saldo):
+    """PDF de resumen de cuenta con reportlab. filas: (fecha, docnum, concepto, debe, haber)."""
+    pdf_render.resumen_cc(path, titulo, encabezado, cuenta_label, filas, saldo)
+
+
+def encabezado_entidad(row, ent_name, cuenta_label):
+    """Encabezado del resumen desde la fila de clientes/proveedores (listar_* / obtener_*)."""
+    if cuenta_label != "Cuenta 1":
+        return {"Entidad": ent_name}
+    cuit = (row[4] or "") if row else ""
+    dir_ = (
+        f"{(row[10] or '')} {(row[11] or '')}, {(row[13] or '')}".strip().strip(",")
+        if row
+        else ""
+    )
+    return {"Entidad": ent_name, "CUIT/DNI": cuit, "Dirección": dir_}
+
+
+def nombre_archivo(cuenta_label, ent_id, hoy):
+    return f"resumen cc {'c1' if cuenta_label == 'Cuenta 1' else 'c2'} {ent_id} {hoy}.pdf"
+
+
+# ----------------------------- Lote -----------------------------
+
+
+def _render(trabajo):
+    """Corre en el pool: arma un PDF y devuelve (clave, path, segundos, error)."""
+    clave, path, titulo, encabezado, cuenta_label, filas, saldo = trabajo
+    t0 = time.perf_counter()
+    try:
+        emitir_resumen_cc_pdf(path, titulo, encabezado, cuenta_label, filas, saldo)
+        return clave, path, time.perf_counter() - t0, None
+    except Exception as e:
+        return clave, path, time.perf_counter() - t0, f"{type(e).__name__}: {e}"
+
+
+def _firma(titulo, encabezado, cuenta_label, filas, saldo):
+    """Huella de lo que se imprime: si no cambió, el PDF anterior sigue valiendo."""
+    base = json.dumps(
+        [titulo, encabezado, cuenta_label, filas, round(float(saldo or 0), 2)],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+def leer_manifest(carpeta, tipo):
+    try:
+        with open(os.path.join(carpeta, MANIFEST.format(tipo=tipo)), encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def enviar_cc_lote(tipo, carpeta, procesos=None, forzar=False, progreso=None):
+    """
+    Resúmenes de CC de TODAS las entidades del tipo con saldo != 0 en `carpeta`.
+    - procesos: tamaño del pool (None = cantidad de CPUs; 1 = sin pool)
+    - forzar: rearmar aunque el resumen no haya cambiado desde la última corrida
+    - progreso(hecho, total, texto): opcional; si lanza (p.ej. tareas.Cancelada) corta
+    Devuelve el manifest: {"tipo", "generado", "segundos", "archivos": {clave: {...}}}
+    con clave "<id>-c1" / "<id>-c2" y por archivo: archivo, firma, saldo, filas,
+    segundos, estado ("generado" | "sin cambios" | "error") y error.
+    """
+    tipo = "proveedores" if (tipo or "").lower().startswith("prov") else "clientes"
+    t0 = time.perf_counter()
+    hoy = date.today().strftime("%Y-%m-%d")
+    os.makedirs(carpeta, exist_ok=True)
+
+    previo = leer_manifest(carpeta, tipo).get("archivos", {})
+    saldos = [s for s in db.saldos_cc_todos(tipo) if abs(s[2]) > 0.0001 or abs(s[3]) > 0.0001]
+    filas_ent = {
+        r[0]: r
+        for r in (db.listar_clientes() if tipo == "clientes" else db.listar_proveedores())
+    }
+    elegir = filas_pdf_clientes if tipo == "clientes" else filas_pdf_generico
+
+    archivos, trabajos = {}, []
+    for n, label in ((1, "Cuenta 1"), (2, "Cuenta 2")):
+        con_saldo = [s for s in saldos if abs(s[1 + n]) > 0.0001]
+        movs = db.cc_movs_de_entidades(tipo, n, [s[0] for s in con_saldo])
+        for ent_id, ent_name, *ss in con_saldo:
+            saldo = ss[n - 1]
+            clave = f"{ent_id}-c{n}"
+            titulo = f"Resumen de cuenta {ent_id} - {ent_name}"
+            encabezado = encabezado_entidad(filas_ent.get(ent_id), ent_name, label)
+            filas = elegir(movs.get(ent_id, []), saldo)
+            firma = _firma(titulo, encabezado, label, filas, saldo)
+            ant = previo.get(clave) or {}
+            info = {"archivo": ant.get("archivo"), "firma": firma, "saldo": saldo,
+                    "filas": len(filas), "segundos": 0.0, "estado": "sin cambios",
+                    "error": None}
+            if (
+                not forzar
+                and ant.get("firma") == firma
+                and ant.get("estado") != "error"
+                and ant.get("archivo")
+                and os.path.exists(os.path.join(carpeta, ant["archivo"]))
+            ):
+                archivos[clave] = info
+                continue
+            info["archivo"] = nombre_archivo(label, ent_id, hoy)
+            archivos[clave] = info
+            path = os.path.join(carpeta, info["archivo"])
+            trabajos.append((clave, path, titulo, encabezado, label, filas, saldo))
+
+    total = len(trabajos)
+    if progreso:
+        progreso(0, total, f"{len(archivos) - total} sin cambios")
+
+    def _anotar(res, hecho):
+        clave, _path, seg, err = res
+        archivos[clave].update(
+            segundos=round(seg, 4), estado="error" if err else "generado", error=err
+        )
+        if progreso:
+            progreso(hecho, total, clave)
+
+    if procesos == 1 or total <= 1:
+        for i, t in enumerate(trabajos, start=1):
+            _anotar(_render(t), i)
+    else:
+        # import diferido: multiprocessing pesa y sólo hace falta en el lote
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=procesos) as ex:
+            futs = [ex.submit(_render, t) for t in trabajos]
+            try:
+                for i, fut in enumerate(as_completed(futs), start=1):
+                    _anotar(fut.result(), i)
+            except BaseException:
+                for f in futs:
+                    f.cancel()
+                raise
+
+    manifest = {
+        "tipo": tipo,
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "segundos": round(time.perf_counter() - t0, 3),
+        "archivos": archivos,
+    }
+    tmp = os.path.join(carpeta, MANIFEST.format(tipo=tipo) + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(carpeta, MANIFEST.format(tipo=tipo)))
+    return manifest
@@ -0,0 +1,277 @@
+# gestion_textil.py — Línea de comandos (sin interfaz) sobre db_access y pdf_render
+# -------------------------------------------------
+# Uso:  python -m gestion_textil [--db RUTA] [--json] [--jobs N] COMANDO ...
+#   importar  clientes|proveedores 1|2 ARCHIVO.csv [...]   movimientos de CC
+#   resumenes clientes|proveedores|todos CARPETA [--forzar] PDFs de CC en lote
+#   saldos    clientes|proveedores|todos [--salida F] [--formato csv|json]
+#   backup    CARPETA [--modo auto|completo|diferencial] [--comprimir gzip|zstd]
+#             [--vacuum] [--diarios N] [--mensuales M]      copia verificada (backup.py)
+#   restaurar CARPETA DESTINO [--hasta FECHA] [--archivo X] [--forzar]
+# - --jobs N: procesos en paralelo. En 'resumenes' es el pool de PDFs; en
+#   'importar' se leen/normalizan los CSV en paralelo pero se graban de a uno
+#   (SQLite admite un solo escritor: escribir en paralelo sólo sumaría esperas).
+# - --json: al terminar imprime UNA línea JSON con comando, ok, segundos,
+#   fases {nombre: segundos} y resultado (para scripts / tareas programadas).
+#   Sin --json se imprime un resumen legible.
+# - Código de salida: 0 si todo salió bien, 1 si hubo errores.
+# -------------------------------------------------
+
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+import backup
+import db_access as db
+import envio_cc
+import importar_cc
+
+TIPOS = ("clientes", "proveedores")
+
+
+def _tipos(valor):
+    return TIPOS if valor == "todos" else (valor,)
+
+
+class _Fases:
+    """Cronómetro por fase: with fases("nombre"): ... (acumula si se repite)."""
+
+    def __init__(self):
+        self.tiempos = {}
+
+    @contextmanager
+    def __call__(self, nombre):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tiempos[nombre] = round(
+                self.tiempos.get(nombre, 0.0) + time.perf_counter() - t0, 4
+            )
+
+
+# ----------------------------- importar -----------------------------
+
+
+def _leer_normalizado(path):
+    """Corre en el pool: CSV -> lista de tuplas listas para db.cc_importar_movs."""
+    return [importar_cc.normalizar(r) for r in importar_cc.leer_csv(path)]
+
+
+def cmd_importar(a, fases):
+    archivos = {}
+    ok = True
+    if a.jobs > 1 and len(a.archivos) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with fases("lectura"):
+            with ProcessPoolExecutor(max_workers=a.jobs) as ex:
+                filas = dict(zip(a.archivos, ex.map(_leer_normalizado, a.archivos)))
+    else:
+        filas = None
+    for path in a.archivos:
+        with fases("grabacion"):
+            try:
+                if filas is not None:
+                    res = db.cc_importar_movs(a.tipo, a.cuenta, filas[path])
+                else:
+                    res = importar_cc.importar_csv(a.tipo, a.cuenta, path)
+                archivos[path] = {
+                    "ok": res["ok"],
+                    "errores": [[n, m] for n, m in res["errores"]],
+                }
+                ok = ok and not res["errores"]
+            except Exception as e:
+                archivos[path] = {"ok": 0, "errores": [[0, f"{type(e).__name__}: {e}"]]}
+                ok = False
+    return ok, {"archivos": archivos}
+
+
+def _texto_importar(res):
+    for path, r in res["archivos"].items():
+        print(f"{path}: {r['ok']} OK, {len(r['errores'])} con error")
+        for n, m in r["errores"][:5]:
+            print(f"  fila {n}: {m}")
+
+
+# ----------------------------- resumenes -----------------------------
+
+
+def cmd_resumenes(a, fases):
+    out = {}
+    ok = True
+    for tipo in _tipos(a.tipo):
+        with fases(tipo):
+            man = envio_cc.enviar_cc_lote(
+                tipo, a.carpeta, procesos=a.jobs, forzar=a.forzar
+            )
+        cuenta = {"generado": 0, "sin cambios": 0, "error": 0}
+        for info in man["archivos"].values():
+            cuenta[info["estado"]] = cuenta.get(info["estado"], 0) + 1
+        errores = {k: v["error"] for k, v in man["archivos"].items() if v["error"]}
+        ok = ok and not errores
+        out[tipo] = dict(cuenta, segundos=man["segundos"], errores=errores)
+    return ok, out
+
+
+def _texto_resumenes(res):
+    for tipo, r in res.items():
+        print(f"{tipo}: {r['generado']} generados, {r['sin cambios']} sin cambios, "
+              f"{r['error']} con error ({r['segundos']} s)")
+        for clave, err in list(r["errores"].items())[:5]:
+            print(f"  {clave}: {err}")
+
+
+# ----------------------------- saldos -----------------------------
+
+
+def cmd_saldos(a, fases):
+    filas = []
+    with fases("consulta"):
+        for tipo in _tipos(a.tipo):
+            filas += [(tipo, i, n, s1, s2) for i, n, s1, s2 in db.saldos_cc_todos(tipo)]
+    dicts = [
+        {"tipo": t, "id": i, "nombre": n, "saldo_c1": s1, "saldo_c2": s2}
+        for t, i, n, s1, s2 in filas
+    ]
+    if a.json and not a.salida:
+        # con --json sin archivo, los saldos van dentro de la línea JSON
+        return True, {"entidades": len(filas), "saldos": dicts}
+    with fases("escritura"):
+        fh = open(a.salida, "w", encoding="utf-8", newline="") if a.salida else sys.stdout
+        try:
+            if a.formato == "json":
+                json.dump(dicts, fh, ensure_ascii=False)
+                fh.write("\n")
+            else:
+                w = csv.writer(fh)
+                w.writerow(["tipo", "id", "nombre", "saldo_c1", "saldo_c2"])
+                for t, i, n, s1, s2 in filas:
+                    w.writerow([t, i, n, f"{s1:.2f}", f"{s2:.2f}"])
+        finally:
+            if fh is not sys.stdout:
+                fh.close()
+    return True, {"entidades": len(filas), "salida": a.salida or "-"}
+
+
+# ----------------------------- backup -----------------------------
+
+
+def cmd_backup(a, fases):
+    with fases("copia"):
+        res = backup.respaldar(
+            a.carpeta, modo=a.modo, comprimir=a.comprimir, vacuum=a.vacuum
+        )
+    if a.diarios is not None or a.mensuales is not None:
+        with fases("retencion"):
+            res["retencion"] = backup.aplicar_retencion(
+                a.carpeta,
+                diarios=7 if a.diarios is None else a.diarios,
+                mensuales=12 if a.mensuales is None else a.mensuales,
+            )
+    return True, res
+
+
+def cmd_restaurar(a, fases):
+    with fases("restauracion"):
+        res = backup.restaurar(
+            a.carpeta, a.destino, hasta=a.hasta, archivo=a.archivo, forzar=a.forzar
+        )
+    return True, res
+
+
+def _texto_backup(res):
+    print(f"Backup {res['tipo']}: {res['archivo']} ({res['bytes'] / 1024:.0f} KB)")
+    for arch in (res.get("retencion") or {}).get("borrados", []):
+        print(f"  borrado por retención: {arch}")
+
+
+# ----------------------------- main -----------------------------
+
+
+def _parser():
+    ap = argparse.ArgumentParser(
+        prog="gestion_textil", description="Gestión textil sin interfaz"
+    )
+    ap.add_argument("--db", default=None, help="ruta de la base (por defecto gestion_textil.db)")
+    ap.add_argument("--json", action="store_true", help="salida en una línea JSON con tiempos")
+    ap.add_argument("--jobs", type=int, default=1, help="procesos en paralelo (por defecto 1)")
+    ap.set_defaults(sin_base=False)
+    sub = ap.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("importar", help="importa movimientos de CC desde CSV")
+    p.add_argument("tipo", choices=TIPOS)
+    p.add_argument("cuenta", type=int, choices=(1, 2))
+    p.add_argument("archivos", nargs="+")
+    p.set_defaults(func=cmd_importar, texto=_texto_importar)
+
+    p = sub.add_parser("resumenes", help="PDFs de resumen de CC de todas las entidades con saldo")
+    p.add_argument("tipo", choices=TIPOS + ("todos",))
+    p.add_argument("carpeta")
+    p.add_argument("--forzar", action="store_true", help="rearmar aunque no hayan cambiado")
+    p.set_defaults(func=cmd_resumenes, texto=_texto_resumenes)
+
+    p = sub.add_parser("saldos", help="exporta saldos C1/C2")
+    p.add_argument("tipo", choices=TIPOS + ("todos",))
+    p.add_argument("--salida", default=None, help="archivo (por defecto la salida estándar)")
+    p.add_argument("--formato", choices=("csv", "json"), default="csv")
+    p.set_defaults(func=cmd_saldos, texto=None)
+
+    p = sub.add_parser("backup", help="copia de la base a una carpeta")
+    p.add_argument("carpeta")
+    p.add_argument("--comprimir", choices=("gzip", "zstd"), default=None)
+    p.add_argument("--vacuum", action="store_true", help="usar VACUUM INTO (copia compactada)")
+    p.add_argument("--modo", choices=("auto", "completo", "diferencial"), default="completo",
+                   help="diferencial: sólo las páginas cambiadas desde el último completo")
+    p.add_argument("--diarios", type=int, default=None, help="retención: últimos N días")
+    p.add_argument("--mensuales", type=int, default=None, help="retención: últimos M meses")
+    p.set_defaults(func=cmd_backup, texto=_texto_backup)
+
+    p = sub.add_parser("restaurar", help="reconstruye la base desde una carpeta de backups")
+    p.add_argument("carpeta")
+    p.add_argument("destino")
+    p.add_argument("--hasta", default=None, help="AAAA-MM-DD[ HH:MM:SS]: último backup hasta ese momento")
+    p.add_argument("--archivo", default=None, help="backup puntual (nombre en backups.json)")
+    p.add_argument("--forzar", action="store_true", help="reemplazar destino si existe")
+    # no abre la base: el destino puede ser la misma gestion_textil.db
+    p.set_defaults(func=cmd_restaurar, sin_base=True,
+                   texto=lambda r: print(f"Restaurado {r['archivo']} ({r['fecha']}) en {r['destino']}"))
+    return ap
+
+
+def main(argv=None):
+    a = _parser().parse_args(argv)
+    a.jobs = max(1, a.jobs)
+    fases = _Fases()
+    t0 = time.perf_counter()
+    resultado, ok = None, False
+    try:
+        if not a.sin_base:
+            with fases("arranque"):
+                db.iniciar(a.db)
+        ok, resultado = a.func(a, fases)
+    except Exception as e:
+        resultado = {"error": f"{type(e).__name__}: {e}"}
+    segundos = round(time.perf_counter() - t0, 4)
+
+    if a.json:
+        print(json.dumps(
+            {"comando": a.comando, "ok": ok, "segundos": segundos,
+             "fases": fases.tiempos, "resultado": resultado},
+            ensure_ascii=False,
+        ))
+    else:
+        if "error" in (resultado or {}):
+            print(f"Error: {resultado['error']}", file=sys.stderr)
+        elif a.texto:
+            a.texto(resultado)
+        print(f"{a.comando}: {'OK' if ok else 'CON ERRORES'} en {segundos} s "
+              f"({', '.join(f'{k} {v}' for k, v in fases.tiempos.items())})",
+              file=sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
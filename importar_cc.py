@@ -0,0 +1,204 @@
+# importar_cc.py — Importación de movimientos de CC desde CSV (sin interfaz)
+# -------------------------------------------------
+# - Lectura robusta del CSV (antes dentro de App._import_cc):
+#     * detecta delimitador (csv.Sniffer) y codificación (UTF-8 con BOM / latin-1)
+#     * normaliza encabezados y sinónimos (cliente -> id, detalle -> concepto...)
+#     * acepta coma decimal, $ y miles; fechas dd/mm/yyyy o yyyy-mm-dd
+#     * medio por defecto 'otro'
+# - La inserción la hace db.cc_importar_movs (una transacción, por tandas).
+# - Lo usan la app (menú Importar) y la línea de comandos (gestion_textil.py).
+# -------------------------------------------------
+
+import csv
+from datetime import date
+
+import db_access as db
+
+
+def today_str():
+    return date.today().strftime("%Y-%m-%d")
+
+
+def _strip_bom(s: str) -> str:
+    return (s or "").lstrip("\ufeff").strip()
+
+
+def _parse_date_flexible(s: str) -> str:
+    """
+    Acepta 'YYYY-MM-DD', 'DD/MM/YYYY', 'DD-MM-YYYY', 'YYYY/MM/DD'
+    y devuelve siempre 'YYYY-MM-DD'. Si no entiende, devuelve tal cual.
+    """
+    s = _strip_bom(s)
+    if not s:
+        return today_str()
+    try:
+        # ya viene OK
+        if len(s) == 10 and s[4] in "-/" and s[7] in "-/":
+            y, m, d = s.replace("/", "-").split("-")
+            if len(y) == 4:
+                return f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
+    except Exception:
+        pass
+    # dd/mm/yyyy
+    try:
+        if "/" in s or "-" in s:
+            p = s.replace("/", "-").split("-")
+            if len(p) == 3:
+                a, b, c = p
+                # heurística: si el primer token tiene 4 dígitos, es año
+                if len(a) == 4:
+                    y, m, d = int(a), int(b), int(c)
+                else:
+                    d, m, y = int(a), int(b), int(c)
+                _ = date(y, m, d)  # valida
+                return f"{y:04d}-{m:02d}-{d:02d}"
+    except Exception:
+        pass
+    return s  # fallback
+
+
+def _parse_float_flexible(x):
+    """
+    Convierte a float admitiendo: signos, $/espacios, miles con . o , y decimal con . o ,
+    También '(123,45)' como negativo.
+    """
+    if x is None:
+        return 0.0
+    if isinstance(x, (int, float)):
+        return float(x)
+    s = str(x).strip()
+    if not s:
+        return 0.0
+    neg = False
+    if s.startswith("(") and s.endswith(")"):
+        neg = True
+        s = s[1:-1]
+    # quitar símbolos
+    s = s.replace("$", "").replace(" ", "").replace("\u00a0", "")
+    # si tiene coma y punto:
+    if "," in s and "." in s:
+        # si la coma está después del punto → coma decimal (ej: 1.234,56)
+        if s.rfind(",") > s.rfind("."):
+            s = s.replace(".", "")  # saca miles
+            s = s.replace(",", ".")  # decimal
+        else:
+            s = s.replace(",", "")  # saca miles
+            # el punto queda como decimal
+    elif "," in s:
+        # solo coma → tratamos como decimal
+        s = s.replace(",", ".")
+    # cualquier otro caso: queda el punto como decimal
+    try:
+        val = float(s)
+        return -val if neg else val
+    except Exception:
+        return 0.0
+
+
+_HEADERS = {
+    "fecha": "fecha",
+    "fch": "fecha",
+    "id": "id",
+    "cliente": "id",
+    "cliente_id": "id",
+    "proveedor": "id",
+    "proveedor_id": "id",
+    "entidad": "id",
+    "doc": "doc",
+    "documento": "doc",
+    "nro": "numero",
+    "numero": "numero",
+    "comprobante": "numero",
+    "concepto": "concepto",
+    "detalle": "concepto",
+    "medio": "medio",
+    "medio_pago": "medio",
+    "medio_de_pago": "medio",
+    "pago": "medio",
+    "debe": "debe",
+    "haber": "haber",
+    "obs": "obs",
+    "observacion": "obs",
+    "observaciones": "obs",
+}
+
+
+def _norm_header_key(k: str) -> str:
+    """
+    Normaliza encabezados a claves conocidas.
+    Soporta sinónimos frecuentes.
+    """
+    k0 = _strip_bom(k).lower().strip()
+    return _HEADERS.get(k0, k0)
+
+
+def _norm_medio(v: str) -> str:
+    v = _strip_bom(v).lower()
+    if v in ("efectivo", "cheque", "banco", "otro"):
+        return v
+    # normalizaciones suaves
+    if v in (
+        "transferencia",
+        "depósito",
+        "deposito",
+        "transf",
+        "bank",
+        "cta cte",
+        "ctacte",
+        "cbu",
+        "cvu",
+    ):
+        return "banco"
+    if v in ("cheques", "ch", "chq"):
+        return "cheque"
+    return "otro"
+
+
+def _abrir(path):
+    try:
+        fh = open(path, "r", encoding="utf-8-sig", newline="")
+        fh.read(4096)
+        fh.seek(0)
+        return fh
+    except UnicodeDecodeError:
+        fh.close()
+        return open(path, "r", encoding="latin-1", newline="")
+
+
+def leer_csv(path):
+    """Genera las filas del CSV como dicts con encabezados normalizados."""
+    with _abrir(path) as fh:
+        head = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(head)
+        except Exception:
+            dialecto = csv.excel
+        for raw in csv.DictReader(fh, dialect=dialecto):
+            yield {_norm_header_key(k): v for k, v in raw.items() if k is not None}
+
+
+def normalizar(r):
+    """dict del CSV -> tupla de db.cc_importar_movs."""
+    return (
+        _parse_date_flexible(r.get("fecha") or today_str()),
+        r.get("id"),
+        _strip_bom(r.get("doc") or "MOV"),
+        _strip_bom(r.get("numero") or ""),
+        _strip_bom(r.get("concepto") or ""),
+        _norm_medio(r.get("medio") or "otro"),
+        _parse_float_flexible(r.get("debe")),
+        _parse_float_flexible(r.get("haber")),
+        r.get("obs"),
+    )
+
+
+def importar_csv(tipo: str, cuenta, path, progreso=None) -> dict:
+    """
+    Importa un CSV de movimientos a la CC (tipo 'clientes'|'proveedores', cuenta 1|2).
+    progreso(filas_leidas): opcional; si lanza, se deshace todo.
+    Devuelve {"ok": n, "errores": [(nro_fila, mensaje), ...]} (ver db.cc_importar_movs).
+    """
+    return db.cc_importar_movs(
+        tipo, cuenta, leer_csv(path), normalizar=normalizar, progreso=progreso
+    )
@@ -0,0 +1,361 @@
+# pdf_render.py — Armado de PDFs (recibo, OP, resúmenes de CC) con reportlab
+# -------------------------------------------------
+# - reportlab se importa UNA vez (la primera vez que se arma un PDF), no al
+#   importar el módulo: la app abre aunque no esté instalado.
+# - Hoja de estilos y TableStyle de cada tipo de tabla se arman una sola vez
+#   por proceso y se reusan en todos los documentos.
+#   (En el pool de Enviar CC cada proceso arma su caché en el primer PDF.)
+# - Plantillas: recibo(), orden_pago(), resumen_cc(), resumen_simple(),
+#   resumen_cc_entidad(), resumen_cc_rango() (histórico largo, página por
+#   página desde un iterador). renderizar_lote() arma varios seguidos.
+# - limpiar_cache() vuelve todo a cero (lo usa bench_pdf.py para medir el
+#   costo de "armar todo en cada documento", que era el comportamiento previo).
+# -------------------------------------------------
+
+import threading
+import time
+from types import SimpleNamespace
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _armar():
+    """Importa reportlab y arma estilos y tablas. Se llama con _lock tomado."""
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.pdfgen.canvas import Canvas
+        from reportlab.platypus import (
+            Paragraph,
+            SimpleDocTemplate,
+            Spacer,
+            Table,
+            TableStyle,
+        )
+    except ImportError as e:
+        raise RuntimeError("Falta 'reportlab'. Instalá con: pip install reportlab") from e
+
+    base = [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("ALIGN", (3, 1), (-1, -1), "RIGHT"),
+    ]
+    medio = base + [("VALIGN", (0, 0), (-1, -1), "MIDDLE")]
+    tablas = {
+        "basica": TableStyle(base),  # cheques de recibo / OP y resumen simple
+        "resumen": TableStyle(medio),  # resumen de CC (Enviar CC)
+        "cc": TableStyle(  # resumen de CC de db_access (con saldo parcial)
+            medio
+            + [
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.whitesmoke, colors.white]),
+            ]
+        ),
+        "cc_rango": TableStyle(  # histórico por páginas (filas de alto fijo)
+            medio
+            + [
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("TOPPADDING", (0, 0), (-1, -1), 1),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+                ("FONTNAME", (0, 1), (-1, 1), "Helvetica-Bold"),
+                ("ROWBACKGROUNDS", (0, 2), (-1, -1), [colors.whitesmoke, colors.white]),
+            ]
+        ),
+    }
+    return SimpleNamespace(
+        A4=A4,
+        Canvas=Canvas,
+        Paragraph=Paragraph,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Spacer=Spacer,
+        Table=Table,
+        estilos=getSampleStyleSheet(),
+        tablas=tablas,
+    )
+
+
+def rl():
+    """reportlab + estilos + TableStyles ya armados (una vez por proceso)."""
+    r = _cache.get("rl")
+    if r is None:
+        with _lock:
+            r = _cache.get("rl")
+            if r is None:
+                r = _cache["rl"] = _armar()
+    return r
+
+
+def limpiar_cache():
+    """Descarta estilos y tablas (se rearman en el próximo documento)."""
+    with _lock:
+        _cache.clear()
+
+
+def _doc(r, path, margen):
+    return r.SimpleDocTemplate(
+        path, pagesize=r.A4,
+        leftMargin=margen[0], rightMargin=margen[1], topMargin=margen[2], bottomMargin=margen[3],
+    )
+
+
+def _tabla(r, data, anchos, estilo):
+    tbl = r.Table(data, repeatRows=1, colWidths=anchos)
+    tbl.setStyle(r.tablas[estilo])
+    return tbl
+
+
+# ----------------------------- Plantillas -----------------------------
+
+
+def _comprobante(path, titulo, rotulo, ent, fecha, concepto, medio, importe, cheques):
+    r = rl()
+    s = r.estilos
+    el = [r.Paragraph(titulo, s["Title"])]
+    el.append(r.Paragraph(f"Fecha: {fecha}", s["Normal"]))
+    el.append(r.Spacer(1, 6))
+    el.append(
+        r.Paragraph(
+            f"{rotulo}: {ent.get('rs','')} — CUIT/DNI: {ent.get('cuit','')}", s["Normal"]
+        )
+    )
+    el.append(r.Paragraph(f"Domicilio: {ent.get('dir','')}", s["Normal"]))
+    el.append(r.Spacer(1, 6))
+    el.append(r.Paragraph(f"Concepto: {concepto}", s["Normal"]))
+    el.append(r.Paragraph(f"Medio de pago: {medio}", s["Normal"]))
+    el.append(r.Paragraph(f"Importe: ${float(importe):,.2f}", s["Heading3"]))
+    if cheques:
+        data = [["Nº Cheque", "Banco", "Fecha de pago", "Importe"]]
+        for c in cheques:
+            data.append(
+                [
+                    c.get("numero", ""),
+                    c.get("banco", ""),
+                    c.get("fecha", ""),
+                    f"{float(c.get('importe', 0) or 0):,.2f}",
+                ]
+            )
+        el.append(r.Spacer(1, 8))
+        el.append(_tabla(r, data, [120, 160, 120, 100], "basica"))
+    _doc(r, path, (40, 40, 40, 40)).build(el)
+
+
+def recibo(path, numero, fecha, cliente, concepto, medio, importe, cheques=None):
+    """Recibo. cliente: {"rs","cuit","dir"}; cheques: [{"numero","banco","fecha","importe"}]."""
+    _comprobante(path, f"RECIBO Nº {numero}", "Recibimos de", cliente,
+                 fecha, concepto, medio, importe, cheques)
+
+
+def orden_pago(path, numero, fecha, proveedor, concepto, medio, importe, cheques=None):
+    """Orden de pago (mismos parámetros que recibo())."""
+    _comprobante(path, f"ORDEN DE PAGO Nº {numero}", "Pagamos a", proveedor,
+                 fecha, concepto, medio, importe, cheques)
+
+
+def _filas_dh(filas):
+    data = [["Fecha", "Documento", "Concepto", "Debe", "Haber"]]
+    for fecha, docnum, concepto, debe, haber in filas:
+        data.append(
+            [
+                fecha or "",
+                docnum or "",
+                concepto or "",
+                f"{float(debe or 0):,.2f}",
+                f"{float(haber or 0):,.2f}",
+            ]
+        )
+    return data
+
+
+def resumen_cc(path, titulo, encabezado, cuenta_label, filas, saldo):
+    """Resumen de cuenta (Enviar CC). filas: (fecha, docnum, concepto, debe, haber)."""
+    r = rl()
+    s = r.estilos
+    el = [r.Paragraph(titulo, s["Title"])]
+    el.append(r.Paragraph(cuenta_label, s["Heading2"]))
+    el.append(r.Spacer(1, 6))
+    for k, v in encabezado.items():
+        if v:
+            el.append(r.Paragraph(f"<b>{k}:</b> {v}", s["Normal"]))
+    el.append(r.Spacer(1, 8))
+    el.append(_tabla(r, _filas_dh(filas), [80, 120, 220, 70, 70], "resumen"))
+    el.append(r.Spacer(1, 8))
+    el.append(
+        r.Paragraph(f"<b>Saldo {cuenta_label}:</b> {float(saldo or 0):,.2f}", s["Heading3"])
+    )
+    _doc(r, path, (36, 36, 40, 32)).build(el)
+
+
+def resumen_simple(path, titulo, meta_texto, movimientos, saldo):
+    """Resumen sin encabezado de entidad. movimientos: (fecha, docnum, concepto, debe, haber)."""
+    r = rl()
+    s = r.estilos
+    el = [r.Paragraph(titulo, s["Title"])]
+    if meta_texto:
+        el.append(r.Paragraph(meta_texto, s["Normal"]))
+    el.append(r.Spacer(1, 8))
+    el.append(_tabla(r, _filas_dh(movimientos), [80, 140, 180, 70, 70], "basica"))
+    el.append(r.Spacer(1, 10))
+    el.append(r.Paragraph(f"<b>Saldo:</b> {float(saldo or 0):,.2f}", s["Heading3"]))
+    _doc(r, path, (36, 36, 36, 36)).build(el)
+
+
+def resumen_cc_entidad(path, titulo, lineas, data, pie):
+    """
+    Resumen de CC de db_access (crear_pdf_cc_*): título, líneas de encabezado
+    (HTML de Paragraph), tabla con saldo parcial ya armada y línea de totales.
+    """
+    r = rl()
+    s = r.estilos
+    story = [r.Paragraph(titulo, s["Title"])]
+    for ln in lineas:
+        story.append(r.Paragraph(ln, s["Normal"]))
+    story.append(r.Spacer(1, 10))
+    #                         Fecha  Comp.  Detalle  Debe Haber Saldo
+    story.append(_tabla(r, data, [55, 130, 135, 65, 65, 65], "cc"))
+    story.append(r.Spacer(1, 10))
+    story.append(r.Paragraph(pie, s["Normal"]))
+    _doc(r, path, (25, 25, 25, 25)).build(story)
+
+
+CC_COLUMNAS = ["Fecha", "Comprobante", "Detalle", "Debe", "Haber", "Saldo"]
+CC_ANCHOS = [55, 130, 135, 65, 65, 65]
+FILA_ALTO = 11  # puntos; alto fijo para saber cuántas filas entran por página
+
+
+def resumen_cc_rango(path, titulo, lineas, filas, saldo_anterior=0.0, pie=None):
+    """
+    Resumen de CC largo (histórico por fechas) escrito página por página.
+    - filas: iterable (p.ej. un generador sobre un cursor) de
+      (fecha, comprobante, detalle, debe, haber); se consume una sola vez.
+    - Cada página lleva su propia tabla de tamaño fijo: arriba "Saldo anterior"
+      (1ra página) o "Transporte" con el saldo que viene, y abajo "Transporte"
+      si sigue en la página siguiente.
+    - pie(debe, haber): texto de totales al final (None = "Total Debe/Haber").
+    En memoria queda una página de filas a la vez y el tiempo crece lineal
+    con la cantidad de filas (no se arma una única Table gigante).
+    Devuelve {"filas", "paginas", "debe", "haber", "saldo"}.
+    """
+    r = rl()
+    s = r.estilos
+    ancho, alto = r.A4
+    m = 25
+    util = ancho - 2 * m
+    c = r.Canvas(path, pagesize=r.A4, pageCompression=1)
+
+    it = iter(filas)
+    sig = next(it, None)
+    saldo = float(saldo_anterior or 0)
+    tot_d = tot_h = 0.0
+    n = pagina = 0
+
+    def _parrafos(y, pars):
+        for p in pars:
+            _w, h = p.wrapOn(c, util, y - m)
+            p.drawOn(c, m, y - h)
+            y -= h + 2
+        return y
+
+    while True:
+        pagina += 1
+        if pagina == 1:
+            cab = [r.Paragraph(titulo, s["Title"])]
+            cab += [r.Paragraph(ln, s["Normal"]) for ln in lineas]
+        else:
+            cab = [r.Paragraph(f"<b>{titulo}</b> — página {pagina}", s["Normal"])]
+        y = _parrafos(alto - m, cab) - 6
+
+        # encabezado de columnas + transporte arriba + transporte abajo
+        cap = max(1, int((y - m - 12) / FILA_ALTO) - 3)
+        data = [
+            CC_COLUMNAS,
+            ["", "", "Saldo anterior" if pagina == 1 else "Transporte", "", "", f"{saldo:,.2f}"],
+        ]
+        while sig is not None and len(data) - 2 < cap:
+            fecha, comp, detalle, debe, haber = sig
+            debe, haber = float(debe or 0), float(haber or 0)
+            saldo += debe - haber
+            tot_d += debe
+            tot_h += haber
+            n += 1
+            data.append(
+                [
+                    fecha or "",
+                    comp or "",
+                    str(detalle or "").replace("\n", " "),
+                    f"{debe:,.2f}",
+                    f"{haber:,.2f}",
+                    f"{saldo:,.2f}",
+                ]
+            )
+            sig = next(it, None)
+        if sig is not None:
+            data.append(["", "", "Transporte", "", "", f"{saldo:,.2f}"])
+
+        tbl = r.Table(data, colWidths=CC_ANCHOS, rowHeights=FILA_ALTO)
+        tbl.setStyle(r.tablas["cc_rango"])
+        if sig is not None:
+            tbl.setStyle([("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold")])
+        _w, h = tbl.wrapOn(c, util, y - m)
+        tbl.drawOn(c, m, y - h)
+        y -= h
+
+        if sig is None:
+            texto = (
+                pie(tot_d, tot_h)
+                if pie
+                else f"<b>Total Debe:</b> {tot_d:,.2f} &nbsp;&nbsp; <b>Total Haber:</b> {tot_h:,.2f}"
+            )
+            par = r.Paragraph(texto, s["Normal"])
+            _w, h = par.wrapOn(c, util, alto)
+            if y - 10 - h < m + 12:
+                c.setFont("Helvetica", 7)
+                c.drawRightString(ancho - m, m / 2, f"Página {pagina}")
+                c.showPage()
+                pagina += 1
+                y = alto - m
+            par.drawOn(c, m, y - 10 - h)
+
+        c.setFont("Helvetica", 7)
+        c.drawRightString(ancho - m, m / 2, f"Página {pagina}")
+        c.showPage()
+        if sig is None:
+            break
+    c.save()
+    return {"filas": n, "paginas": pagina, "debe": tot_d, "haber": tot_h, "saldo": saldo}
+
+
+PLANTILLAS = {
+    "recibo": recibo,
+    "orden_pago": orden_pago,
+    "resumen_cc": resumen_cc,
+    "resumen_simple": resumen_simple,
+    "resumen_cc_entidad": resumen_cc_entidad,
+    "resumen_cc_rango": resumen_cc_rango,
+}
+
+
+def renderizar_lote(trabajos, progreso=None):
+    """
+    Arma varios PDFs seguidos con la misma caché.
+    trabajos: iterable de (plantilla, path, args) o (plantilla, path, args, kwargs),
+    con plantilla una clave de PLANTILLAS; args no incluye el path.
+    progreso(hecho, total, path): opcional; si lanza, corta.
+    Devuelve [(path, segundos, error)] en el mismo orden (error None si salió bien).
+    """
+    trabajos = list(trabajos)
+    out = []
+    for i, t in enumerate(trabajos, start=1):
+        plantilla, path, args = t[0], t[1], t[2]
+        kwargs = t[3] if len(t) > 3 else {}
+        t0 = time.perf_counter()
+        try:
+            PLANTILLAS[plantilla](path, *args, **kwargs)
+            err = None
+        except Exception as e:
+            err = f"{type(e).__name__}: {e}"
+        out.append((path, time.perf_counter() - t0, err))
+        if progreso:
+            progreso(i, len(trabajos), path)
+    return out
@@ -0,0 +1,105 @@
+# perfil_import.py — Control del costo de importar los módulos sin interfaz
+# -------------------------------------------------
+# Uso:  python perfil_import.py [--veces 5]
+# - Importa cada módulo en un proceso nuevo con `python -X importtime`, en una
+#   carpeta temporal vacía, y compara la mediana del tiempo acumulado contra
+#   PRESUPUESTO_MS.
+# - Verifica además que importar no cree la base (init_db ya no corre al
+#   importar db_access) ni cargue tkinter / reportlab.
+# - Sale con código 1 si algo se pasa: sirve para correrlo antes de subir
+#   cambios o desde una tarea programada.
+# -------------------------------------------------
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# milisegundos (acumulado del módulo, incluye lo que importa)
+PRESUPUESTO_MS = {
+    "db_access": 80,
+    "pdf_render": 20,
+    "envio_cc": 80,
+    "tareas": 60,
+}
+
+PROHIBIDOS = ("tkinter", "reportlab")
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+
+def _medir(modulo: str, carpeta: str):
+    """(ms acumulados del módulo, {módulo: ms} de todo lo importado)."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = AQUI + os.pathsep + env.get("PYTHONPATH", "")
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=carpeta, env=env, capture_output=True, text=True,
+    )
+    if res.returncode != 0:
+        raise RuntimeError(f"import {modulo} falló:\n{res.stderr[-2000:]}")
+    todos = {}
+    for ln in res.stderr.splitlines():
+        if not ln.startswith("import time:") or "|" not in ln:
+            continue
+        partes = ln[len("import time:"):].split("|")
+        try:
+            acum = int(partes[1].strip())
+        except ValueError:
+            continue  # encabezado
+        todos[partes[2].strip()] = acum / 1000.0
+    return todos.get(modulo, 0.0), todos
+
+
+def correr(veces: int = 5) -> dict:
+    """
+    {módulo: {"ms", "presupuesto", "ok", "prohibidos", "crea_base"}} y "ok" global.
+    """
+    out = {}
+    ok = True
+    for modulo, tope in PRESUPUESTO_MS.items():
+        tiempos, prohibidos, crea_base = [], set(), False
+        for _ in range(veces):
+            with tempfile.TemporaryDirectory(prefix="perfil_import_") as tmp:
+                ms, todos = _medir(modulo, tmp)
+                tiempos.append(ms)
+                prohibidos |= {m for m in todos if m.split(".")[0] in PROHIBIDOS}
+                crea_base = crea_base or any(
+                    f.startswith("gestion_textil.db") for f in os.listdir(tmp)
+                )
+        med = statistics.median(tiempos)
+        bien = med <= tope and not prohibidos and not crea_base
+        ok = ok and bien
+        out[modulo] = {
+            "ms": round(med, 1),
+            "presupuesto": tope,
+            "ok": bien,
+            "prohibidos": sorted(prohibidos),
+            "crea_base": crea_base,
+        }
+    out["ok"] = ok
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Costo de importar los módulos sin interfaz")
+    ap.add_argument("--veces", type=int, default=5, help="corridas por módulo (mediana)")
+    a = ap.parse_args(argv)
+
+    res = correr(a.veces)
+    for modulo in PRESUPUESTO_MS:
+        r = res[modulo]
+        extra = ""
+        if r["prohibidos"]:
+            extra += f"  importa {', '.join(r['prohibidos'])}"
+        if r["crea_base"]:
+            extra += "  ¡crea la base al importar!"
+        print(f"{'OK  ' if r['ok'] else 'FALLA'} {modulo:<12} {r['ms']:7.1f} ms"
+              f" (presupuesto {r['presupuesto']} ms){extra}")
+    return 0 if res["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# stress_numerador.py — Prueba de carga del numerador (db_access.next_num)
+# -------------------------------------------------
+# Uso:  python stress_numerador.py [--procesos 4] [--cantidad 200] [--bloque] [--db ruta]
+# - Varios procesos piden números a la vez sobre la misma base (como dos
+#   puestos contra el archivo compartido) y al final se verifica que no haya
+#   duplicados ni saltos.
+# - Trabaja sobre una COPIA temporal de la base indicada (o una base nueva)
+#   y con un tipo de numerador propio: no toca recibos ni OPs reales.
+# - Con --bloque cada proceso reserva de a NUM_BLOQUE; la cantidad se redondea
+#   a múltiplos del bloque para que no queden reservas sin usar (serían saltos).
+# -------------------------------------------------
+
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import db_access as db
+
+TIPO = "stress"
+
+
+def _pedir(db_path: str, cantidad: int, bloque: bool):
+    """Corre en cada proceso: pide `cantidad` números y devuelve sus valores."""
+    db.cerrar_pool()
+    db.DB_PATH = Path(db_path)
+    db.numerador_reservas_liberar()
+    out = []
+    for _ in range(cantidad):
+        out.append(int(db.next_num(TIPO, bloque=bloque).split("-")[-1]))
+    db.cerrar_pool()
+    return out
+
+
+def correr(procesos: int = 4, cantidad: int = 200, bloque: bool = False, base=None) -> dict:
+    """
+    Lanza la prueba y devuelve {"ok", "numeros", "duplicados", "faltantes", "segundos"}.
+    `base`: archivo a copiar (None = base nueva con el esquema de init_db).
+    """
+    if bloque:
+        cantidad = max(1, -(-cantidad // db.NUM_BLOQUE)) * db.NUM_BLOQUE
+    tmp = Path(tempfile.mkdtemp(prefix="stress_num_"))
+    destino = tmp / "stress.db"
+    try:
+        if base:
+            src = sqlite3.connect(str(base))
+            dst = sqlite3.connect(str(destino))
+            src.backup(dst)
+            src.close()
+            dst.close()
+        anterior = db.DB_PATH
+        db.cerrar_pool()
+        db.DB_PATH = destino
+        try:
+            db.init_db()
+            conn = db.get_conn()
+            row = conn.execute("SELECT valor FROM numeradores WHERE tipo=?", (TIPO,)).fetchone()
+            conn.close()
+            inicio = int(row[0]) if row else 0
+        finally:
+            db.cerrar_pool()
+            db.DB_PATH = anterior
+
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=procesos) as ex:
+            partes = list(ex.map(_pedir, [str(destino)] * procesos,
+                                 [cantidad] * procesos, [bloque] * procesos))
+        seg = time.perf_counter() - t0
+
+        numeros = sorted(n for p in partes for n in p)
+        esperado = set(range(inicio + 1, inicio + procesos * cantidad + 1))
+        vistos = set(numeros)
+        duplicados = len(numeros) - len(vistos)
+        faltantes = sorted(esperado - vistos)
+        return {
+            "ok": duplicados == 0 and not faltantes and vistos == esperado,
+            "numeros": len(numeros),
+            "duplicados": duplicados,
+            "faltantes": faltantes[:20],
+            "segundos": round(seg, 3),
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Prueba de carga del numerador")
+    ap.add_argument("--procesos", type=int, default=4)
+    ap.add_argument("--cantidad", type=int, default=200, help="números por proceso")
+    ap.add_argument("--bloque", action="store_true", help="usar reserva por bloques")
+    ap.add_argument("--db", default=None, help="base a copiar (por defecto, una nueva)")
+    a = ap.parse_args(argv)
+
+    res = correr(a.procesos, a.cantidad, a.bloque, a.db)
+    modo = f"bloque={db.NUM_BLOQUE}" if a.bloque else "de a uno"
+    print(
+        f"{res['numeros']} números ({a.procesos} procesos, {modo}) en {res['segundos']} s — "
+        f"duplicados={res['duplicados']} faltantes={len(res['faltantes'])}"
+    )
+    print("OK" if res["ok"] else f"FALLA: faltan {res['faltantes']}")
+    return 0 if res["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# tareas.py — Trabajo pesado fuera del hilo de Tk (importaciones, PDFs, recargas)
+# -------------------------------------------------
+# - Pool de hilos (concurrent.futures). Cada hilo usa sus propias conexiones
+#   SQLite: el pool de db_access.get_conn() es por hilo, así que no se comparten.
+# - Los hilos NUNCA tocan widgets: resultados, errores y progreso se encolan y
+#   el hilo de Tk los levanta con after() y llama a los callbacks.
+# - Cancelación cooperativa: la función consulta tarea.cancelada /
+#   tarea.verificar() (o llama a tarea.progreso(), que ya verifica).
+# - de_fondo=True marca las tareas que lanza la propia app (recargas de
+#   pestañas): "Cancelar tarea" no las toca, sólo cerrar() las cancela.
+# -------------------------------------------------
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 50  # cada cuánto Tk revisa la cola de resultados
+
+
+class Cancelada(Exception):
+    """La tarea fue cancelada por el usuario."""
+
+
+class Tarea:
+    """Handle de una tarea lanzada con Tareas.lanzar()."""
+
+    def __init__(self, nombre: str, cola, de_fondo: bool = False):
+        self.nombre = nombre
+        self.de_fondo = de_fondo
+        self.future = None
+        self._cola = cola
+        self._cancel = threading.Event()
+
+    # --- lado Tk ---
+    def cancelar(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()  # si todavía no arrancó, ni corre
+
+    def terminada(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    # --- lado worker ---
+    @property
+    def cancelada(self) -> bool:
+        return self._cancel.is_set()
+
+    def verificar(self):
+        if self._cancel.is_set():
+            raise Cancelada(self.nombre)
+
+    def progreso(self, hecho, total=None, texto: str = ""):
+        """Informa avance a Tk (se descarta si nadie escucha). Corta si se canceló."""
+        self.verificar()
+        self._cola.put(("progreso", self, (hecho, total, texto)))
+
+
+class Tareas:
+    """
+    Ejecutor de tareas en segundo plano para una ventana Tk.
+
+        t = app.tareas.lanzar(fn, arg1, al_terminar=cb_ok, al_error=cb_err,
+                              al_progreso=cb_prog, nombre="Importar")
+        # fn(tarea, arg1) corre en otro hilo; cb_* corren en el hilo de Tk.
+        # de_fondo=True: recarga automática, fuera de cancelar_usuario().
+    """
+
+    def __init__(self, root, max_hilos: int = 2):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="tarea")
+        self._cola = queue.Queue()
+        self._callbacks = {}  # Tarea -> (al_terminar, al_error, al_progreso)
+        self._activas = set()
+        self._cerrado = False
+        self._poll_id = None
+
+    def lanzar(self, fn, *args, al_terminar=None, al_error=None, al_progreso=None,
+               nombre: str = "", de_fondo: bool = False, **kwargs) -> Tarea:
+        t = Tarea(nombre or getattr(fn, "__name__", "tarea"), self._cola, de_fondo)
+        self._callbacks[t] = (al_terminar, al_error, al_progreso)
+        self._activas.add(t)
+
+        def _correr():
+            try:
+                t.verificar()
+                res = fn(t, *args, **kwargs)
+                self._cola.put(("ok", t, res))
+            except BaseException as ex:
+                self._cola.put(("error", t, ex))
+
+        t.future = self._pool.submit(_correr)
+        self._programar()
+        return t
+
+    def activas(self):
+        return [t for t in self._activas if not t.terminada()]
+
+    def cancelar_todas(self):
+        for t in list(self._activas):
+            t.cancelar()
+
+    def cancelar_usuario(self):
+        """Cancela las tareas lanzadas por el usuario (no las de fondo); devuelve cuáles."""
+        canceladas = [t for t in self.activas() if not t.de_fondo]
+        for t in canceladas:
+            t.cancelar()
+        return canceladas
+
+    def cerrar(self):
+        """Cancela lo pendiente y libera los hilos (llamar al cerrar la ventana)."""
+        self._cerrado = True
+        self.cancelar_todas()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+
+    # --- lado Tk: drenar la cola ---
+    def _programar(self):
+        if self._poll_id is None and not self._cerrado:
+            self._poll_id = self.root.after(POLL_MS, self._drenar)
+
+    def _drenar(self):
+        self._poll_id = None
+        while True:
+            try:
+                kind, t, data = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            ok_cb, err_cb, prog_cb = self._callbacks.get(t, (None, None, None))
+            try:
+                if kind == "progreso":
+                    if prog_cb and not t.cancelada:
+                        prog_cb(*data)
+                    continue
+                self._callbacks.pop(t, None)
+                self._activas.discard(t)
+                if t.cancelada or isinstance(data, Cancelada):
+                    pass  # cancelada: el resultado ya no interesa
+                elif kind == "ok":
+                    if ok_cb:
+                        ok_cb(data)
+                elif err_cb:
+                    err_cb(data)
+                else:
+                    print(f"WARN tarea {t.nombre}:", data)
+            except Exception as ex:
+                print(f"WARN callback de {t.nombre}:", ex)
+        # las canceladas antes de arrancar no encolan nada: las saco acá
+        for t in [t for t in self._activas if t.future is not None and t.future.cancelled()]:
+            self._activas.discard(t)
+            self._callbacks.pop(t, None)
+        if self._activas or not self._cola.empty():
+            self._programar()